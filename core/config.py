@@ -6,6 +6,9 @@ from typing import Any, Dict
 
 DEFAULT_CONFIG: Dict[str, Any] = {
     "symbol": "BTC",
+    "symbols": "",
+    "multi_workers": 0,
+    "multi_cash_limit": 1_000_000.0,
     "initial_cash": 1_000_000.0,
     "fee_rate": 0.0005,
     "slippage_rate": 0.0002,
@@ -14,9 +17,75 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "cooldown_sec": 300,
     "trade_size_cash": 100_000.0,
     "report_interval_sec": 3600,
+    "band_filter": True,
+    "strategy_tag": "base",
+    "shadow_variants": "",
+    "shadow_trades_log_path": "shadow_trades.log",
+    "shadow_summary_path": "shadow_summary.json",
+    "oracle_enabled": False,
+    "oracle_budget_us": 50.0,
+    "oracle_threshold": 0.5,
+    "oracle_horizon_sec": 300,
+    "oracle_sample_sec": 5,
+    "oracle_batch_size": 32,
+    "oracle_min_samples": 200,
+    "oracle_learning_rate": 0.05,
+    "vol_filter_enabled": False,
+    "vol_window_sec": 300,
+    "vol_ok": 0.02,
+    "vol_spike_window_sec": 10,
+    "vol_spike_ratio": 2.0,
+    "guard_enabled": False,
+    "guard_timeframes_min": "1,5,10,30",
+    "guard_ema_period": 20,
+    "guard_min_slope": 0.0,
+    "guard_drop_pct": 0.02,
+    "warm_start": True,
+    "warm_start_sec": 43200,
+    "book_execution": False,
+    "book_max_slippage": 0.002,
+    "book_stale_ms": 2000.0,
     "state_path": "state.json",
+    "state_journal": True,
+    "state_compact_every": 1000,
     "trades_log_path": "trades.log",
+    "trade_tail_size": 1024,
+    "trade_spill_path": "trades.bin",
     "hourly_report_path": "hourly_report.log",
+    "report_store_path": "reports.json",
+    "report_hourly_retention_days": 90,
+    "report_flush_lines": 256,
+    "report_flush_interval_sec": 1.0,
+    "report_background_writer": True,
+    "log_path": "",
+    "log_json_path": "",
+    "log_queued": True,
+    "log_queue_size": 10_000,
+    "ws_url": "wss://stream.coinone.co.kr",
+    "ws_channels": "TRADE",
+    "ws_reconnect": True,
+    "feed_queue_size": 1024,
+    "feed_max_lag_ms": 50.0,
+    "notify_enabled": False,
+    "notify_queue_size": 256,
+    "notify_coalesce_sec": 2.0,
+    "notify_rate_per_min": 20.0,
+    "notify_burst": 5,
+    "telegram_token": "",
+    "telegram_chat_id": "",
+    "telegram_url": "https://api.telegram.org",
+    "feed_process": False,
+    "feed_ring_capacity": 65536,
+    "latency_enabled": False,
+    "latency_dump_path": "latency.json",
+    "latency_http_port": 0,
+    "soak_ticks": 10_000_000,
+    "soak_sample_every": 1_000_000,
+    "soak_tracemalloc": True,
+    "soak_top_allocations": 10,
+    "soak_report_path": "soak_report.json",
+    "record_ticks": False,
+    "tick_archive_path": "ticks",
     "demo_price_start": 50_000.0,
     "demo_price_volatility": 0.003,
     "demo_interval_sec": 5,
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+import math
+from typing import Callable, Optional, Tuple
+
+from core.tick import datetime_to_ns, ns_to_datetime
+
+NO_DEADLINE = 2**63 - 1
+_NO_BAND = (0.0, 0.0, 0)
 
 
 @dataclass
@@ -28,11 +34,28 @@ class HeartbeatStrategy:
         self.entry_price: Optional[float] = None
         self.peak: Optional[float] = None
         self.armed = False
-        self.cooldown_until: Optional[datetime] = None
+        self.cooldown_until_ns: Optional[int] = None
+        self.entry_gate: Optional[Callable[[], bool]] = None
+
+    @property
+    def cooldown_until(self) -> Optional[datetime]:
+        if self.cooldown_until_ns is None:
+            return None
+        return ns_to_datetime(self.cooldown_until_ns)
+
+    @cooldown_until.setter
+    def cooldown_until(self, value: Optional[datetime]) -> None:
+        self.cooldown_until_ns = datetime_to_ns(value) if value else None
 
     def on_tick(self, price: float, timestamp: datetime) -> Optional[str]:
+        return self.on_tick_ns(price, datetime_to_ns(timestamp))
+
+    def on_tick_ns(self, price: float, timestamp_ns: int) -> Optional[str]:
         if self.state == "COOLDOWN":
-            if self.cooldown_until and timestamp >= self.cooldown_until:
+            if (
+                self.cooldown_until_ns is not None
+                and timestamp_ns >= self.cooldown_until_ns
+            ):
                 self.state = "IDLE"
                 self.recent_low = price
             else:
@@ -42,6 +65,8 @@ class HeartbeatStrategy:
             if self.recent_low is None or price < self.recent_low:
                 self.recent_low = price
             if self.recent_low and price >= self.recent_low * (1 + self.effective_gap):
+                if self.entry_gate is not None and not self.entry_gate():
+                    return None
                 self.state = "IN_POSITION"
                 self.entry_price = price
                 self.peak = price
@@ -58,12 +83,47 @@ class HeartbeatStrategy:
             if self.armed and self.peak:
                 if price <= self.peak * (1 - self.trailing_pct):
                     self.state = "COOLDOWN"
-                    self.cooldown_until = timestamp + timedelta(
-                        seconds=self.cooldown_sec
+                    self.cooldown_until_ns = timestamp_ns + cooldown_ns(
+                        self.cooldown_sec
                     )
                     return "SELL"
         return None
 
+    def cancel_entry(self) -> None:
+        self.state = "IDLE"
+        self.entry_price = None
+        self.peak = None
+        self.armed = False
+
+    def cancel_exit(self) -> None:
+        self.state = "IN_POSITION"
+        self.cooldown_until_ns = None
+
+    def trigger_band(self) -> Tuple[float, float, int]:
+        if self.state == "COOLDOWN":
+            until_ns = self.cooldown_until_ns
+            return -math.inf, math.inf, NO_DEADLINE if until_ns is None else until_ns
+
+        if self.state == "IDLE":
+            if not self.recent_low:
+                return _NO_BAND
+            return (
+                self.recent_low,
+                self.recent_low * (1 + self.effective_gap),
+                NO_DEADLINE,
+            )
+
+        if self.state == "IN_POSITION" and self.peak:
+            above_peak = math.nextafter(self.peak, math.inf)
+            if self.armed:
+                stop = self.peak * (1 - self.trailing_pct)
+                return math.nextafter(stop, math.inf), above_peak, NO_DEADLINE
+            high = above_peak
+            if self.entry_price:
+                high = min(high, self.entry_price * (1 + self.arm_pct))
+            return -math.inf, high, NO_DEADLINE
+        return _NO_BAND
+
     def snapshot(self) -> dict:
         return HeartbeatSnapshot(
             state=self.state,
@@ -92,6 +152,10 @@ class HeartbeatStrategy:
             self.cooldown_until = None
 
 
+def cooldown_ns(cooldown_sec: float) -> int:
+    return round(cooldown_sec * 1_000_000) * 1000
+
+
 def _to_optional_float(value: Optional[float]) -> Optional[float]:
     if value is None:
         return None
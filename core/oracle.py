@@ -1,12 +1,313 @@
 from __future__ import annotations
 
+from collections import deque
+import math
+import queue
+import threading
+import time
+from typing import Any, Deque, List, Optional, Tuple
+
+from core.timeframe_guard import CandleSeries
+from core.volatility import RollingStats
+
+ENTER = "ENTER"
+BLOCK = "BLOCK"
+FEATURES = (
+    "ret_short",
+    "ret_long",
+    "vol_short",
+    "vol_long",
+    "slope_fast",
+    "slope_slow",
+)
+
+Sample = Tuple[Tuple[float, ...], int]
+
+
+class OnlineLogisticModel:
+    def __init__(
+        self, size: int, learning_rate: float = 0.05, l2: float = 1e-4
+    ) -> None:
+        self.size = size
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.samples = 0
+        self._weights = [0.0] * (size + 1)
+        self._means = [0.0] * size
+        self._squares = [0.0] * size
+
+    def fit_batch(self, batch: List[Sample]) -> None:
+        for features, _ in batch:
+            self.samples += 1
+            for index, value in enumerate(features):
+                delta = value - self._means[index]
+                self._means[index] += delta / self.samples
+                self._squares[index] += delta * (value - self._means[index])
+
+        scales = self.scales()
+        gradient = [0.0] * (self.size + 1)
+        for features, label in batch:
+            error = _sigmoid(self._dot(features, self._means, scales)) - label
+            gradient[0] += error
+            for index, value in enumerate(features):
+                scaled = (value - self._means[index]) * scales[index]
+                gradient[index + 1] += error * scaled
+        rate = self.learning_rate / len(batch)
+        decay = self.learning_rate * self.l2
+        weights = self._weights
+        weights[0] -= rate * gradient[0]
+        for index in range(1, self.size + 1):
+            weights[index] -= rate * gradient[index] + decay * weights[index]
+
+    def scales(self) -> List[float]:
+        if self.samples < 2:
+            return [1.0] * self.size
+        return [
+            1.0 / math.sqrt(square / (self.samples - 1)) if square > 0 else 1.0
+            for square in self._squares
+        ]
+
+    def snapshot(self) -> Tuple[Tuple[float, ...], ...]:
+        return tuple(self._weights), tuple(self._means), tuple(self.scales())
+
+    def _dot(
+        self, features: Tuple[float, ...], means: List[float], scales: List[float]
+    ) -> float:
+        weights = self._weights
+        total = weights[0]
+        for index, value in enumerate(features):
+            total += weights[index + 1] * (value - means[index]) * scales[index]
+        return total
+
 
 class Oracle:
-    def __init__(self) -> None:
-        self._signal = "ENTER"
+    def __init__(
+        self,
+        budget_us: float = 50.0,
+        threshold: float = 0.5,
+        horizon_sec: float = 300.0,
+        label_return: float = 0.0,
+        sample_sec: float = 5.0,
+        batch_size: int = 32,
+        min_samples: int = 200,
+        learning_rate: float = 0.05,
+        short_window_sec: float = 60.0,
+        long_window_sec: float = 600.0,
+        queue_size: int = 64,
+        background: bool = True,
+    ) -> None:
+        self.budget_ns = int(budget_us * 1000)
+        self.threshold = threshold
+        self.horizon_sec = float(horizon_sec)
+        self.label_return = label_return
+        self.sample_sec = float(sample_sec)
+        self.batch_size = max(1, int(batch_size))
+        self.min_samples = int(min_samples)
+        self.short_window_sec = float(short_window_sec)
+        self.long_window_sec = float(long_window_sec)
+        self.background = background
+
+        self.stats = RollingStats((self.short_window_sec, self.long_window_sec))
+        self.fast = CandleSeries(60, history=64, ema_period=5)
+        self.slow = CandleSeries(300, history=64, ema_period=5)
+        self.model = OnlineLogisticModel(len(FEATURES), learning_rate=learning_rate)
+        self.confidence: Optional[float] = None
+        self.overruns = 0
+        self.skipped = 0
+        self.dropped_batches = 0
+
+        self._signal = ENTER
+        self._published: Optional[tuple] = None
+        self._scored: Optional[tuple] = None
+        self._published_samples = 0
+        self._cost_ns = 0.0
+        self._next_sample = 0.0
+        self._pending: Deque[Tuple[float, float, Tuple[float, ...]]] = deque()
+        self._batch: List[Sample] = []
+        self._batches: "queue.Queue[Optional[List[Sample]]]" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(
+                target=self._train_loop, name="oracle-trainer", daemon=True
+            )
+            self._thread.start()
+
+    def update(self, price: float, timestamp: Optional[float] = None) -> None:
+        if timestamp is None:
+            timestamp = time.time()
+        self.stats.update(price, timestamp)
+        self.fast.update(price, timestamp)
+        self.slow.update(price, timestamp)
+
+        pending = self._pending
+        while pending and timestamp - pending[0][0] >= self.horizon_sec:
+            _, entry_price, features = pending.popleft()
+            label = 1 if price >= entry_price * (1 + self.label_return) else 0
+            self._batch.append((features, label))
+            if len(self._batch) >= self.batch_size:
+                self._submit(self._batch)
+                self._batch = []
+
+        if timestamp >= self._next_sample:
+            self._next_sample = timestamp + self.sample_sec
+            features = self.features()
+            if features is not None:
+                pending.append((timestamp, price, features))
+            self._score(features)
+        elif self._published is not self._scored:
+            self._score(self.features())
 
-    def update(self, price: float) -> None:
-        _ = price
+    def warm(self, timestamps: Any, prices: Any) -> int:
+        import numpy as np
+
+        times = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(prices, dtype=np.float64)
+        count = len(times)
+        self.stats.load(times, values)
+        fast_at, fast_slopes = self.fast.load(times, values)
+        slow_at, slow_slopes = self.slow.load(times, values)
+        if not count:
+            return 0
+
+        samples = []
+        next_sample = self._next_sample
+        index = int(np.searchsorted(times, next_sample, "left"))
+        while index < count:
+            samples.append(index)
+            next_sample = times[index] + self.sample_sec
+            index = int(np.searchsorted(times, next_sample, "left"))
+        self._next_sample = next_sample
+        at = np.array(samples, dtype=np.int64)
+
+        returns = np.zeros(count)
+        valid = (values[:-1] > 0) & (values[1:] > 0)
+        returns[1:][valid] = np.log(values[1:][valid] / values[:-1][valid])
+        sums = np.cumsum(returns)
+        squares = np.cumsum(returns * returns)
+        columns = []
+        for window in (self.short_window_sec, self.long_window_sec):
+            starts = np.searchsorted(times, times[at] - window, "left")
+            first = values[starts]
+            ok = (at - starts >= 1) & (first > 0)
+            ratio = values[at] / np.where(ok, first, 1.0) - 1
+            columns.append(np.where(ok, ratio, np.nan))
+        for window in (self.short_window_sec, self.long_window_sec):
+            starts = np.searchsorted(times, times[at] - window, "left")
+            n = (at - starts).astype(np.float64)
+            total = sums[at] - sums[starts]
+            square = squares[at] - squares[starts]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                variance = (square - total * total / n) / (n - 1)
+            stdev = np.sqrt(np.maximum(variance, 0.0))
+            columns.append(np.where(n >= 2, stdev, np.nan))
+        for opened_at, slopes in ((fast_at, fast_slopes), (slow_at, slow_slopes)):
+            position = np.searchsorted(opened_at, at, "right") - 1
+            picked = slopes[np.maximum(position, 0)] if len(slopes) else np.nan
+            columns.append(np.where(position >= 0, picked, np.nan))
+        features = np.column_stack(columns)
+        usable = ~np.isnan(features).any(axis=1)
+
+        horizon = np.searchsorted(times, times[at] + self.horizon_sec, "left")
+        labelled = usable & (horizon < count)
+        exit_prices = values[np.minimum(horizon, count - 1)]
+        labels = exit_prices >= values[at] * (1 + self.label_return)
+        batch = self._batch
+        for row, label in zip(features[labelled].tolist(), labels[labelled].tolist()):
+            batch.append((tuple(row), int(label)))
+            if len(batch) >= self.batch_size:
+                self._train(batch)
+                batch = []
+        self._batch = batch
+
+        self._pending.clear()
+        waiting = usable & (horizon >= count)
+        for index, row in zip(at[waiting].tolist(), features[waiting].tolist()):
+            self._pending.append((times[index].item(), values[index].item(), tuple(row)))
+        self._score(self.features())
+        return int(labelled.sum())
+
+    def features(self) -> Optional[Tuple[float, ...]]:
+        stats = self.stats
+        values = (
+            stats.ret(self.short_window_sec),
+            stats.ret(self.long_window_sec),
+            stats.stdev(self.short_window_sec),
+            stats.stdev(self.long_window_sec),
+            self.fast.slope,
+            self.slow.slope,
+        )
+        if any(value is None for value in values):
+            return None
+        return values  # type: ignore[return-value]
 
     def signal(self) -> str:
         return self._signal
+
+    @property
+    def trained_samples(self) -> int:
+        return self._published_samples
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+        self._batches.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _submit(self, batch: List[Sample]) -> None:
+        if not self.background:
+            self._train(batch)
+            return
+        try:
+            self._batches.put_nowait(batch)
+        except queue.Full:
+            self.dropped_batches += 1
+
+    def _train_loop(self) -> None:
+        while True:
+            batch = self._batches.get()
+            if batch is None:
+                return
+            self._train(batch)
+
+    def _score(self, features: Optional[Tuple[float, ...]]) -> None:
+        if self._cost_ns > self.budget_ns:
+            self.skipped += 1
+            self._cost_ns *= 0.5
+            return
+
+        published = self._published
+        self._scored = published
+
+        started = time.perf_counter_ns()
+        if published is None or features is None:
+            self.confidence = None
+            verdict = ENTER
+        else:
+            weights, means, scales = published
+            total = weights[0]
+            for index, value in enumerate(features):
+                total += weights[index + 1] * (value - means[index]) * scales[index]
+            self.confidence = _sigmoid(total)
+            verdict = ENTER if self.confidence >= self.threshold else BLOCK
+        elapsed = time.perf_counter_ns() - started
+        if self._cost_ns:
+            self._cost_ns = 0.8 * self._cost_ns + 0.2 * elapsed
+        else:
+            self._cost_ns = float(elapsed)
+        if elapsed > self.budget_ns:
+            self.overruns += 1
+        self._signal = verdict
+
+    def _train(self, batch: List[Sample]) -> None:
+        self.model.fit_batch(batch)
+        if self.model.samples >= self.min_samples:
+            self._published = self.model.snapshot()
+            self._published_samples = self.model.samples
+
+
+def _sigmoid(value: float) -> float:
+    if value >= 0:
+        return 1.0 / (1.0 + math.exp(-value))
+    exp = math.exp(value)
+    return exp / (1.0 + exp)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+import json
+import math
+from pathlib import Path
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+Level = Tuple[float, float]
+
+
+class BookUpdate(NamedTuple):
+    timestamp_ns: int
+    bids: Sequence[Level]
+    asks: Sequence[Level]
+    snapshot: bool = True
+
+
+class BookSide:
+    __slots__ = ("descending", "_keys", "_qtys")
+
+    def __init__(self, descending: bool = False) -> None:
+        self.descending = descending
+        self._keys: List[float] = []
+        self._qtys: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set(self, price: float, qty: float) -> None:
+        price = float(price)
+        qty = float(qty)
+        key = -price if self.descending else price
+        keys = self._keys
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            if qty > 0:
+                self._qtys[index] = qty
+            else:
+                del keys[index]
+                del self._qtys[index]
+        elif qty > 0:
+            keys.insert(index, key)
+            self._qtys.insert(index, qty)
+
+    def replace(self, levels: Iterable[Level]) -> None:
+        sign = -1.0 if self.descending else 1.0
+        ordered = sorted(
+            (sign * float(price), float(qty))
+            for price, qty in levels
+            if float(qty) > 0
+        )
+        self._keys = [key for key, _ in ordered]
+        self._qtys = [qty for _, qty in ordered]
+
+    def clear(self) -> None:
+        self._keys = []
+        self._qtys = []
+
+    def best(self) -> Optional[Level]:
+        if not self._keys:
+            return None
+        key = self._keys[0]
+        return (-key if self.descending else key), self._qtys[0]
+
+    def levels(self, depth: Optional[int] = None) -> List[Level]:
+        keys = self._keys if depth is None else self._keys[:depth]
+        sign = -1.0 if self.descending else 1.0
+        return [(sign * key, qty) for key, qty in zip(keys, self._qtys)]
+
+    def walk(self, qty: float, limit: Optional[float] = None) -> Tuple[float, float]:
+        if limit is None:
+            key_limit = math.inf
+        else:
+            key_limit = -limit if self.descending else limit
+        sign = -1.0 if self.descending else 1.0
+        remaining = qty
+        notional = 0.0
+        for key, available in zip(self._keys, self._qtys):
+            if key > key_limit:
+                break
+            take = available if available < remaining else remaining
+            notional += sign * key * take
+            remaining -= take
+            if remaining <= 0:
+                break
+        return qty - max(remaining, 0.0), notional
+
+
+class OrderBook:
+    def __init__(self) -> None:
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide()
+        self.timestamp_ns = 0
+        self.updates = 0
+
+    def apply(self, update: BookUpdate) -> None:
+        if update.snapshot:
+            self.bids.replace(update.bids)
+            self.asks.replace(update.asks)
+        else:
+            for price, qty in update.bids:
+                self.bids.set(price, qty)
+            for price, qty in update.asks:
+                self.asks.set(price, qty)
+        self.timestamp_ns = update.timestamp_ns
+        self.updates += 1
+
+    def best_bid(self) -> Optional[float]:
+        best = self.bids.best()
+        return best[0] if best else None
+
+    def best_ask(self) -> Optional[float]:
+        best = self.asks.best()
+        return best[0] if best else None
+
+    def mid(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2
+
+    def spread(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def vwap(
+        self, side: str, qty: float, limit: Optional[float] = None
+    ) -> Tuple[float, Optional[float]]:
+        levels = self.asks if side == "BUY" else self.bids
+        filled, notional = levels.walk(qty, limit)
+        if filled <= 0:
+            return 0.0, None
+        return filled, notional / filled
+
+    def snapshot(self, depth: Optional[int] = None) -> dict:
+        return {
+            "timestamp_ns": self.timestamp_ns,
+            "bids": self.bids.levels(depth),
+            "asks": self.asks.levels(depth),
+        }
+
+
+def read_book_log(
+    path: str | Path, decode: Optional[Callable[[str], Optional[BookUpdate]]] = None
+) -> Iterator[BookUpdate]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                update = decode(line) if decode is not None else _decode_line(line)
+            except (ValueError, KeyError, TypeError):
+                continue
+            if update is not None:
+                yield update
+
+
+def _decode_line(line: str) -> BookUpdate:
+    loaded = json.loads(line)
+    return BookUpdate(
+        int(loaded["timestamp_ns"]),
+        [(float(price), float(qty)) for price, qty in loaded["bids"]],
+        [(float(price), float(qty)) for price, qty in loaded["asks"]],
+        bool(loaded.get("snapshot", True)),
+    )
@@ -2,23 +2,100 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, TextIO
+
+_MISSING = object()
 
 
 class StateStore:
-    def __init__(self, path: str | Path) -> None:
+    def __init__(
+        self, path: str | Path, journal: bool = False, compact_every: int = 1000
+    ) -> None:
         self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.journal = journal
+        self.compact_every = max(1, int(compact_every))
+        self._persisted: Dict[str, Any] = {}
+        self._journal_entries = 0
+        self._journal_handle: Optional[TextIO] = None
 
     def load(self) -> Dict[str, Any]:
-        if not self.path.exists():
-            return {}
-        try:
-            return json.loads(self.path.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
-            return {}
+        state: Dict[str, Any] = {}
+        if self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                loaded = {}
+            if isinstance(loaded, dict):
+                state = loaded
+
+        self._journal_entries = 0
+        damaged = False
+        if self.journal_path.exists():
+            with self.journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        changes = json.loads(line)
+                    except json.JSONDecodeError:
+                        damaged = True
+                        continue
+                    if isinstance(changes, dict):
+                        state.update(changes)
+                        self._journal_entries += 1
+
+        self._persisted = dict(state)
+        if damaged:
+            self.compact()
+        return state
 
     def save(self, state: Dict[str, Any]) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         temp_path = self.path.with_suffix(".tmp")
         temp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
         temp_path.replace(self.path)
+        self._persisted = dict(state)
+        if self.journal_path.exists() or self._journal_handle:
+            self._close_journal()
+            self.journal_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def update(self, state: Dict[str, Any]) -> bool:
+        if not self.journal:
+            self.save(state)
+            return True
+
+        changes = {
+            key: value
+            for key, value in state.items()
+            if self._persisted.get(key, _MISSING) != value
+        }
+        if not changes:
+            return False
+
+        handle = self._open_journal()
+        handle.write(json.dumps(changes, separators=(",", ":")) + "\n")
+        handle.flush()
+        self._persisted.update(changes)
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_every:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        self.save(self._persisted)
+
+    def close(self) -> None:
+        if self._journal_entries:
+            self.compact()
+        self._close_journal()
+
+    def _open_journal(self) -> TextIO:
+        if self._journal_handle is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_handle = self.journal_path.open("a", encoding="utf-8")
+        return self._journal_handle
+
+    def _close_journal(self) -> None:
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
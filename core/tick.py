@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+SIDE_UNKNOWN = 0
+SIDE_BUY = 1
+SIDE_SELL = -1
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class Tick(NamedTuple):
+    timestamp_ns: int
+    price: float
+    volume: float = 0.0
+    side: int = SIDE_UNKNOWN
+    received_ns: int = 0
+
+
+def ns_to_datetime(timestamp_ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+def datetime_to_ns(timestamp: datetime) -> int:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return ((timestamp - _EPOCH) // timedelta(microseconds=1)) * 1000
@@ -1,12 +1,211 @@
 from __future__ import annotations
 
+from array import array
+import math
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class CandleSeries:
+    def __init__(self, seconds: int, history: int = 256, ema_period: int = 20) -> None:
+        self.seconds = int(seconds)
+        self.history = max(2, int(history))
+        self.ema_period = int(ema_period)
+        self._alpha = 2.0 / (self.ema_period + 1)
+        self.starts = array("d", bytes(8 * self.history))
+        self.opens = array("d", bytes(8 * self.history))
+        self.highs = array("d", bytes(8 * self.history))
+        self.lows = array("d", bytes(8 * self.history))
+        self.closes = array("d", bytes(8 * self.history))
+        self.volumes = array("d", bytes(8 * self.history))
+        self.closed = 0
+
+        self.ema: Optional[float] = None
+        self.slope: Optional[float] = None
+
+        self._start: Optional[float] = None
+        self._open = 0.0
+        self._high = 0.0
+        self._low = 0.0
+        self._close = 0.0
+        self._volume = 0.0
+
+    def update(self, price: float, timestamp: float, volume: float = 0.0) -> bool:
+        bucket = timestamp - timestamp % self.seconds
+        start = self._start
+        if start is None:
+            self._open_bar(bucket, price, volume)
+            return False
+        if bucket <= start:
+            if price > self._high:
+                self._high = price
+            if price < self._low:
+                self._low = price
+            self._close = price
+            self._volume += volume
+            return False
+
+        self._roll(start, bucket)
+        self._open_bar(bucket, price, volume)
+        return True
+
+    def load(
+        self, timestamps: Any, prices: Any, volumes: Any = None
+    ) -> Tuple[Any, Any]:
+        import numpy as np
+
+        times = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(prices, dtype=np.float64)
+        self.closed = 0
+        self.ema = None
+        self.slope = None
+        self._start = None
+        if not len(times):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        buckets = times - np.mod(times, self.seconds)
+        edges = np.flatnonzero(np.diff(buckets) > 0) + 1
+        firsts = np.concatenate(([0], edges))
+        lasts = np.concatenate((edges - 1, [len(values) - 1]))
+        if volumes is None:
+            bar_volumes = np.zeros(len(firsts))
+        else:
+            bar_volumes = np.add.reduceat(np.asarray(volumes, dtype=np.float64), firsts)
+        bars = zip(
+            buckets[firsts].tolist(),
+            values[firsts].tolist(),
+            np.maximum.reduceat(values, firsts).tolist(),
+            np.minimum.reduceat(values, firsts).tolist(),
+            values[lasts].tolist(),
+            bar_volumes.tolist(),
+        )
+        slopes = []
+        for bucket, open_, high, low, close, volume in bars:
+            if self._start is not None:
+                self._roll(self._start, bucket)
+                slopes.append(math.nan if self.slope is None else self.slope)
+            self._start = bucket
+            self._open = open_
+            self._high = high
+            self._low = low
+            self._close = close
+            self._volume = volume
+        return firsts[1:], np.array(slopes)
+
+    @property
+    def warm(self) -> bool:
+        return self.closed >= self.ema_period
+
+    def close(self, back: int = 1) -> Optional[float]:
+        if back < 1 or back > min(self.closed, self.history):
+            return None
+        return self.closes[(self.closed - back) % self.history]
+
+    def highest_high(self, bars: int) -> Optional[float]:
+        count = min(bars, self.closed, self.history)
+        if count <= 0:
+            return None
+        return max(
+            self.highs[(self.closed - back) % self.history]
+            for back in range(1, count + 1)
+        )
+
+    def _roll(self, start: float, bucket: float) -> None:
+        self._close_bar()
+        missing = min(int((bucket - start) // self.seconds) - 1, self.history)
+        if missing > 0:
+            flat = self._close
+            gap_start = bucket - missing * self.seconds
+            for index in range(missing):
+                self._start = gap_start + index * self.seconds
+                self._open = self._high = self._low = self._close = flat
+                self._volume = 0.0
+                self._close_bar()
+
+    def _open_bar(self, bucket: float, price: float, volume: float) -> None:
+        self._start = bucket
+        self._open = self._high = self._low = self._close = price
+        self._volume = volume
+
+    def _close_bar(self) -> None:
+        slot = self.closed % self.history
+        self.starts[slot] = self._start or 0.0
+        self.opens[slot] = self._open
+        self.highs[slot] = self._high
+        self.lows[slot] = self._low
+        self.closes[slot] = self._close
+        self.volumes[slot] = self._volume
+        self.closed += 1
+
+        previous = self.ema
+        if previous is None:
+            self.ema = self._close
+            return
+        self.ema = previous + self._alpha * (self._close - previous)
+        self.slope = self.ema / previous - 1 if previous else None
+
 
 class MultiTimeframeGuard:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        timeframes_min: Iterable[int] = (1, 5, 10, 30),
+        ema_period: int = 20,
+        history: int = 256,
+        permit_min: int = 5,
+        persist_min: int = 10,
+        brake_min: int = 30,
+        min_slope: float = 0.0,
+        drop_pct: float = 0.02,
+        drop_lookback: int = 8,
+    ) -> None:
+        self.series: Dict[int, CandleSeries] = {
+            int(minutes): CandleSeries(int(minutes) * 60, history, ema_period)
+            for minutes in timeframes_min
+        }
+        self.permit_min = permit_min
+        self.persist_min = persist_min
+        self.brake_min = brake_min
+        self.min_slope = min_slope
+        self.drop_pct = drop_pct
+        self.drop_lookback = drop_lookback
         self._blocked = False
 
-    def update(self, price: float) -> None:
-        _ = price
+    def update(self, price: float, timestamp: float, volume: float = 0.0) -> None:
+        closed = False
+        for series in self.series.values():
+            if series.update(price, timestamp, volume):
+                closed = True
+        if closed:
+            self._blocked = self._evaluate()
+
+    def load(self, timestamps: Any, prices: Any, volumes: Any = None) -> None:
+        closed = False
+        for series in self.series.values():
+            series.load(timestamps, prices, volumes)
+            closed = closed or series.closed > 0
+        self._blocked = self._evaluate() if closed else False
 
     def allow_entry(self) -> bool:
         return not self._blocked
+
+    def structural_drop(self) -> bool:
+        series = self.series.get(self.brake_min)
+        if series is None:
+            return False
+        high = series.highest_high(self.drop_lookback)
+        close = series.close()
+        if high is None or close is None:
+            return False
+        return close <= high * (1 - self.drop_pct)
+
+    def _evaluate(self) -> bool:
+        for minutes in (self.permit_min, self.persist_min):
+            series = self.series.get(minutes)
+            if series is None or not series.warm or series.slope is None:
+                continue
+            if series.slope < self.min_slope:
+                return True
+        brake = self.series.get(self.brake_min)
+        if brake is not None and brake.warm and brake.slope is not None:
+            if brake.slope < self.min_slope:
+                return True
+        return self.structural_drop()
@@ -1,17 +1,222 @@
 from __future__ import annotations
 
+from array import array
 from collections import deque
-from typing import Deque, Optional
+from dataclasses import dataclass
+import math
+from typing import Any, Deque, Dict, Iterable, Optional
+
+
+@dataclass
+class WindowStats:
+    window_sec: float
+    count: int
+    ret: Optional[float]
+    stdev: Optional[float]
+    range: Optional[float]
+    realized_vol: Optional[float]
+
+
+class _Window:
+    __slots__ = ("seconds", "start", "ret_sum", "ret_sq_sum", "ret_count", "highs", "lows")
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.start = 0
+        self.ret_sum = 0.0
+        self.ret_sq_sum = 0.0
+        self.ret_count = 0
+        self.highs: Deque[int] = deque()
+        self.lows: Deque[int] = deque()
+
+
+class RollingStats:
+    def __init__(self, windows_sec: Iterable[float], capacity: int = 1024) -> None:
+        self._windows: Dict[float, _Window] = {
+            float(seconds): _Window(float(seconds)) for seconds in windows_sec
+        }
+        if not self._windows:
+            raise ValueError("At least one window is required.")
+        self._longest = max(self._windows.values(), key=lambda w: w.seconds)
+        self._capacity = max(2, int(capacity))
+        self._times = array("d", bytes(8 * self._capacity))
+        self._prices = array("d", bytes(8 * self._capacity))
+        self._returns = array("d", bytes(8 * self._capacity))
+        self._head = 0
+
+    def update(self, price: float, timestamp: float) -> None:
+        head = self._head
+        if head - self._longest.start >= self._capacity:
+            self._grow()
+        capacity = self._capacity
+        slot = head % capacity
+        if head > 0:
+            previous = self._prices[(head - 1) % capacity]
+            log_ret = math.log(price / previous) if previous > 0 and price > 0 else 0.0
+        else:
+            log_ret = 0.0
+        self._times[slot] = timestamp
+        self._prices[slot] = price
+        self._returns[slot] = log_ret
+        self._head = head + 1
+
+        for window in self._windows.values():
+            if head > window.start:
+                window.ret_sum += log_ret
+                window.ret_sq_sum += log_ret * log_ret
+                window.ret_count += 1
+            highs = window.highs
+            while highs and self._prices[highs[-1] % capacity] <= price:
+                highs.pop()
+            highs.append(head)
+            lows = window.lows
+            while lows and self._prices[lows[-1] % capacity] >= price:
+                lows.pop()
+            lows.append(head)
+            self._evict(window, timestamp - window.seconds)
+
+    def load(self, timestamps: Any, prices: Any) -> None:
+        import numpy as np
+
+        times = np.asarray(timestamps, dtype=np.float64)
+        values = np.asarray(prices, dtype=np.float64)
+        if not len(times):
+            return
+        returns = np.zeros(len(values))
+        previous = values[:-1]
+        current = values[1:]
+        valid = (previous > 0) & (current > 0)
+        returns[1:][valid] = np.log(current[valid] / previous[valid])
+
+        first = int(np.searchsorted(times, times[-1] - self._longest.seconds, "left"))
+        times = times[first:]
+        values = values[first:]
+        returns = returns[first:]
+        count = len(times)
+        capacity = self._capacity
+        while capacity <= count:
+            capacity *= 2
+        padding = bytes(8 * (capacity - count))
+        columns = (("_times", times), ("_prices", values), ("_returns", returns))
+        for name, column in columns:
+            buffer = array("d", column.tobytes())
+            buffer.frombytes(padding)
+            setattr(self, name, buffer)
+        self._capacity = capacity
+        self._head = count
+
+        for window in self._windows.values():
+            start = int(np.searchsorted(times, times[-1] - window.seconds, "left"))
+            inside = returns[start + 1 :]
+            window.start = start
+            window.ret_count = len(inside)
+            window.ret_sum = float(inside.sum())
+            window.ret_sq_sum = float((inside * inside).sum())
+            segment = values[start:]
+            reverse = segment[::-1]
+            later_max = np.append(np.maximum.accumulate(reverse)[::-1][1:], -np.inf)
+            later_min = np.append(np.minimum.accumulate(reverse)[::-1][1:], np.inf)
+            highs = np.flatnonzero(segment > later_max) + start
+            lows = np.flatnonzero(segment < later_min) + start
+            window.highs = deque(highs.tolist())
+            window.lows = deque(lows.tolist())
+
+    def count(self, window_sec: float) -> int:
+        return self._head - self._windows[window_sec].start
+
+    def ret(self, window_sec: float) -> Optional[float]:
+        window = self._windows[window_sec]
+        if self._head - window.start < 2:
+            return None
+        first = self._prices[window.start % self._capacity]
+        if first <= 0:
+            return None
+        return self._prices[(self._head - 1) % self._capacity] / first - 1
+
+    def stdev(self, window_sec: float) -> Optional[float]:
+        window = self._windows[window_sec]
+        n = window.ret_count
+        if n < 2:
+            return None
+        mean = window.ret_sum / n
+        variance = (window.ret_sq_sum - n * mean * mean) / (n - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def range(self, window_sec: float) -> Optional[float]:
+        window = self._windows[window_sec]
+        if not window.lows:
+            return None
+        low = self._prices[window.lows[0] % self._capacity]
+        if low <= 0:
+            return None
+        return self._prices[window.highs[0] % self._capacity] / low - 1
+
+    def realized_vol(self, window_sec: float) -> Optional[float]:
+        window = self._windows[window_sec]
+        if window.ret_count < 1:
+            return None
+        return math.sqrt(max(window.ret_sq_sum, 0.0))
+
+    def stats(self, window_sec: float) -> WindowStats:
+        return WindowStats(
+            window_sec=window_sec,
+            count=self.count(window_sec),
+            ret=self.ret(window_sec),
+            stdev=self.stdev(window_sec),
+            range=self.range(window_sec),
+            realized_vol=self.realized_vol(window_sec),
+        )
+
+    def _evict(self, window: _Window, cutoff: float) -> None:
+        capacity = self._capacity
+        head = self._head
+        while window.start < head and self._times[window.start % capacity] < cutoff:
+            window.start += 1
+            if window.start < head:
+                log_ret = self._returns[window.start % capacity]
+                window.ret_sum -= log_ret
+                window.ret_sq_sum -= log_ret * log_ret
+                window.ret_count -= 1
+            if window.highs and window.highs[0] < window.start:
+                window.highs.popleft()
+            if window.lows and window.lows[0] < window.start:
+                window.lows.popleft()
+        if window.ret_count == 0:
+            window.ret_sum = 0.0
+            window.ret_sq_sum = 0.0
+
+    def _grow(self) -> None:
+        old_capacity = self._capacity
+        new_capacity = old_capacity * 2
+        start = self._longest.start
+        for name in ("_times", "_prices", "_returns"):
+            old = getattr(self, name)
+            new = array("d", bytes(8 * new_capacity))
+            for index in range(start, self._head):
+                new[index % new_capacity] = old[index % old_capacity]
+            setattr(self, name, new)
+        self._capacity = new_capacity
 
 
 class VolatilityFilter:
-    def __init__(self, window: int, vol_ok: float) -> None:
-        self.window = window
+    def __init__(
+        self,
+        window: float,
+        vol_ok: float,
+        spike_window: float = 10.0,
+        spike_ratio: float = 2.0,
+    ) -> None:
+        self.window = float(window)
         self.vol_ok = vol_ok
-        self._prices: Deque[float] = deque(maxlen=window)
+        self.spike_window = float(spike_window)
+        self.spike_ratio = spike_ratio
+        self.stats = RollingStats((self.spike_window, self.window))
+
+    def update(self, price: float, timestamp: float) -> None:
+        self.stats.update(price, timestamp)
 
-    def update(self, price: float) -> None:
-        self._prices.append(price)
+    def load(self, timestamps: Any, prices: Any) -> None:
+        self.stats.load(timestamps, prices)
 
     def allowed(self) -> bool:
         vol = self._volatility()
@@ -19,11 +224,18 @@ class VolatilityFilter:
             return True
         return vol <= self.vol_ok
 
+    def spiking(self) -> bool:
+        short = self.stats.stdev(self.spike_window)
+        long = self.stats.stdev(self.window)
+        if short is None or long is None:
+            return False
+        return short > long * self.spike_ratio
+
+    def entry_allowed(self) -> bool:
+        return self.allowed() and not self.spiking()
+
     def _volatility(self) -> Optional[float]:
-        if len(self._prices) < 2:
-            return None
-        first = self._prices[0]
-        last = self._prices[-1]
-        if first <= 0:
+        ret = self.stats.ret(self.window)
+        if ret is None:
             return None
-        return abs(last - first) / first
+        return abs(ret)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import time
+from typing import Iterable, List
+
+from core.tick import datetime_to_ns
+
+
+def load_messages(path: str | Path) -> List[str]:
+    with Path(path).open("r", encoding="utf-8") as handle:
+        return [line.rstrip("\n") for line in handle if line.strip()]
+
+
+def demo_messages(config: dict, ticks: int) -> List[str]:
+    from run import demo_price_stream
+
+    messages = []
+    for index, (timestamp, price) in enumerate(demo_price_stream(config, ticks)):
+        messages.append(
+            json.dumps(
+                {
+                    "response_type": "DATA",
+                    "channel": "TRADE",
+                    "data": {
+                        "quote_currency": "KRW",
+                        "target_currency": config["symbol"],
+                        "id": str(index),
+                        "timestamp": datetime_to_ns(timestamp) // 1_000_000,
+                        "price": f"{price:.4f}",
+                        "qty": "1.0",
+                        "is_seller_maker": index % 2 == 0,
+                    },
+                }
+            )
+        )
+    return messages
+
+
+def restamp(message: str, timestamp_ms: int) -> str:
+    decoded = json.loads(message)
+    data = decoded.get("data")
+    if isinstance(data, dict) and "timestamp" in data:
+        data["timestamp"] = timestamp_ms
+    return json.dumps(decoded)
+
+
+class ReplayServer:
+    def __init__(
+        self,
+        messages: Iterable[str],
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        rate: float = 0.0,
+        stamp_now: bool = False,
+    ) -> None:
+        self.messages = list(messages)
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.stamp_now = stamp_now
+        self.sent = 0
+        self._server = None
+
+    async def start(self) -> None:
+        try:
+            import websockets  # type: ignore
+        except Exception as exc:
+            raise RuntimeError(
+                "The 'websockets' package is required for the replay server."
+            ) from exc
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        if self.port == 0:
+            self.port = next(iter(self._server.sockets)).getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handle(self, connection, *_: object) -> None:
+        await connection.recv()
+        started = time.perf_counter()
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        for index, message in enumerate(self.messages):
+            if interval:
+                delay = started + index * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if self.stamp_now:
+                message = restamp(message, time.time_ns() // 1_000_000)
+            await connection.send(message)
+            self.sent += 1
+            if not interval and index % 256 == 255:
+                await asyncio.sleep(0)
+        await connection.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay recorded Coinone messages.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--messages", default=None)
+    parser.add_argument("--demo-ticks", type=int, default=None)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=0.0)
+    parser.add_argument("--stamp-now", action="store_true")
+    return parser.parse_args()
+
+
+async def _serve_forever(server: ReplayServer) -> None:
+    await server.start()
+    print(f"Replaying {len(server.messages)} messages on {server.url}")
+    await asyncio.Future()
+
+
+def main() -> None:
+    from core.config import load_config
+
+    args = parse_args()
+    if args.messages:
+        messages = load_messages(args.messages)
+    else:
+        config = load_config(args.config)
+        ticks = args.demo_ticks or int(config["demo_ticks"])
+        messages = demo_messages(config, ticks)
+    server = ReplayServer(
+        messages,
+        host=args.host,
+        port=args.port,
+        rate=args.rate,
+        stamp_now=args.stamp_now,
+    )
+    try:
+        asyncio.run(_serve_forever(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
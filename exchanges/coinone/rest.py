@@ -1,13 +1,280 @@
 from __future__ import annotations
 
+import base64
+import copy
+import hashlib
+import hmac
+import http.client
+import json
+import queue
+import select
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import uuid
+
+from services.ratelimit import PRIORITY_HIGH, PRIORITY_LOW, TokenBucket
+
+COINONE_API_URL = "https://api.coinone.co.kr"
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class CoinoneApiError(RuntimeError):
+    def __init__(self, message: str, error_code: str = "", status: int = 0) -> None:
+        super().__init__(message)
+        self.error_code = error_code
+        self.status = status
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        base_url: str,
+        size: int = 4,
+        timeout: float = 5.0,
+        max_idle_sec: float = 30.0,
+    ) -> None:
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.max_idle_sec = max_idle_sec
+        self._idle: "queue.LifoQueue[Tuple[http.client.HTTPConnection, float]]" = (
+            queue.LifoQueue()
+        )
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._low_slots = threading.BoundedSemaphore(max(1, self.size - 1))
+        self.opened = 0
+        self.stale = 0
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        priority: int = PRIORITY_LOW,
+    ) -> Tuple[int, bytes]:
+        retries = 2 if method.upper() in IDEMPOTENT_METHODS else 1
+        low = priority != PRIORITY_HIGH
+        if low:
+            self._low_slots.acquire()
+        self._slots.acquire()
+        try:
+            for attempt in range(retries):
+                connection, reused = self._checkout()
+                try:
+                    connection.request(method, path, body=body, headers=headers or {})
+                    response = connection.getresponse()
+                    payload = response.read()
+                except (http.client.HTTPException, OSError):
+                    connection.close()
+                    if reused and attempt < retries - 1:
+                        continue
+                    raise
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._idle.put((connection, time.monotonic()))
+                return response.status, payload
+            raise http.client.HTTPException("Request failed after retry.")
+        finally:
+            self._slots.release()
+            if low:
+                self._low_slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        while True:
+            try:
+                connection, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            idle = time.monotonic() - idle_since
+            if idle <= self.max_idle_sec and not _closed_by_peer(connection):
+                return connection, True
+            connection.close()
+            self.stale += 1
+        self.opened += 1
+        if self.scheme == "http":
+            connection_class = http.client.HTTPConnection
+        else:
+            connection_class = http.client.HTTPSConnection
+        return connection_class(self.host, self.port, timeout=self.timeout), False
+
+
+class PayloadSigner:
+    def __init__(self, api_key: str, api_secret: str) -> None:
+        self._prefix = '{"access_token":' + json.dumps(api_key) + ',"nonce":"'
+        self._hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha512)
+
+    def sign(self, params: Dict[str, object]) -> Tuple[bytes, Dict[str, str]]:
+        body = self._prefix + str(uuid.uuid4()) + '"'
+        if params:
+            body += "," + json.dumps(params, separators=(",", ":"))[1:-1]
+        body += "}"
+        raw = body.encode("utf-8")
+        encoded = base64.b64encode(raw)
+        digest = self._hmac.copy()
+        digest.update(encoded)
+        headers = {
+            "Content-Type": "application/json",
+            "X-COINONE-PAYLOAD": encoded.decode("ascii"),
+            "X-COINONE-SIGNATURE": digest.hexdigest(),
+        }
+        return raw, headers
+
+
+class _PendingTicker:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
 
 class CoinoneRestClient:
-    def __init__(self, api_key: str = "", api_secret: str = "") -> None:
+    def __init__(
+        self,
+        api_key: str = "",
+        api_secret: str = "",
+        base_url: str = COINONE_API_URL,
+        quote_currency: str = "KRW",
+        pool_size: int = 4,
+        timeout: float = 5.0,
+        max_idle_sec: float = 30.0,
+        rate_per_sec: float = 10.0,
+        burst: float = 10.0,
+        order_reserve: float = 2.0,
+        ticker_ttl_sec: float = 0.5,
+    ) -> None:
         self.api_key = api_key
         self.api_secret = api_secret
+        self.quote_currency = quote_currency
+        self.ticker_ttl_sec = ticker_ttl_sec
+        self.pool = ConnectionPool(
+            base_url, size=pool_size, timeout=timeout, max_idle_sec=max_idle_sec
+        )
+        self.limiter = TokenBucket(rate_per_sec, burst, reserve=order_reserve)
+        self._signer = PayloadSigner(api_key, api_secret) if api_secret else None
+        self._tickers: Dict[str, Tuple[float, dict]] = {}
+        self._pending: Dict[str, _PendingTicker] = {}
+        self._ticker_lock = threading.Lock()
 
     def get_ticker(self, symbol: str) -> dict:
-        raise NotImplementedError("Coinone REST integration not implemented yet.")
+        now = time.monotonic()
+        with self._ticker_lock:
+            cached = self._tickers.get(symbol)
+            if cached is not None and cached[0] > now:
+                return copy.deepcopy(cached[1])
+            pending = self._pending.get(symbol)
+            leader = pending is None
+            if leader:
+                pending = self._pending[symbol] = _PendingTicker()
+
+        assert pending is not None
+        if not leader:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            assert pending.result is not None
+            return copy.deepcopy(pending.result)
+
+        try:
+            ticker = self._fetch_ticker(symbol)
+        except BaseException as exc:
+            pending.error = exc
+            raise
+        else:
+            pending.result = ticker
+            with self._ticker_lock:
+                self._tickers[symbol] = (time.monotonic() + self.ticker_ttl_sec, ticker)
+            return copy.deepcopy(ticker)
+        finally:
+            with self._ticker_lock:
+                self._pending.pop(symbol, None)
+            pending.done.set()
 
     def place_order(self, symbol: str, side: str, qty: float, price: float) -> dict:
-        raise NotImplementedError("Coinone REST integration not implemented yet.")
+        if self._signer is None:
+            raise ValueError("API credentials are required to place orders.")
+        side = side.upper()
+        if side not in {"BUY", "SELL"}:
+            raise ValueError("Order side must be BUY or SELL.")
+        if qty <= 0 or price <= 0:
+            raise ValueError("Order quantity and price must be positive.")
+        body, headers = self._signer.sign(
+            {
+                "side": side,
+                "quote_currency": self.quote_currency,
+                "target_currency": symbol.upper(),
+                "type": "LIMIT",
+                "price": _format_number(price),
+                "qty": _format_number(qty),
+                "post_only": False,
+            }
+        )
+        return self._call("POST", "/v2.1/order", PRIORITY_HIGH, body, headers)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _fetch_ticker(self, symbol: str) -> dict:
+        path = f"/public/v2/ticker_new/{self.quote_currency}/{symbol.upper()}"
+        data = self._call("GET", path, PRIORITY_LOW)
+        tickers = data.get("tickers") or []
+        if not tickers:
+            raise CoinoneApiError(f"No ticker returned for {symbol}.")
+        return tickers[0]
+
+    def _call(
+        self,
+        method: str,
+        path: str,
+        priority: int,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> dict:
+        self.limiter.acquire(priority)
+        status, payload = self.pool.request(
+            method, path, body=body, headers=headers, priority=priority
+        )
+        try:
+            data = json.loads(payload)
+        except json.JSONDecodeError as exc:
+            raise CoinoneApiError(
+                f"Invalid response from {path}.", status=status
+            ) from exc
+        if status >= 400 or data.get("result") != "success":
+            raise CoinoneApiError(
+                f"Coinone request {path} failed.",
+                error_code=str(data.get("error_code", "")),
+                status=status,
+            )
+        return data
+
+
+def _closed_by_peer(connection: http.client.HTTPConnection) -> bool:
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
+
+
+def _format_number(value: float) -> str:
+    return format(value, ".8f").rstrip("0").rstrip(".")
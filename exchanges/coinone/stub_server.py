@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import argparse
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from exchanges.coinone.rest import CoinoneRestClient
+
+
+class CoinoneStubServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_secret: str = "",
+        price: float = 50_000.0,
+        delay_sec: float = 0.0,
+        drop_idle: bool = False,
+        drop_orders: bool = False,
+    ) -> None:
+        self.api_secret = api_secret
+        self.price = price
+        self.delay_sec = delay_sec
+        self.drop_idle = drop_idle
+        self.drop_orders = drop_orders
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="coinone-stub", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _handler_class(self) -> type:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self) -> None:
+                stub._count()
+                parts = self.path.strip("/").split("/")
+                if len(parts) == 5 and parts[:3] == ["public", "v2", "ticker_new"]:
+                    ticker = {
+                        "quote_currency": parts[3].lower(),
+                        "target_currency": parts[4].lower(),
+                        "timestamp": time.time_ns() // 1_000_000,
+                        "last": f"{stub.price:.4f}",
+                    }
+                    self._reply(
+                        200,
+                        {"result": "success", "error_code": "0", "tickers": [ticker]},
+                    )
+                    return
+                self._reply(404, {"result": "error", "error_code": "404"})
+
+            def do_POST(self) -> None:
+                stub._count()
+                length = int(self.headers.get("Content-Length", "0"))
+                body = self.rfile.read(length)
+                if stub.drop_orders:
+                    self.close_connection = True
+                    return
+                if self.path != "/v2.1/order":
+                    self._reply(404, {"result": "error", "error_code": "404"})
+                    return
+                payload = self.headers.get("X-COINONE-PAYLOAD", "")
+                signature = self.headers.get("X-COINONE-SIGNATURE", "")
+                expected = hmac.new(
+                    stub.api_secret.encode("utf-8"),
+                    payload.encode("ascii"),
+                    hashlib.sha512,
+                ).hexdigest()
+                if not hmac.compare_digest(signature, expected) or (
+                    base64.b64decode(payload) != body
+                ):
+                    self._reply(401, {"result": "error", "error_code": "107"})
+                    return
+                order = json.loads(body)
+                self._reply(
+                    200,
+                    {
+                        "result": "success",
+                        "error_code": "0",
+                        "order_id": order["nonce"],
+                    },
+                )
+
+            def log_message(self, *_: object) -> None:
+                return
+
+            def _reply(self, status: int, data: dict) -> None:
+                if stub.delay_sec:
+                    time.sleep(stub.delay_sec)
+                encoded = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+                if stub.drop_idle:
+                    self.close_connection = True
+
+        return Handler
+
+    def _count(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+def benchmark(
+    call: Callable[[], object], calls: int, threads: int = 1
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def timed(_: int) -> None:
+        started = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(calls)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    last = len(latencies) - 1
+    return {
+        "calls": calls,
+        "calls_per_sec": calls / elapsed if elapsed else 0.0,
+        "p50_ms": latencies[int(last * 0.50)] * 1000,
+        "p99_ms": latencies[int(last * 0.99)] * 1000,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark CoinoneRestClient locally.")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--ticker-ttl", type=float, default=0.0)
+    parser.add_argument("--rate", type=float, default=100_000.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    secret = "stub-secret"
+    stub = CoinoneStubServer(api_secret=secret)
+    stub.start()
+    client = CoinoneRestClient(
+        api_key="stub-key",
+        api_secret=secret,
+        base_url=stub.url,
+        pool_size=args.threads,
+        rate_per_sec=args.rate,
+        burst=args.rate,
+        ticker_ttl_sec=args.ticker_ttl,
+    )
+    try:
+        ticker = benchmark(lambda: client.get_ticker("XRP"), args.calls, args.threads)
+        order = benchmark(
+            lambda: client.place_order("XRP", "BUY", 1.0, 500.0),
+            args.calls,
+            args.threads,
+        )
+    finally:
+        client.close()
+        stub.stop()
+    for name, result in (("get_ticker", ticker), ("place_order", order)):
+        print(name, " | ".join(f"{key}={value:.2f}" for key, value in result.items()))
+    print(f"http_requests={stub.requests} | connections={stub.connections}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,167 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+from core.orderbook import BookUpdate, OrderBook
+from core.tick import SIDE_BUY, SIDE_SELL, SIDE_UNKNOWN, Tick
+from services.latency import STAGE_DECODE
+
+COINONE_WS_URL = "wss://stream.coinone.co.kr"
+
 
 class CoinoneWebSocket:
-    def __init__(self, symbol: str) -> None:
+    def __init__(
+        self,
+        symbol: str,
+        url: str = COINONE_WS_URL,
+        channels: Iterable[str] = ("TRADE",),
+        quote_currency: str = "KRW",
+        ping_interval_sec: float = 600.0,
+        reconnect_delay_sec: float = 1.0,
+        reconnect: bool = True,
+        latency: Any = None,
+        book: Optional[OrderBook] = None,
+    ) -> None:
         self.symbol = symbol
+        self.url = url
+        self.channels = tuple(channel.upper() for channel in channels)
+        self.quote_currency = quote_currency
+        self.ping_interval_sec = ping_interval_sec
+        self.reconnect_delay_sec = reconnect_delay_sec
+        self.reconnect = reconnect
+        self.latency = latency
+        self.book = book
+        self.messages = 0
+        self.decode_errors = 0
+        self._connection: Any = None
+        self._connection_errors: tuple = (OSError, asyncio.TimeoutError)
+
+    def subscribe_messages(self) -> List[str]:
+        return [
+            json.dumps(
+                {
+                    "request_type": "SUBSCRIBE",
+                    "channel": channel,
+                    "topic": {
+                        "quote_currency": self.quote_currency,
+                        "target_currency": self.symbol,
+                    },
+                }
+            )
+            for channel in self.channels
+        ]
+
+    async def connect(self) -> None:
+        try:
+            import websockets  # type: ignore
+            import websockets.exceptions  # type: ignore
+        except Exception as exc:
+            raise RuntimeError(
+                "The 'websockets' package is required for the Coinone WebSocket feed."
+            ) from exc
+
+        self._connection_errors = (
+            OSError,
+            asyncio.TimeoutError,
+            websockets.exceptions.ConnectionClosed,
+        )
+        self._connection = await websockets.connect(self.url)
+        for message in self.subscribe_messages():
+            await self._connection.send(message)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def ticks(self) -> AsyncIterator[Tick]:
+        while True:
+            pinger: Optional[asyncio.Task] = None
+            try:
+                if self._connection is None:
+                    await self.connect()
+                pinger = asyncio.create_task(self._ping_loop())
+                latency = self.latency
+                book = self.book
+                async for raw in self._connection:
+                    received_ns = time.time_ns()
+                    self.messages += 1
+                    timing = latency is not None and latency.enabled
+                    if timing:
+                        begin = time.perf_counter_ns()
+                    try:
+                        tick = decode_message(raw, received_ns, book)
+                    except (ValueError, KeyError, TypeError):
+                        self.decode_errors += 1
+                        continue
+                    if timing:
+                        latency.record(STAGE_DECODE, time.perf_counter_ns() - begin)
+                    if tick is not None:
+                        yield tick
+            except self._connection_errors:
+                if not self.reconnect:
+                    raise
+            finally:
+                if pinger is not None:
+                    pinger.cancel()
+                await self.close()
+            if not self.reconnect:
+                return
+            await asyncio.sleep(self.reconnect_delay_sec)
+
+    async def _ping_loop(self) -> None:
+        ping = json.dumps({"request_type": "PING"})
+        while True:
+            await asyncio.sleep(self.ping_interval_sec)
+            if self._connection is not None:
+                await self._connection.send(ping)
+
+
+def decode_message(
+    raw: str | bytes, received_ns: int = 0, book: Optional[OrderBook] = None
+) -> Optional[Tick]:
+    message = json.loads(raw)
+    if message.get("response_type") != "DATA":
+        return None
+    data = message["data"]
+    channel = message.get("channel")
+    timestamp_ns = int(data["timestamp"]) * 1_000_000
+    if channel == "TRADE":
+        side = SIDE_BUY if data.get("is_seller_maker") else SIDE_SELL
+        return Tick(
+            timestamp_ns=timestamp_ns,
+            price=float(data["price"]),
+            volume=float(data.get("qty", 0.0)),
+            side=side,
+            received_ns=received_ns,
+        )
+    if channel == "TICKER":
+        return Tick(
+            timestamp_ns=timestamp_ns,
+            price=float(data["last"]),
+            volume=0.0,
+            side=SIDE_UNKNOWN,
+            received_ns=received_ns,
+        )
+    if channel == "ORDERBOOK" and book is not None:
+        book.apply(_book_update(data, timestamp_ns))
+    return None
+
+
+def decode_book_message(raw: str | bytes) -> Optional[BookUpdate]:
+    message = json.loads(raw)
+    if message.get("response_type") != "DATA" or message.get("channel") != "ORDERBOOK":
+        return None
+    data = message["data"]
+    return _book_update(data, int(data["timestamp"]) * 1_000_000)
+
 
-    def connect(self) -> None:
-        raise NotImplementedError("Coinone WebSocket integration not implemented yet.")
+def _book_update(data: dict, timestamp_ns: int) -> BookUpdate:
+    return BookUpdate(
+        timestamp_ns,
+        [(float(level["price"]), float(level["qty"])) for level in data["bids"]],
+        [(float(level["price"]), float(level["qty"])) for level in data["asks"]],
+    )
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.heartbeat import HeartbeatStrategy, cooldown_ns
+from core.tick import datetime_to_ns, ns_to_datetime
+from paper.ledger import Ledger, TradeEvent
+
+BUY = 1
+SELL = -1
+
+_MIN_CHUNK = 64
+_MAX_CHUNK = 1 << 16
+
+
+@dataclass
+class BacktestResult:
+    signals: np.ndarray
+    ledger: Ledger
+    trades: List[TradeEvent]
+    summary: dict
+
+
+def run_backtest(
+    prices: Sequence[float] | np.ndarray,
+    timestamps: Sequence | np.ndarray,
+    config: dict,
+    strategy: Optional[HeartbeatStrategy] = None,
+    ledger: Optional[Ledger] = None,
+) -> BacktestResult:
+    price_arr = np.ascontiguousarray(prices, dtype=np.float64)
+    ts_ns = as_epoch_ns(timestamps)
+    if strategy is None:
+        strategy = HeartbeatStrategy(
+            effective_gap=config["effective_gap"],
+            trailing_pct=config["trailing_pct"],
+            cooldown_sec=config["cooldown_sec"],
+        )
+    if ledger is None:
+        ledger = Ledger(config["initial_cash"])
+
+    signals = heartbeat_signals(price_arr, ts_ns, strategy)
+    trades = apply_signals(ledger, signals, price_arr, ts_ns, config)
+    last_price = float(price_arr[-1]) if len(price_arr) else 0.0
+    return BacktestResult(
+        signals=signals,
+        ledger=ledger,
+        trades=trades,
+        summary=ledger.summary(last_price),
+    )
+
+
+def heartbeat_signals(
+    prices: np.ndarray, timestamps_ns: np.ndarray, strategy: HeartbeatStrategy
+) -> np.ndarray:
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    timestamps_ns = np.ascontiguousarray(timestamps_ns, dtype=np.int64)
+    if prices.shape != timestamps_ns.shape:
+        raise ValueError("prices and timestamps must have the same length.")
+
+    n = len(prices)
+    signals = np.zeros(n, dtype=np.int8)
+    gap_factor = 1 + strategy.effective_gap
+    arm_pct = strategy.arm_pct
+    stop_factor = 1 - strategy.trailing_pct
+    cooldown_step = cooldown_ns(strategy.cooldown_sec)
+
+    state = strategy.state
+    recent_low = strategy.recent_low
+    entry_price = strategy.entry_price
+    peak = strategy.peak
+    armed = strategy.armed
+    cooldown_until = strategy.cooldown_until_ns
+
+    i = 0
+    while i < n:
+        if state == "COOLDOWN":
+            if cooldown_until is None:
+                break
+            k = _first_time_reached(timestamps_ns, i, cooldown_until)
+            if k < 0:
+                break
+            state = "IDLE"
+            recent_low = float(prices[k])
+            i = k
+
+        if state == "IDLE":
+            j, recent_low = _first_entry(prices, i, recent_low, gap_factor)
+            if j < 0:
+                break
+            signals[j] = BUY
+            state = "IN_POSITION"
+            entry_price = float(prices[j])
+            peak = entry_price
+            armed = False
+            i = j + 1
+            continue
+
+        if state == "IN_POSITION":
+            if not armed:
+                if not entry_price:
+                    peak = _running_peak(prices, i, peak)
+                    break
+                j, peak = _first_arm(prices, i, peak, entry_price * (1 + arm_pct))
+                if j < 0:
+                    break
+                armed = True
+                i = j
+            j, peak = _first_stop(prices, i, peak, stop_factor)
+            if j < 0:
+                break
+            signals[j] = SELL
+            state = "COOLDOWN"
+            cooldown_until = int(timestamps_ns[j]) + cooldown_step
+            i = j + 1
+            continue
+
+        break
+
+    strategy.state = state
+    strategy.recent_low = recent_low
+    strategy.entry_price = entry_price
+    strategy.peak = peak
+    strategy.armed = armed
+    strategy.cooldown_until_ns = cooldown_until
+    return signals
+
+
+def apply_signals(
+    ledger: Ledger,
+    signals: np.ndarray,
+    prices: np.ndarray,
+    timestamps_ns: np.ndarray,
+    config: dict,
+) -> List[TradeEvent]:
+    trades: List[TradeEvent] = []
+    for index in np.flatnonzero(signals):
+        price = float(prices[index])
+        timestamp_ns = int(timestamps_ns[index])
+        timestamp = ns_to_datetime(timestamp_ns).isoformat()
+        if signals[index] == BUY:
+            qty = config["trade_size_cash"] / price
+            try:
+                event = ledger.buy(
+                    price=price,
+                    qty=qty,
+                    fee_rate=config["fee_rate"],
+                    slippage_rate=config["slippage_rate"],
+                    timestamp=timestamp,
+                    timestamp_ns=timestamp_ns,
+                )
+            except ValueError:
+                continue
+            trades.append(event)
+        elif ledger.position_qty > 0:
+            try:
+                event = ledger.sell(
+                    price=price,
+                    qty=ledger.position_qty,
+                    fee_rate=config["fee_rate"],
+                    slippage_rate=config["slippage_rate"],
+                    timestamp=timestamp,
+                    timestamp_ns=timestamp_ns,
+                )
+            except ValueError:
+                continue
+            trades.append(event)
+    return trades
+
+
+def stream_to_arrays(
+    stream: Iterable[Tuple[datetime, float]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    timestamps: List[int] = []
+    prices: List[float] = []
+    for timestamp, price in stream:
+        timestamps.append(datetime_to_ns(timestamp))
+        prices.append(price)
+    return np.array(prices, dtype=np.float64), np.array(timestamps, dtype=np.int64)
+
+
+def as_epoch_ns(timestamps: Sequence | np.ndarray) -> np.ndarray:
+    if isinstance(timestamps, np.ndarray):
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            return timestamps.astype("datetime64[ns]").view(np.int64)
+        if np.issubdtype(timestamps.dtype, np.integer):
+            return timestamps.astype(np.int64, copy=False)
+        if np.issubdtype(timestamps.dtype, np.floating):
+            return np.round(timestamps * 1e9).astype(np.int64)
+    return np.array([datetime_to_ns(ts) for ts in timestamps], dtype=np.int64)
+
+
+def _first_time_reached(timestamps_ns: np.ndarray, start: int, until: int) -> int:
+    for lo, hi in _windows(start, len(timestamps_ns)):
+        hits = timestamps_ns[lo:hi] >= until
+        if hits.any():
+            return lo + int(hits.argmax())
+    return -1
+
+
+def _first_entry(
+    prices: np.ndarray, start: int, recent_low: Optional[float], gap_factor: float
+) -> Tuple[int, Optional[float]]:
+    for lo, hi in _windows(start, len(prices)):
+        chunk = prices[lo:hi]
+        lows = np.minimum.accumulate(chunk)
+        if recent_low is not None:
+            np.minimum(lows, recent_low, out=lows)
+        hits = (chunk >= lows * gap_factor) & (lows != 0)
+        if hits.any():
+            j = int(hits.argmax())
+            return lo + j, float(lows[j])
+        recent_low = float(lows[-1])
+    return -1, recent_low
+
+
+def _first_arm(
+    prices: np.ndarray, start: int, peak: Optional[float], arm_level: float
+) -> Tuple[int, Optional[float]]:
+    for lo, hi in _windows(start, len(prices)):
+        chunk = prices[lo:hi]
+        hits = chunk >= arm_level
+        if hits.any():
+            j = int(hits.argmax())
+            return lo + j, _max_with(peak, chunk[: j + 1])
+        peak = _max_with(peak, chunk)
+    return -1, peak
+
+
+def _first_stop(
+    prices: np.ndarray, start: int, peak: Optional[float], stop_factor: float
+) -> Tuple[int, Optional[float]]:
+    for lo, hi in _windows(start, len(prices)):
+        chunk = prices[lo:hi]
+        peaks = np.maximum.accumulate(chunk)
+        if peak is not None:
+            np.maximum(peaks, peak, out=peaks)
+        hits = (chunk <= peaks * stop_factor) & (peaks != 0)
+        if hits.any():
+            j = int(hits.argmax())
+            return lo + j, float(peaks[j])
+        peak = float(peaks[-1])
+    return -1, peak
+
+
+def _running_peak(prices: np.ndarray, start: int, peak: Optional[float]) -> Optional[float]:
+    if start >= len(prices):
+        return peak
+    return _max_with(peak, prices[start:])
+
+
+def _max_with(peak: Optional[float], chunk: np.ndarray) -> float:
+    chunk_max = float(chunk.max())
+    if peak is None or chunk_max > peak:
+        return chunk_max
+    return peak
+
+
+def _windows(start: int, stop: int):
+    size = _MIN_CHUNK
+    lo = start
+    while lo < stop:
+        hi = min(lo + size, stop)
+        yield lo, hi
+        lo = hi
+        size = min(size * 2, _MAX_CHUNK)
+
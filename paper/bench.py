@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.config import load_config
+from core.heartbeat import HeartbeatStrategy
+from core.state import StateStore
+from core.tick import datetime_to_ns
+from paper.backtest import run_backtest, stream_to_arrays
+from paper.ledger import Ledger
+from paper.report import format_trade
+from paper.session import PaperSession, scratch_config
+
+BENCH_START = datetime(2024, 1, 1)
+PERCENTILES = (50, 90, 99)
+STATE_SAVE_CALLS = 2000
+
+Stream = List[Tuple[datetime, float]]
+
+
+def bench_stream(config: dict, ticks: int) -> Stream:
+    from run import demo_price_stream
+
+    return list(demo_price_stream(config, ticks, start=BENCH_START))
+
+
+def summarize(latencies_ns: List[int], elapsed_sec: float) -> Dict[str, float]:
+    calls = len(latencies_ns)
+    ordered = sorted(latencies_ns)
+    result = {
+        "calls": calls,
+        "ops_per_sec": calls / elapsed_sec if elapsed_sec > 0 else 0.0,
+    }
+    last = calls - 1
+    for pct in PERCENTILES:
+        result[f"p{pct}_us"] = ordered[int(last * pct / 100)] / 1000 if calls else 0.0
+    result["max_us"] = ordered[-1] / 1000 if calls else 0.0
+    return result
+
+
+def timed(calls: List[Callable[[], object]]) -> Dict[str, float]:
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    append = latencies.append
+    started = time.perf_counter()
+    for call in calls:
+        begin = clock()
+        call()
+        append(clock() - begin)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_on_tick(config: dict, stream: Stream, workdir: Path) -> Dict[str, float]:
+    strategy = _strategy(config)
+    on_tick = strategy.on_tick
+    return timed([lambda t=t, p=p: on_tick(p, t) for t, p in stream])
+
+
+def bench_ledger(config: dict, stream: Stream, workdir: Path) -> Dict[str, dict]:
+    cost = float(config["trade_size_cash"])
+    ledger = Ledger(cost * 2 * len(stream), trade_tail=int(config["trade_tail_size"]))
+    fee_rate = config["fee_rate"]
+    slippage_rate = config["slippage_rate"]
+    clock = time.perf_counter_ns
+    events: List[object] = []
+    buy_ns: List[int] = []
+    sell_ns: List[int] = []
+    for timestamp, price in stream:
+        stamp = timestamp.isoformat()
+        stamp_ns = datetime_to_ns(timestamp)
+        qty = cost / price
+        begin = clock()
+        events.append(
+            ledger.buy(price, qty, fee_rate, slippage_rate, stamp, timestamp_ns=stamp_ns)
+        )
+        middle = clock()
+        events.append(
+            ledger.sell(price, qty, fee_rate, slippage_rate, stamp, timestamp_ns=stamp_ns)
+        )
+        end = clock()
+        buy_ns.append(middle - begin)
+        sell_ns.append(end - middle)
+    return {
+        "ledger.buy": summarize(buy_ns, sum(buy_ns) / 1e9),
+        "ledger.sell": summarize(sell_ns, sum(sell_ns) / 1e9),
+        "ledger.summary": timed([lambda p=p: ledger.summary(p) for _, p in stream]),
+        "format_trade": timed([lambda e=e: format_trade(e) for e in events]),
+    }
+
+
+def bench_state_save(config: dict, stream: Stream, workdir: Path) -> Dict[str, float]:
+    store = StateStore(workdir / "bench_state.json")
+    ledger = Ledger(config["initial_cash"])
+    strategy = _strategy(config)
+    states = []
+    for timestamp, price in stream[:STATE_SAVE_CALLS]:
+        strategy.on_tick(price, timestamp)
+        states.append(
+            {
+                "ledger": ledger.snapshot(),
+                "strategy": strategy.snapshot(),
+                "last_report_at": timestamp.isoformat(),
+            }
+        )
+    return timed([lambda s=s: store.save(s) for s in states])
+
+
+def bench_run_demo(config: dict, stream: Stream, workdir: Path) -> Dict[str, float]:
+    demo_config = dict(scratch_config(config, workdir), trade_spill_path="")
+    clock = time.perf_counter_ns
+    latencies: List[int] = []
+    started = time.perf_counter()
+    session = PaperSession(demo_config)
+    session.restore()
+    try:
+        on_tick = session.on_tick
+        for timestamp, price in stream:
+            begin = clock()
+            on_tick(price, timestamp)
+            latencies.append(clock() - begin)
+    finally:
+        session.close()
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def bench_backtest(config: dict, stream: Stream, workdir: Path) -> Dict[str, float]:
+    prices, timestamps = stream_to_arrays(stream)
+    started = time.perf_counter()
+    begin = time.perf_counter_ns()
+    run_backtest(prices, timestamps, config)
+    elapsed_ns = time.perf_counter_ns() - begin
+    result = summarize([elapsed_ns], time.perf_counter() - started)
+    result["calls"] = len(stream)
+    result["ops_per_sec"] = len(stream) / (elapsed_ns / 1e9) if elapsed_ns else 0.0
+    return result
+
+
+BENCHMARKS: Dict[str, Callable[[dict, Stream, Path], dict]] = {
+    "heartbeat.on_tick": bench_on_tick,
+    "ledger": bench_ledger,
+    "state_store.save": bench_state_save,
+    "run_demo": bench_run_demo,
+    "backtest": bench_backtest,
+}
+
+
+def run_benchmarks(
+    config: dict, ticks: int, only: Optional[List[str]] = None, repeat: int = 3
+) -> Dict[str, dict]:
+    stream = bench_stream(config, ticks)
+    results: Dict[str, dict] = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for _ in range(max(1, repeat)):
+            with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+                result = bench(config, stream, Path(workdir))
+            named = {name: result} if "calls" in result else result
+            for key, value in named.items():
+                best = results.get(key)
+                if best is None or value["ops_per_sec"] > best["ops_per_sec"]:
+                    results[key] = value
+    return results
+
+
+def compare(
+    results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 0.15
+) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: ops_per_sec {result['ops_per_sec']:.0f} "
+                f"< baseline {base['ops_per_sec']:.0f}"
+            )
+        if result["p99_us"] > base["p99_us"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p99_us {result['p99_us']:.2f} "
+                f"> baseline {base['p99_us']:.2f}"
+            )
+    return regressions
+
+
+def format_results(results: Dict[str, dict]) -> str:
+    lines = []
+    for name, result in results.items():
+        lines.append(
+            f"{name:<18} | calls={result['calls']:>7} "
+            f"| ops_per_sec={result['ops_per_sec']:>11.0f} "
+            + " ".join(f"| p{pct}={result[f'p{pct}_us']:.2f}us" for pct in PERCENTILES)
+            + f" | max={result['max_us']:.2f}us"
+        )
+    return "\n".join(lines)
+
+
+def _strategy(config: dict) -> HeartbeatStrategy:
+    return HeartbeatStrategy(
+        effective_gap=config["effective_gap"],
+        trailing_pct=config["trailing_pct"],
+        cooldown_sec=config["cooldown_sec"],
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tick hot path benchmarks.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--ticks", type=int, default=50_000)
+    parser.add_argument("--only", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(args.config)
+    only = [name.strip() for name in args.only.split(",")] if args.only else None
+    results = run_benchmarks(config, args.ticks, only, args.repeat)
+    print(format_results(results))
+
+    document = {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "ticks": args.ticks,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(document, indent=2), encoding="utf-8")
+    if not args.baseline:
+        return
+    baseline_path = Path(args.baseline)
+    if args.save_baseline or not baseline_path.exists():
+        baseline_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"baseline saved to {baseline_path}")
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline.get("results", {}), args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        sys.exit(1)
+    print(f"no regressions against {baseline_path} (tolerance={args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
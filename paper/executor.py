@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+from core.orderbook import OrderBook
+
+
+class BookExecutor:
+    def __init__(
+        self, book: OrderBook, max_slippage: float = 0.002, stale_ms: float = 2000.0
+    ) -> None:
+        self.book = book
+        self.max_slippage = max_slippage
+        self.stale_ns = round(stale_ms * 1_000_000)
+        self.fills = 0
+        self.partial_fills = 0
+        self.rejected = 0
+        self.fallbacks = 0
+
+    def fill(
+        self, side: str, qty: float, timestamp_ns: int
+    ) -> Optional[Tuple[float, float]]:
+        book = self.book
+        if not book.updates or timestamp_ns - book.timestamp_ns > self.stale_ns:
+            self.fallbacks += 1
+            return None
+        if side == "BUY":
+            touch = book.best_ask()
+            limit = None if touch is None else touch * (1 + self.max_slippage)
+        else:
+            touch = book.best_bid()
+            limit = None if touch is None else touch * (1 - self.max_slippage)
+        if limit is None:
+            self.rejected += 1
+            return 0.0, 0.0
+        filled, vwap = book.vwap(side, qty, limit)
+        if vwap is None:
+            self.rejected += 1
+            return 0.0, 0.0
+        self.fills += 1
+        if filled < qty:
+            self.partial_fills += 1
+        return filled, vwap
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Optional
+
+from paper.trade_store import TradeStore
 
 
 @dataclass
@@ -18,10 +21,16 @@ class TradeEvent:
     position_qty: float
     avg_price: float
     realized_pnl: float
+    pnl: float = 0.0
 
 
 class Ledger:
-    def __init__(self, initial_cash: float) -> None:
+    def __init__(
+        self,
+        initial_cash: float,
+        trade_tail: int = 1024,
+        trade_spill_path: Optional[str | Path] = None,
+    ) -> None:
         self.initial_cash = float(initial_cash)
         self.cash = float(initial_cash)
         self.position_qty = 0.0
@@ -29,7 +38,7 @@ class Ledger:
         self.realized_pnl = 0.0
         self.fees_paid = 0.0
         self.slippage_paid = 0.0
-        self.trades: List[TradeEvent] = []
+        self.trades = TradeStore(trade_tail, trade_spill_path)
 
     def buy(
         self,
@@ -38,9 +47,12 @@ class Ledger:
         fee_rate: float,
         slippage_rate: float,
         timestamp: Optional[str] = None,
+        exec_price: Optional[float] = None,
+        timestamp_ns: Optional[int] = None,
     ) -> TradeEvent:
         self._validate_qty(qty)
-        exec_price = price * (1 + slippage_rate)
+        if exec_price is None:
+            exec_price = price * (1 + slippage_rate)
         fee = exec_price * qty * fee_rate
         cost = exec_price * qty + fee
         if cost > self.cash:
@@ -65,6 +77,7 @@ class Ledger:
             fee=fee,
             slippage=exec_price - price,
             timestamp=timestamp,
+            timestamp_ns=timestamp_ns,
         )
         return event
 
@@ -75,12 +88,15 @@ class Ledger:
         fee_rate: float,
         slippage_rate: float,
         timestamp: Optional[str] = None,
+        exec_price: Optional[float] = None,
+        timestamp_ns: Optional[int] = None,
     ) -> TradeEvent:
         self._validate_qty(qty)
         if qty > self.position_qty:
             raise ValueError("Sell quantity exceeds position.")
 
-        exec_price = price * (1 - slippage_rate)
+        if exec_price is None:
+            exec_price = price * (1 - slippage_rate)
         fee = exec_price * qty * fee_rate
         proceeds = exec_price * qty - fee
         pnl = (exec_price - self.avg_price) * qty - fee
@@ -101,6 +117,8 @@ class Ledger:
             fee=fee,
             slippage=price - exec_price,
             timestamp=timestamp,
+            pnl=pnl,
+            timestamp_ns=timestamp_ns,
         )
         return event
 
@@ -155,6 +173,8 @@ class Ledger:
         fee: float,
         slippage: float,
         timestamp: Optional[str],
+        pnl: float = 0.0,
+        timestamp_ns: Optional[int] = None,
     ) -> TradeEvent:
         event = TradeEvent(
             side=side,
@@ -168,8 +188,9 @@ class Ledger:
             position_qty=self.position_qty,
             avg_price=self.avg_price,
             realized_pnl=self.realized_pnl,
+            pnl=pnl,
         )
-        self.trades.append(event)
+        self.trades.append(event, pnl, timestamp_ns)
         return event
 
     @staticmethod
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from pathlib import Path
+import queue
+from typing import Dict, List
+
+from paper.session import PaperSession
+
+
+class CashCoordinator:
+    def __init__(self, limit: float) -> None:
+        self.limit = float(limit)
+        self._used = multiprocessing.Value("d", 0.0)
+
+    def reserve(self, amount: float, force: bool = False) -> bool:
+        with self._used.get_lock():
+            if not force and self._used.value + amount > self.limit:
+                return False
+            self._used.value += amount
+            return True
+
+    def release(self, amount: float) -> None:
+        with self._used.get_lock():
+            self._used.value = max(0.0, self._used.value - amount)
+
+    @property
+    def used(self) -> float:
+        return self._used.value
+
+
+def parse_symbols(value: object) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        items = [str(item) for item in value]
+    else:
+        items = str(value or "").split(",")
+    return [item.strip().upper() for item in items if item.strip()]
+
+
+def symbol_config(config: dict, symbol: str, index: int = 0) -> dict:
+    derived = dict(config)
+    derived["symbol"] = symbol
+    derived["demo_seed"] = int(config["demo_seed"]) + index
+    if int(config["latency_http_port"]):
+        derived["latency_http_port"] = int(config["latency_http_port"]) + index
+    for key in (
+        "state_path",
+        "trades_log_path",
+        "hourly_report_path",
+        "trade_spill_path",
+        "latency_dump_path",
+        "report_store_path",
+        "log_path",
+        "log_json_path",
+    ):
+        if not config[key]:
+            continue
+        path = Path(config[key])
+        derived[key] = str(path.with_name(f"{path.stem}_{symbol}{path.suffix}"))
+    return derived
+
+
+def shard_symbols(symbols: List[str], workers: int) -> List[List[str]]:
+    shards: List[List[str]] = [[] for _ in range(max(1, workers))]
+    for index, symbol in enumerate(symbols):
+        shards[index % len(shards)].append(symbol)
+    return [shard for shard in shards if shard]
+
+
+def run_multi(config: dict, ticks: int, live: bool = False) -> Dict[str, dict]:
+    symbols = parse_symbols(config["symbols"]) or [str(config["symbol"])]
+    workers = int(config["multi_workers"]) or os.cpu_count() or 1
+    shards = shard_symbols(symbols, min(workers, len(symbols)))
+    coordinator = CashCoordinator(config["multi_cash_limit"])
+    results: "multiprocessing.Queue[tuple]" = multiprocessing.Queue()
+    indexes = {symbol: index for index, symbol in enumerate(symbols)}
+
+    processes = [
+        multiprocessing.Process(
+            target=_worker,
+            args=(config, shard, indexes, ticks, live, coordinator, results),
+            name=f"symbols-{'-'.join(shard)}",
+        )
+        for shard in shards
+    ]
+    for process in processes:
+        process.start()
+
+    summaries: Dict[str, dict] = {}
+    while len(summaries) < len(symbols):
+        try:
+            symbol, summary = results.get(timeout=1.0)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+            continue
+        summaries[symbol] = summary
+    for process in processes:
+        process.join()
+    return summaries
+
+
+def _worker(
+    config: dict,
+    symbols: List[str],
+    indexes: Dict[str, int],
+    ticks: int,
+    live: bool,
+    coordinator: CashCoordinator,
+    results: "multiprocessing.Queue[tuple]",
+) -> None:
+    sessions: Dict[str, PaperSession] = {}
+    try:
+        for symbol in symbols:
+            session = PaperSession(
+                symbol_config(config, symbol, indexes[symbol]), cash_guard=coordinator
+            )
+            session.restore()
+            if live and session.config["warm_start"]:
+                from services.tick_archive import TickArchive
+
+                session.warm_start(
+                    TickArchive(session.config["tick_archive_path"], symbol)
+                )
+            sessions[symbol] = session
+        if live:
+            asyncio.run(_run_live(sessions))
+        else:
+            _run_demo(sessions, ticks)
+    finally:
+        for symbol, session in sessions.items():
+            session.close()
+            price = session.last_price or 0.0
+            results.put((symbol, session.ledger.summary(price)))
+        for symbol in symbols:
+            if symbol not in sessions:
+                results.put((symbol, {}))
+
+
+def _run_demo(sessions: Dict[str, PaperSession], ticks: int) -> None:
+    from run import demo_price_stream
+
+    streams = [
+        (session, demo_price_stream(session.config, ticks))
+        for session in sessions.values()
+    ]
+    for _ in range(ticks):
+        for session, stream in streams:
+            timestamp, price = next(stream)
+            session.on_tick(price, timestamp)
+
+
+async def _run_live(sessions: Dict[str, PaperSession]) -> None:
+    from exchanges.coinone.ws import CoinoneWebSocket
+    from services.runtime import run_runtime
+    from services.tick_archive import TickRecorder
+
+    tasks = []
+    for symbol, session in sessions.items():
+        config = session.config
+        feed = CoinoneWebSocket(
+            symbol,
+            url=config["ws_url"],
+            channels=session.feed_channels(),
+            reconnect=bool(config["ws_reconnect"]),
+            latency=session.latency,
+            book=session.book,
+        )
+        recorder = None
+        if config["record_ticks"]:
+            recorder = TickRecorder(config["tick_archive_path"], symbol)
+        tasks.append(
+            run_runtime(
+                session,
+                feed,
+                queue_size=int(config["feed_queue_size"]),
+                max_lag_ms=float(config["feed_max_lag_ms"]),
+                recorder=recorder,
+            )
+        )
+    await asyncio.gather(*tasks)
+
+
+def format_summaries(summaries: Dict[str, dict]) -> str:
+    lines = []
+    for symbol, summary in summaries.items():
+        if not summary:
+            lines.append(f"{symbol} | failed")
+            continue
+        lines.append(
+            f"{symbol} | net={summary['net_pnl']:.2f} "
+            f"| realized={summary['realized_pnl']:.2f} "
+            f"| fees={summary['fees_paid']:.2f} | qty={summary['position_qty']:.6f}"
+        )
+    return "\n".join(lines)
@@ -2,13 +2,147 @@ from __future__ import annotations
 
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 
 from paper.ledger import Ledger, TradeEvent
 
 
-def write_trade(event: TradeEvent, log_path: str | Path) -> None:
+class ReportSink:
+    def __init__(
+        self,
+        max_lines: int = 256,
+        flush_interval_sec: float = 1.0,
+        background: bool = False,
+    ) -> None:
+        self.max_lines = max(1, int(max_lines))
+        self.flush_interval_sec = float(flush_interval_sec)
+        self.background = background
+        self.error: Optional[BaseException] = None
+        self._buffers: Dict[Path, List[str]] = {}
+        self._handles: Dict[Path, TextIO] = {}
+        self._paths: Dict[str | Path, Path] = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(
+                target=self._run, name="report-sink", daemon=True
+            )
+            self._thread.start()
+
+    def write_line(self, path: str | Path, line: str, flush: bool = False) -> None:
+        key = self._paths.get(path)
+        if key is None:
+            key = self._paths[path] = Path(path).resolve()
+        with self._lock:
+            if self._closed:
+                raise ValueError("ReportSink is closed.")
+            buffer = self._buffers.get(key)
+            if buffer is None:
+                buffer = self._buffers[key] = []
+            buffer.append(line)
+            self._pending += 1
+            pending = self._pending
+        self._raise_error()
+        if flush:
+            self.flush()
+        elif pending >= self.max_lines:
+            if self.background:
+                self._wake.set()
+            else:
+                self.flush()
+        elif (
+            not self.background
+            and time.monotonic() - self._last_flush >= self.flush_interval_sec
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        with self._io_lock:
+            with self._lock:
+                buffers = self._buffers
+                self._buffers = {}
+                self._pending = 0
+                self._last_flush = time.monotonic()
+            written = 0
+            try:
+                for path, lines in buffers.items():
+                    handle = self._handle(path)
+                    handle.write("\n".join(lines) + "\n")
+                    handle.flush()
+                    written += 1
+            except Exception:
+                self._requeue(list(buffers.items())[written:])
+                raise
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+        try:
+            self.flush()
+        finally:
+            with self._io_lock:
+                for handle in self._handles.values():
+                    handle.close()
+                self._handles.clear()
+        self._raise_error()
+
+    def __enter__(self) -> "ReportSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _handle(self, path: Path) -> TextIO:
+        handle = self._handles.get(path)
+        if handle is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = self._handles[path] = path.open("a", encoding="utf-8")
+        return handle
+
+    def _requeue(self, unwritten: List[Tuple[Path, List[str]]]) -> None:
+        with self._lock:
+            for path, lines in unwritten:
+                self._buffers[path] = lines + self._buffers.get(path, [])
+                self._pending += len(lines)
+
+    def _raise_error(self) -> None:
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval_sec)
+            self._wake.clear()
+            if self._pending:
+                try:
+                    self.flush()
+                except Exception as exc:
+                    self.error = exc
+                    self.background = False
+                    return
+
+
+def write_trade(
+    event: TradeEvent, log_path: str | Path, sink: Optional[ReportSink] = None
+) -> None:
     line = format_trade(event)
+    if sink is not None:
+        sink.write_line(log_path, line, flush=True)
+        return
     _append_line(log_path, line)
 
 
@@ -17,6 +151,8 @@ def write_hourly_report(
     current_price: float,
     log_path: str | Path,
     timestamp: Optional[str] = None,
+    sink: Optional[ReportSink] = None,
+    latency: Any = None,
 ) -> None:
     ts = timestamp or datetime.utcnow().isoformat()
     summary = ledger.summary(current_price)
@@ -27,6 +163,13 @@ def write_hourly_report(
         f"| slippage={summary['slippage_paid']:.2f} | net={summary['net_pnl']:.2f} "
         f"| equity={summary['equity']:.2f}"
     )
+    if latency is not None and latency.enabled:
+        stages = latency.format_line()
+        if stages:
+            line += f" | latency {stages}"
+    if sink is not None:
+        sink.write_line(log_path, line)
+        return
     _append_line(log_path, line)
 
 
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.config import load_config
+from core.tick import datetime_to_ns, ns_to_datetime
+from paper.ledger import TradeEvent
+
+GRANULARITIES = ("hour", "day", "week", "month", "all")
+_HOUR_NS = 3_600 * 1_000_000_000
+_DAY_NS = 24 * _HOUR_NS
+
+
+@dataclass
+class PeriodStats:
+    trades: int = 0
+    buys: int = 0
+    sells: int = 0
+    wins: int = 0
+    losses: int = 0
+    realized_pnl: float = 0.0
+    fees: float = 0.0
+    slippage: float = 0.0
+    notional: float = 0.0
+    equity_open: Optional[float] = None
+    equity_close: Optional[float] = None
+    equity_peak: Optional[float] = None
+    max_drawdown: float = 0.0
+    max_drawdown_pct: float = 0.0
+
+    @property
+    def win_rate(self) -> Optional[float]:
+        closed = self.wins + self.losses
+        return self.wins / closed if closed else None
+
+    def add_trade(self, event: TradeEvent, pnl: float) -> None:
+        self.trades += 1
+        self.fees += event.fee
+        self.slippage += event.slippage * event.qty
+        self.notional += event.exec_price * event.qty
+        if event.side == "BUY":
+            self.buys += 1
+            return
+        self.sells += 1
+        self.realized_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def add_equity(self, equity: float) -> None:
+        if self.equity_open is None:
+            self.equity_open = equity
+        self.equity_close = equity
+        if self.equity_peak is None or equity > self.equity_peak:
+            self.equity_peak = equity
+            return
+        drawdown = self.equity_peak - equity
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+            peak = self.equity_peak
+            self.max_drawdown_pct = drawdown / peak if peak else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["win_rate"] = self.win_rate
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PeriodStats":
+        names = {field.name for field in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+def period_keys(timestamp_ns: int) -> Tuple[str, str, str, str, str]:
+    moment = ns_to_datetime(timestamp_ns)
+    year, week, _ = moment.isocalendar()
+    return (
+        moment.strftime("%Y-%m-%dT%H"),
+        moment.strftime("%Y-%m-%d"),
+        f"{year}-W{week:02d}",
+        moment.strftime("%Y-%m"),
+        "all",
+    )
+
+
+class ReportStore:
+    def __init__(self, path: str | Path, hourly_retention_days: int = 90) -> None:
+        self.path = Path(path)
+        self.hourly_retention_days = int(hourly_retention_days)
+        self.last_realized: Optional[float] = None
+        self.last_timestamp_ns = 0
+        self.offsets: Dict[str, int] = {}
+        self._periods: Dict[str, Dict[str, PeriodStats]] = {
+            granularity: {} for granularity in GRANULARITIES
+        }
+        self._cache_hour = -1
+        self._cache: List[PeriodStats] = []
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            loaded = json.loads(self.path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            return
+        if not isinstance(loaded, dict):
+            return
+        self.last_realized = loaded.get("last_realized")
+        self.last_timestamp_ns = int(loaded.get("last_timestamp_ns", 0))
+        self.offsets = {
+            name: int(offset) for name, offset in loaded.get("offsets", {}).items()
+        }
+        for granularity in GRANULARITIES:
+            self._periods[granularity] = {
+                key: PeriodStats.from_dict(data)
+                for key, data in loaded.get(granularity, {}).items()
+            }
+        self._cache_hour = -1
+
+    def save(self) -> None:
+        self._expire_hours()
+        document: Dict[str, object] = {
+            "last_realized": self.last_realized,
+            "last_timestamp_ns": self.last_timestamp_ns,
+            "offsets": self.offsets,
+        }
+        for granularity, periods in self._periods.items():
+            document[granularity] = {key: vars(stats) for key, stats in periods.items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(document), encoding="utf-8")
+        temp_path.replace(self.path)
+
+    def record_trade(
+        self,
+        event: TradeEvent,
+        timestamp_ns: Optional[int] = None,
+        pnl: Optional[float] = None,
+    ) -> None:
+        if timestamp_ns is None:
+            timestamp_ns = datetime_to_ns(datetime.fromisoformat(event.timestamp))
+        if pnl is None:
+            previous = self.last_realized if self.last_realized is not None else 0.0
+            pnl = event.realized_pnl - previous if event.side == "SELL" else 0.0
+        self.last_realized = event.realized_pnl
+        equity = event.cash + event.position_qty * event.price
+        for stats in self._buckets(timestamp_ns):
+            stats.add_trade(event, pnl)
+            stats.add_equity(equity)
+
+    def record_equity(self, timestamp_ns: int, equity: float) -> None:
+        for stats in self._buckets(timestamp_ns):
+            stats.add_equity(equity)
+
+    def summary(self, granularity: str, key: str = "all") -> Optional[dict]:
+        stats = self._periods[granularity].get(key)
+        return stats.to_dict() if stats is not None else None
+
+    def periods(self, granularity: str) -> List[str]:
+        return sorted(self._periods[granularity])
+
+    def _buckets(self, timestamp_ns: int) -> List[PeriodStats]:
+        self.last_timestamp_ns = max(self.last_timestamp_ns, timestamp_ns)
+        hour = timestamp_ns // _HOUR_NS
+        if hour != self._cache_hour:
+            self._cache = [
+                self._period(granularity, key)
+                for granularity, key in zip(GRANULARITIES, period_keys(timestamp_ns))
+            ]
+            self._cache_hour = hour
+        return self._cache
+
+    def _period(self, granularity: str, key: str) -> PeriodStats:
+        periods = self._periods[granularity]
+        stats = periods.get(key)
+        if stats is None:
+            stats = periods[key] = PeriodStats()
+        return stats
+
+    def _expire_hours(self) -> None:
+        if self.hourly_retention_days <= 0 or not self.last_timestamp_ns:
+            return
+        cutoff_ns = self.last_timestamp_ns - self.hourly_retention_days * _DAY_NS
+        cutoff = period_keys(cutoff_ns)[0]
+        hours = self._periods["hour"]
+        for key in [key for key in hours if key < cutoff]:
+            del hours[key]
+        self._cache_hour = -1
+
+
+def parse_trade_log(path: str | Path, offset: int = 0) -> Iterator[TradeEvent]:
+    for line in _read_lines(path, offset):
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) < 11 or parts[1] not in ("BUY", "SELL"):
+            continue
+        try:
+            values = _key_values(parts[2:])
+            yield TradeEvent(
+                side=parts[1],
+                price=values["price"],
+                qty=values["qty"],
+                exec_price=values["exec"],
+                fee=values["fee"],
+                slippage=values["slippage"],
+                timestamp=parts[0],
+                cash=values["cash"],
+                position_qty=values["pos"],
+                avg_price=values["avg"],
+                realized_pnl=values["realized"],
+            )
+        except (KeyError, ValueError):
+            continue
+
+
+def parse_hourly_log(path: str | Path, offset: int = 0) -> Iterator[Tuple[int, float]]:
+    for line in _read_lines(path, offset):
+        parts = [part.strip() for part in line.split("|")]
+        try:
+            values = _key_values(parts[1:])
+            timestamp_ns = datetime_to_ns(datetime.fromisoformat(parts[0]))
+            yield timestamp_ns, values["equity"]
+        except (KeyError, ValueError):
+            continue
+
+
+def log_offsets(
+    trades_log: Optional[str | Path] = None, hourly_log: Optional[str | Path] = None
+) -> Dict[str, int]:
+    offsets = {}
+    for name, path in (("trades", trades_log), ("hourly", hourly_log)):
+        if path and Path(path).exists():
+            offsets[name] = Path(path).stat().st_size
+    return offsets
+
+
+def _read_lines(path: str | Path, offset: int = 0) -> Iterator[str]:
+    with Path(path).open("rb") as handle:
+        if offset > handle.seek(0, 2):
+            offset = 0
+        handle.seek(offset)
+        for raw in handle:
+            yield raw.decode("utf-8", errors="replace")
+
+
+def backfill(
+    store: ReportStore,
+    trades_log: Optional[str | Path] = None,
+    hourly_log: Optional[str | Path] = None,
+    since_ns: int = 0,
+    offsets: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    offsets = offsets or {}
+    streams = []
+    if trades_log and Path(trades_log).exists():
+        streams.append(
+            (datetime_to_ns(datetime.fromisoformat(event.timestamp)), 1, event)
+            for event in parse_trade_log(trades_log, offsets.get("trades", 0))
+        )
+    if hourly_log and Path(hourly_log).exists():
+        streams.append(
+            (timestamp_ns, 0, equity)
+            for timestamp_ns, equity in parse_hourly_log(
+                hourly_log, offsets.get("hourly", 0)
+            )
+        )
+    counts = {"trades": 0, "reports": 0}
+    for timestamp_ns, kind, item in heapq.merge(*streams, key=lambda entry: entry[:2]):
+        if timestamp_ns <= since_ns:
+            continue
+        if kind:
+            store.record_trade(item, timestamp_ns)
+            counts["trades"] += 1
+        else:
+            store.record_equity(timestamp_ns, item)
+            counts["reports"] += 1
+    return counts
+
+
+def format_periods(store: ReportStore, granularity: str, last: int = 12) -> str:
+    lines = []
+    for key in store.periods(granularity)[-last:]:
+        summary = store.summary(granularity, key) or {}
+        win_rate = summary["win_rate"]
+        lines.append(
+            f"{key} | trades={summary['trades']} | pnl={summary['realized_pnl']:.2f} "
+            f"| fees={summary['fees']:.2f} | slippage={summary['slippage']:.2f} "
+            f"| win_rate={'-' if win_rate is None else f'{win_rate:.1%}'} "
+            f"| max_dd={summary['max_drawdown']:.2f} ({summary['max_drawdown_pct']:.2%})"
+        )
+    return "\n".join(lines)
+
+
+def _key_values(parts: List[str]) -> Dict[str, float]:
+    values: Dict[str, float] = {}
+    for part in parts:
+        key, separator, value = part.partition("=")
+        if separator:
+            try:
+                values[key] = float(value)
+            except ValueError:
+                continue
+    return values
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rolled-up paper trading reports.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--backfill", action="store_true")
+    parser.add_argument("--period", choices=GRANULARITIES, default="day")
+    parser.add_argument("--last", type=int, default=12)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(args.config)
+    store = ReportStore(
+        config["report_store_path"],
+        hourly_retention_days=int(config["report_hourly_retention_days"]),
+    )
+    if args.backfill:
+        counts = backfill(store, config["trades_log_path"], config["hourly_report_path"])
+        store.save()
+        print(f"backfilled trades={counts['trades']} | reports={counts['reports']}")
+    else:
+        store.load()
+    print(format_periods(store, args.period, args.last))
+
+
+if __name__ == "__main__":
+    main()
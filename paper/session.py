@@ -0,0 +1,493 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from pathlib import Path
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from core.heartbeat import HeartbeatStrategy
+from core.oracle import ENTER, Oracle
+from core.orderbook import OrderBook
+from core.state import StateStore
+from core.tick import datetime_to_ns, ns_to_datetime
+from core.timeframe_guard import MultiTimeframeGuard
+from core.volatility import VolatilityFilter
+from paper.executor import BookExecutor
+from paper.ledger import Ledger, TradeEvent
+from paper.report import ReportSink, format_trade, write_hourly_report, write_trade
+from paper.report_store import ReportStore, backfill, log_offsets
+from services.latency import (
+    STAGE_FILTERS,
+    STAGE_IO,
+    STAGE_LEDGER,
+    STAGE_STRATEGY,
+    LatencyServer,
+    StageLatency,
+)
+from services.logger import build_logger, stop_logger
+from services.notifier import Notifier, TelegramChannel
+
+SESSION_PATHS = (
+    "state_path",
+    "trades_log_path",
+    "hourly_report_path",
+    "trade_spill_path",
+    "report_store_path",
+    "latency_dump_path",
+    "log_path",
+    "log_json_path",
+)
+NO_BAND = (0.0, 0.0, 0)
+_MIN_WINDOW = 16
+_MAX_WINDOW = 65536
+
+Band = Tuple[float, float, int]
+
+
+def scratch_config(config: dict, directory: str | Path) -> dict:
+    scratch = dict(config, latency_http_port=0, notify_enabled=False)
+    for key in SESSION_PATHS:
+        if config[key]:
+            scratch[key] = str(Path(directory) / Path(config[key]).name)
+    return scratch
+
+
+def feed_channels(config: dict, book: bool = False) -> List[str]:
+    channels = [
+        channel.strip().upper()
+        for channel in str(config["ws_channels"]).split(",")
+        if channel.strip()
+    ]
+    if book and "ORDERBOOK" not in channels:
+        channels.append("ORDERBOOK")
+    return channels
+
+
+def scan_band(
+    prices: Any, timestamps_ns: Any, band: Callable[[], Band]
+) -> Iterator[Tuple[int, int, bool]]:
+    total = len(prices)
+    position = 0
+    window = _MIN_WINDOW
+    while position < total:
+        low, high, until_ns = band()
+        end = min(total, position + window)
+        outside = (prices[position:end] < low) | (prices[position:end] >= high)
+        outside |= timestamps_ns[position:end] >= until_ns
+        hit = int(outside.argmax())
+        if not outside[hit]:
+            yield position, end, False
+            position = end
+            window = min(window * 2, _MAX_WINDOW)
+            continue
+        yield position, position + hit, True
+        position += hit + 1
+        window = _MIN_WINDOW
+
+
+class PaperSession:
+    def __init__(self, config: dict, cash_guard: Any = None) -> None:
+        self.config = config
+        self.cash_guard = cash_guard
+        self.reserved_cash = 0.0
+        self.ledger = Ledger(
+            config["initial_cash"],
+            trade_tail=int(config["trade_tail_size"]),
+            trade_spill_path=config["trade_spill_path"] or None,
+        )
+        self.strategy = HeartbeatStrategy(
+            effective_gap=config["effective_gap"],
+            trailing_pct=config["trailing_pct"],
+            cooldown_sec=config["cooldown_sec"],
+        )
+        self.book: Optional[OrderBook] = None
+        self.executor: Optional[BookExecutor] = None
+        if config["book_execution"]:
+            self.book = OrderBook()
+            self.executor = BookExecutor(
+                self.book,
+                max_slippage=float(config["book_max_slippage"]),
+                stale_ms=float(config["book_stale_ms"]),
+            )
+        self.oracle: Optional[Oracle] = None
+        if config["oracle_enabled"]:
+            self.oracle = Oracle(
+                budget_us=float(config["oracle_budget_us"]),
+                threshold=float(config["oracle_threshold"]),
+                horizon_sec=float(config["oracle_horizon_sec"]),
+                sample_sec=float(config["oracle_sample_sec"]),
+                batch_size=int(config["oracle_batch_size"]),
+                min_samples=int(config["oracle_min_samples"]),
+                learning_rate=float(config["oracle_learning_rate"]),
+            )
+        self.volatility: Optional[VolatilityFilter] = None
+        if config["vol_filter_enabled"]:
+            self.volatility = VolatilityFilter(
+                window=float(config["vol_window_sec"]),
+                vol_ok=float(config["vol_ok"]),
+                spike_window=float(config["vol_spike_window_sec"]),
+                spike_ratio=float(config["vol_spike_ratio"]),
+            )
+        self.guard: Optional[MultiTimeframeGuard] = None
+        if config["guard_enabled"]:
+            self.guard = MultiTimeframeGuard(
+                timeframes_min=[
+                    int(value)
+                    for value in str(config["guard_timeframes_min"]).split(",")
+                    if value.strip()
+                ],
+                ema_period=int(config["guard_ema_period"]),
+                min_slope=float(config["guard_min_slope"]),
+                drop_pct=float(config["guard_drop_pct"]),
+            )
+        self.filtered = (
+            self.oracle is not None
+            or self.volatility is not None
+            or self.guard is not None
+        )
+        if self.filtered:
+            self.strategy.entry_gate = self._entry_allowed
+        self.state_store = StateStore(
+            config["state_path"],
+            journal=bool(config["state_journal"]),
+            compact_every=int(config["state_compact_every"]),
+        )
+        self.sink = ReportSink(
+            max_lines=int(config["report_flush_lines"]),
+            flush_interval_sec=float(config["report_flush_interval_sec"]),
+            background=bool(config["report_background_writer"]),
+        )
+        self.reports: Optional[ReportStore] = None
+        if config["report_store_path"]:
+            self.reports = ReportStore(
+                config["report_store_path"],
+                hourly_retention_days=int(config["report_hourly_retention_days"]),
+            )
+        self.logger: Optional[logging.Logger] = None
+        if config["log_path"]:
+            self.logger = build_logger(
+                f"paper.{Path(config['log_path']).resolve()}",
+                config["log_path"],
+                queued=bool(config["log_queued"]),
+                queue_size=int(config["log_queue_size"]),
+                json_path=config["log_json_path"] or None,
+            )
+        self.notifier: Optional[Notifier] = None
+        if config["notify_enabled"]:
+            self.notifier = Notifier(
+                logger=self.logger,
+                queue_size=int(config["notify_queue_size"]),
+                coalesce_sec=float(config["notify_coalesce_sec"]),
+                rate_per_min=float(config["notify_rate_per_min"]),
+                burst=int(config["notify_burst"]),
+            )
+            if config["telegram_token"]:
+                self.notifier.add_channel(
+                    "telegram",
+                    TelegramChannel(
+                        config["telegram_token"],
+                        str(config["telegram_chat_id"]),
+                        url=config["telegram_url"],
+                    ),
+                )
+        self.latency = StageLatency(enabled=bool(config["latency_enabled"]))
+        self.latency_server: Optional[LatencyServer] = None
+        if int(config["latency_http_port"]):
+            self.latency_server = LatencyServer(
+                self.latency, port=int(config["latency_http_port"])
+            )
+            self.latency_server.start()
+        self.report_interval_ns = round(float(config["report_interval_sec"]) * 1e9)
+        self.last_report_ns: Optional[int] = None
+        self.last_price: Optional[float] = None
+        self.band_filter = bool(config["band_filter"])
+        self.ticks_filtered = 0
+        self._band: Band = NO_BAND
+        self._last_marker: tuple = ()
+
+    def restore(self) -> None:
+        if self.reports is not None:
+            self.reports.load()
+            counts = backfill(
+                self.reports,
+                self.config["trades_log_path"],
+                self.config["hourly_report_path"],
+                since_ns=self.reports.last_timestamp_ns,
+                offsets=self.reports.offsets,
+            )
+            if counts["trades"] or counts["reports"]:
+                self._save_reports()
+        saved_state = self.state_store.load()
+        if saved_state.get("ledger"):
+            self.ledger.restore(saved_state["ledger"])
+        if saved_state.get("strategy"):
+            self.strategy.restore(saved_state["strategy"])
+        if saved_state.get("last_report_at"):
+            self.last_report_ns = datetime_to_ns(
+                datetime.fromisoformat(saved_state["last_report_at"])
+            )
+        if self.cash_guard is not None and self.ledger.position_qty > 0:
+            self.reserved_cash = self.ledger.avg_price * self.ledger.position_qty
+            self.cash_guard.reserve(self.reserved_cash, force=True)
+        self._last_marker = self._strategy_marker()
+        self._refresh_band()
+
+    def warm_start(self, archive: Any, until_ns: Optional[int] = None) -> int:
+        if not self.filtered:
+            return 0
+        if until_ns is None:
+            until_ns = time.time_ns()
+        start_ns = until_ns - round(float(self.config["warm_start_sec"]) * 1e9)
+        columns = archive.load(start_ns, until_ns)
+        timestamps = columns.timestamp_ns / 1e9
+        if self.volatility is not None:
+            self.volatility.load(timestamps, columns.price)
+        if self.guard is not None:
+            self.guard.load(timestamps, columns.price, columns.volume)
+        if self.oracle is not None:
+            self.oracle.warm(timestamps, columns.price)
+        return len(timestamps)
+
+    def feed_channels(self) -> List[str]:
+        return feed_channels(self.config, self.book is not None)
+
+    @property
+    def last_report_at(self) -> Optional[datetime]:
+        if self.last_report_ns is None:
+            return None
+        return ns_to_datetime(self.last_report_ns)
+
+    def on_tick(self, price: float, timestamp: datetime) -> Optional[str]:
+        return self.on_tick_ns(price, datetime_to_ns(timestamp))
+
+    def on_tick_ns(self, price: float, timestamp_ns: int) -> Optional[str]:
+        if self.filtered:
+            if self.latency.enabled:
+                started = time.perf_counter_ns()
+                self._update_filters(price, timestamp_ns / 1e9)
+                self.latency.record(STAGE_FILTERS, time.perf_counter_ns() - started)
+            else:
+                self._update_filters(price, timestamp_ns / 1e9)
+        low, high, until_ns = self._band
+        if low <= price < high and timestamp_ns < until_ns:
+            self.last_price = price
+            self.ticks_filtered += 1
+            return None
+
+        config = self.config
+        ledger = self.ledger
+        latency = self.latency
+        timing = latency.enabled
+        if timing:
+            clock = time.perf_counter_ns
+            started = clock()
+        self.last_price = price
+        action = self.strategy.on_tick_ns(price, timestamp_ns)
+        if timing:
+            now = clock()
+            latency.record(STAGE_STRATEGY, now - started)
+            started = now
+
+        event = None
+        if action == "BUY":
+            event = self._buy(price, timestamp_ns)
+        elif action == "SELL" and ledger.position_qty > 0:
+            event = self._sell(price, timestamp_ns)
+            if ledger.position_qty > 0:
+                self.strategy.cancel_exit()
+        if timing and action is not None:
+            now = clock()
+            latency.record(STAGE_LEDGER, now - started)
+            started = now
+        if event is not None:
+            write_trade(event, config["trades_log_path"], self.sink)
+            if self.reports is not None:
+                self.reports.record_trade(event, timestamp_ns, event.pnl)
+            if self.logger is not None:
+                self.logger.info(format_trade(event))
+            if self.notifier is not None:
+                self.notifier.broadcast(format_trade(event))
+
+        dirty = action is not None
+        last_report_ns = self.last_report_ns
+        if (
+            last_report_ns is None
+            or timestamp_ns - last_report_ns >= self.report_interval_ns
+        ):
+            write_hourly_report(
+                ledger,
+                price,
+                config["hourly_report_path"],
+                ns_to_datetime(timestamp_ns).isoformat(),
+                self.sink,
+                latency,
+            )
+            if self.reports is not None:
+                self.reports.record_equity(timestamp_ns, ledger.equity(price))
+                self._save_reports()
+            if latency.enabled and config["latency_dump_path"]:
+                latency.dump(config["latency_dump_path"])
+            self.last_report_ns = timestamp_ns
+            dirty = True
+
+        marker = self._strategy_marker()
+        if dirty or marker != self._last_marker:
+            if dirty or marker[:2] != self._last_marker[:2]:
+                self.save_state()
+            self._last_marker = marker
+            self._refresh_band()
+        if timing and dirty:
+            latency.record(STAGE_IO, clock() - started)
+        return action
+
+    def on_tick_arrays(self, prices: Any, timestamps_ns: Any) -> None:
+        total = len(prices)
+        if not total:
+            return
+        if not self.band_filter:
+            on_tick_ns = self.on_tick_ns
+            for timestamp_ns, price in zip(timestamps_ns.tolist(), prices.tolist()):
+                on_tick_ns(price, timestamp_ns)
+            return
+
+        filtered = self.filtered
+        for start, stop, hit in scan_band(prices, timestamps_ns, lambda: self._band):
+            if stop > start:
+                if filtered:
+                    self._feed_filters(prices[start:stop], timestamps_ns[start:stop])
+                self.ticks_filtered += stop - start
+            if hit:
+                self.on_tick_ns(float(prices[stop]), int(timestamps_ns[stop]))
+        self.last_price = float(prices[-1])
+
+    def save_state(self) -> None:
+        self.state_store.update(
+            {
+                "ledger": self.ledger.snapshot(),
+                "strategy": self.strategy.snapshot(),
+                "last_report_at": self.last_report_at.isoformat()
+                if self.last_report_at
+                else None,
+            }
+        )
+
+    def close(self) -> None:
+        try:
+            if self.oracle is not None:
+                self.oracle.close()
+            if self.notifier is not None:
+                self.notifier.close()
+            self.sink.close()
+            if self.reports is not None:
+                self._save_reports()
+        finally:
+            self.state_store.close()
+            if self.config["latency_dump_path"] and self.latency.snapshot():
+                self.latency.dump(self.config["latency_dump_path"])
+            if self.latency_server is not None:
+                self.latency_server.stop()
+            if self.logger is not None:
+                stop_logger(self.logger.name)
+
+    def _buy(self, price: float, timestamp_ns: int) -> Optional[TradeEvent]:
+        config = self.config
+        cost = config["trade_size_cash"]
+        if self.cash_guard is not None and not self.cash_guard.reserve(cost):
+            return None
+        qty = cost / price
+        exec_price = None
+        if self.executor is not None:
+            fill = self.executor.fill("BUY", qty, timestamp_ns)
+            if fill is not None:
+                qty, exec_price = fill
+                if not qty:
+                    if self.cash_guard is not None:
+                        self.cash_guard.release(cost)
+                    self.strategy.cancel_entry()
+                    return None
+        try:
+            event = self.ledger.buy(
+                price=price,
+                qty=qty,
+                fee_rate=config["fee_rate"],
+                slippage_rate=config["slippage_rate"],
+                timestamp=ns_to_datetime(timestamp_ns).isoformat(),
+                exec_price=exec_price,
+                timestamp_ns=timestamp_ns,
+            )
+        except ValueError:
+            if self.cash_guard is not None:
+                self.cash_guard.release(cost)
+            return None
+        if self.cash_guard is not None:
+            self.reserved_cash += cost
+        return event
+
+    def _sell(self, price: float, timestamp_ns: int) -> Optional[TradeEvent]:
+        config = self.config
+        ledger = self.ledger
+        qty = ledger.position_qty
+        exec_price = None
+        if self.executor is not None:
+            fill = self.executor.fill("SELL", qty, timestamp_ns)
+            if fill is not None:
+                qty, exec_price = fill
+        try:
+            event = ledger.sell(
+                price=price,
+                qty=qty,
+                fee_rate=config["fee_rate"],
+                slippage_rate=config["slippage_rate"],
+                timestamp=ns_to_datetime(timestamp_ns).isoformat(),
+                exec_price=exec_price,
+                timestamp_ns=timestamp_ns,
+            )
+        except ValueError:
+            return None
+        if ledger.position_qty == 0:
+            self._release_cash()
+        return event
+
+    def _save_reports(self) -> None:
+        self.reports.offsets = log_offsets(
+            self.config["trades_log_path"], self.config["hourly_report_path"]
+        )
+        self.reports.save()
+
+    def _release_cash(self) -> None:
+        if self.cash_guard is not None and self.reserved_cash:
+            self.cash_guard.release(self.reserved_cash)
+        self.reserved_cash = 0.0
+
+    def _update_filters(self, price: float, timestamp: float) -> None:
+        if self.volatility is not None:
+            self.volatility.update(price, timestamp)
+        if self.guard is not None:
+            self.guard.update(price, timestamp)
+        if self.oracle is not None:
+            self.oracle.update(price, timestamp)
+
+    def _feed_filters(self, prices: Any, timestamps_ns: Any) -> None:
+        update = self._update_filters
+        for timestamp_ns, price in zip(timestamps_ns.tolist(), prices.tolist()):
+            update(price, timestamp_ns / 1e9)
+
+    def _entry_allowed(self) -> bool:
+        if self.volatility is not None and not self.volatility.entry_allowed():
+            return False
+        if self.guard is not None and not self.guard.allow_entry():
+            return False
+        return self.oracle is None or self.oracle.signal() == ENTER
+
+    def _refresh_band(self) -> None:
+        if not self.band_filter or self.last_report_ns is None:
+            self._band = NO_BAND
+            return
+        low, high, until_ns = self.strategy.trigger_band()
+        next_report_ns = self.last_report_ns + self.report_interval_ns
+        self._band = (low, high, min(until_ns, next_report_ns))
+
+    def _strategy_marker(self) -> tuple:
+        strategy = self.strategy
+        return (strategy.state, strategy.armed, strategy.recent_low, strategy.peak)
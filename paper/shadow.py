@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.heartbeat import NO_DEADLINE, HeartbeatStrategy
+from core.tick import datetime_to_ns, ns_to_datetime
+from paper.ledger import Ledger, TradeEvent
+from paper.report import ReportSink, format_trade
+from paper.session import NO_BAND, Band, feed_channels, scan_band
+
+VARIANT_PARAMS = ("effective_gap", "trailing_pct", "cooldown_sec")
+
+
+def parse_variants(value: object, config: dict) -> Dict[str, dict]:
+    base = {name: config[name] for name in VARIANT_PARAMS}
+    variants: Dict[str, dict] = {}
+    for item in str(value or "").split(","):
+        if not item.strip():
+            continue
+        tag, _, spec = item.partition("=")
+        params = dict(base)
+        for name, raw in zip(VARIANT_PARAMS, spec.split("/")):
+            if raw.strip():
+                params[name] = int(raw) if name == "cooldown_sec" else float(raw)
+        variants[tag.strip()] = params
+    return variants or {str(config["strategy_tag"]): base}
+
+
+class ShadowVariant:
+    __slots__ = ("tag", "params", "strategy", "ledger", "band", "sells", "wins")
+
+    def __init__(self, tag: str, params: dict, initial_cash: float) -> None:
+        self.tag = tag
+        self.params = params
+        self.strategy = HeartbeatStrategy(
+            effective_gap=params["effective_gap"],
+            trailing_pct=params["trailing_pct"],
+            cooldown_sec=params["cooldown_sec"],
+        )
+        self.ledger = Ledger(initial_cash, trade_tail=256)
+        self.band: Band = NO_BAND
+        self.sells = 0
+        self.wins = 0
+
+
+class ShadowRunner:
+    def __init__(self, config: dict, variants: Dict[str, dict]) -> None:
+        self.config = config
+        self.variants = [
+            ShadowVariant(tag, params, config["initial_cash"])
+            for tag, params in variants.items()
+        ]
+        self.sink = ReportSink(
+            max_lines=int(config["report_flush_lines"]),
+            flush_interval_sec=float(config["report_flush_interval_sec"]),
+            background=bool(config["report_background_writer"]),
+        )
+        self.summary_interval_ns = round(float(config["report_interval_sec"]) * 1e9)
+        self.last_summary_ns: Optional[int] = None
+        self.last_price: Optional[float] = None
+        self.ticks = 0
+        self.ticks_filtered = 0
+        self._band: Band = NO_BAND
+
+    def on_tick(self, price: float, timestamp: datetime) -> None:
+        self.on_tick_ns(price, datetime_to_ns(timestamp))
+
+    def on_tick_ns(self, price: float, timestamp_ns: int) -> None:
+        self.ticks += 1
+        self.last_price = price
+        low, high, until_ns = self._band
+        if low <= price < high and timestamp_ns < until_ns:
+            self.ticks_filtered += 1
+            return
+
+        for variant in self.variants:
+            low, high, until_ns = variant.band
+            if low <= price < high and timestamp_ns < until_ns:
+                continue
+            action = variant.strategy.on_tick_ns(price, timestamp_ns)
+            if action is not None:
+                self._execute(variant, action, price, timestamp_ns)
+            variant.band = variant.strategy.trigger_band()
+
+        last_summary_ns = self.last_summary_ns
+        if (
+            last_summary_ns is None
+            or timestamp_ns - last_summary_ns >= self.summary_interval_ns
+        ):
+            self.save_summary()
+            self.last_summary_ns = timestamp_ns
+        self._refresh_band()
+
+    def on_tick_arrays(self, prices: Any, timestamps_ns: Any) -> None:
+        for start, stop, hit in scan_band(prices, timestamps_ns, lambda: self._band):
+            self.ticks += stop - start
+            self.ticks_filtered += stop - start
+            if hit:
+                self.on_tick_ns(float(prices[stop]), int(timestamps_ns[stop]))
+        if len(prices):
+            self.last_price = float(prices[-1])
+
+    def summaries(self) -> Dict[str, dict]:
+        price = self.last_price or 0.0
+        results: Dict[str, dict] = {}
+        for variant in self.variants:
+            summary = variant.ledger.summary(price)
+            summary.update(variant.params)
+            summary["trades"] = variant.ledger.trades.total
+            summary["win_rate"] = variant.wins / variant.sells if variant.sells else None
+            summary["state"] = variant.strategy.state
+            results[variant.tag] = summary
+        return results
+
+    def save_summary(self) -> None:
+        path = Path(self.config["shadow_summary_path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        document = {
+            "updated_at": datetime.utcnow().isoformat(),
+            "ticks": self.ticks,
+            "variants": self.summaries(),
+        }
+        temp_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        temp_path.replace(path)
+
+    def close(self) -> None:
+        try:
+            self.sink.close()
+        finally:
+            self.save_summary()
+
+    def _execute(
+        self, variant: ShadowVariant, action: str, price: float, timestamp_ns: int
+    ) -> None:
+        config = self.config
+        ledger = variant.ledger
+        timestamp = ns_to_datetime(timestamp_ns).isoformat()
+        event: Optional[TradeEvent] = None
+        try:
+            if action == "BUY":
+                event = ledger.buy(
+                    price=price,
+                    qty=config["trade_size_cash"] / price,
+                    fee_rate=config["fee_rate"],
+                    slippage_rate=config["slippage_rate"],
+                    timestamp=timestamp,
+                    timestamp_ns=timestamp_ns,
+                )
+            elif action == "SELL" and ledger.position_qty > 0:
+                event = ledger.sell(
+                    price=price,
+                    qty=ledger.position_qty,
+                    fee_rate=config["fee_rate"],
+                    slippage_rate=config["slippage_rate"],
+                    timestamp=timestamp,
+                    timestamp_ns=timestamp_ns,
+                )
+        except ValueError:
+            return
+        if event is None:
+            return
+        if event.side == "SELL":
+            variant.sells += 1
+            variant.wins += event.pnl > 0
+        self.sink.write_line(
+            config["shadow_trades_log_path"], f"{variant.tag} | {format_trade(event)}"
+        )
+
+    def _refresh_band(self) -> None:
+        if self.last_summary_ns is None:
+            self._band = NO_BAND
+            return
+        low = -math.inf
+        high = math.inf
+        until_ns = min(NO_DEADLINE, self.last_summary_ns + self.summary_interval_ns)
+        for variant in self.variants:
+            variant_low, variant_high, variant_until = variant.band
+            low = max(low, variant_low)
+            high = min(high, variant_high)
+            until_ns = min(until_ns, variant_until)
+        self._band = (low, high, until_ns)
+
+
+def run_shadow(
+    config: dict,
+    ticks: int,
+    live: bool = False,
+    replay: bool = False,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Dict[str, dict]:
+    runner = ShadowRunner(config, parse_variants(config["shadow_variants"], config))
+    try:
+        if live:
+            from exchanges.coinone.ws import CoinoneWebSocket
+            from services.runtime import run_runtime
+
+            feed = CoinoneWebSocket(
+                config["symbol"],
+                url=config["ws_url"],
+                channels=feed_channels(config),
+                reconnect=bool(config["ws_reconnect"]),
+            )
+            asyncio.run(
+                run_runtime(
+                    runner,
+                    feed,
+                    queue_size=int(config["feed_queue_size"]),
+                    max_lag_ms=float(config["feed_max_lag_ms"]),
+                )
+            )
+        elif replay:
+            from services.tick_archive import TickArchive
+
+            archive = TickArchive(config["tick_archive_path"], config["symbol"])
+            start_ns = datetime_to_ns(datetime.fromisoformat(start)) if start else None
+            end_ns = datetime_to_ns(datetime.fromisoformat(end)) if end else None
+            for columns in archive.iter_range(start_ns, end_ns):
+                runner.on_tick_arrays(columns.price, columns.timestamp_ns)
+        else:
+            from run import demo_price_stream
+
+            for timestamp, price in demo_price_stream(config, ticks):
+                runner.on_tick(price, timestamp)
+    finally:
+        runner.close()
+    return runner.summaries()
+
+
+def format_variants(summaries: Dict[str, dict]) -> str:
+    ordered: List[Tuple[str, dict]] = sorted(
+        summaries.items(), key=lambda item: item[1]["net_pnl"], reverse=True
+    )
+    lines = []
+    for tag, summary in ordered:
+        win_rate = summary["win_rate"]
+        lines.append(
+            f"{tag} | gap={summary['effective_gap']} | trail={summary['trailing_pct']} "
+            f"| cooldown={summary['cooldown_sec']} | trades={summary['trades']} "
+            f"| win_rate={'-' if win_rate is None else f'{win_rate:.1%}'} "
+            f"| net={summary['net_pnl']:.2f} | realized={summary['realized_pnl']:.2f} "
+            f"| fees={summary['fees_paid']:.2f} | state={summary['state']}"
+        )
+    return "\n".join(lines)
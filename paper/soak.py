@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.tick import datetime_to_ns
+from paper.session import PaperSession, scratch_config
+from services.latency import LogHistogram
+
+SOAK_START = datetime(2024, 1, 1)
+_CHUNK = 65_536
+
+Chunk = Tuple[Any, Any]
+
+
+@dataclass
+class SoakSample:
+    ticks: int
+    elapsed_sec: float
+    rss_bytes: int
+    traced_bytes: int
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+
+
+def synthetic_chunks(config: dict, ticks: int) -> Iterator[Chunk]:
+    import numpy as np
+
+    rng = np.random.default_rng(int(config["demo_seed"]))
+    volatility = float(config["demo_price_volatility"])
+    interval_ns = int(config["demo_interval_sec"]) * 1_000_000_000
+    price = float(config["demo_price_start"])
+    timestamp_ns = datetime_to_ns(SOAK_START)
+    remaining = ticks
+    while remaining > 0:
+        size = min(_CHUNK, remaining)
+        growth = 1.0 + rng.uniform(-volatility, volatility, size)
+        growth[0] = 1.0
+        prices = np.maximum(price * np.cumprod(growth), 0.01)
+        timestamps = timestamp_ns + interval_ns * np.arange(size, dtype=np.int64)
+        yield timestamps, prices
+        price = float(prices[-1]) * (1.0 + rng.uniform(-volatility, volatility))
+        timestamp_ns = int(timestamps[-1]) + interval_ns
+        remaining -= size
+
+
+def replay_chunks(
+    config: dict,
+    ticks: int,
+    start_ns: Optional[int] = None,
+    end_ns: Optional[int] = None,
+) -> Iterator[Chunk]:
+    from services.tick_archive import TickArchive
+
+    archive = TickArchive(config["tick_archive_path"], config["symbol"])
+    interval_ns = int(config["demo_interval_sec"]) * 1_000_000_000
+    remaining = ticks
+    shift = 0
+    while remaining > 0:
+        first = last = None
+        for columns in archive.iter_range(start_ns, end_ns):
+            size = min(len(columns.price), remaining)
+            timestamps = columns.timestamp_ns[:size] + shift
+            if first is None:
+                first = int(timestamps[0])
+            last = int(timestamps[-1])
+            yield timestamps, columns.price[:size]
+            remaining -= size
+            if remaining <= 0:
+                return
+        if first is None or last is None:
+            raise ValueError("No archived ticks to replay.")
+        shift += last - first + interval_ns
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def slope(xs: Sequence[float], ys: Sequence[float]) -> float:
+    count = len(xs)
+    if count < 2:
+        return 0.0
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def run_soak(
+    config: dict,
+    ticks: int,
+    sample_every: int = 1_000_000,
+    replay: bool = False,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    trace: bool = True,
+    top: int = 10,
+) -> Dict[str, Any]:
+    sample_every = max(1, int(sample_every))
+    with tempfile.TemporaryDirectory(prefix="soak-") as workdir:
+        soak_config = scratch_config(config, workdir)
+
+        if replay:
+            start_ns = datetime_to_ns(datetime.fromisoformat(start)) if start else None
+            end_ns = datetime_to_ns(datetime.fromisoformat(end)) if end else None
+            chunks = replay_chunks(config, ticks, start_ns, end_ns)
+        else:
+            chunks = synthetic_chunks(config, ticks)
+
+        if trace:
+            tracemalloc.start()
+        session = PaperSession(soak_config)
+        baseline: Optional[tracemalloc.Snapshot] = None
+        samples: List[SoakSample] = []
+        window = LogHistogram()
+        clock = time.perf_counter_ns
+        on_tick_ns = session.on_tick_ns
+        count = 0
+        next_sample = sample_every
+        started = time.perf_counter()
+        try:
+            for timestamps, prices in chunks:
+                for timestamp_ns, price in zip(timestamps.tolist(), prices.tolist()):
+                    begin = clock()
+                    on_tick_ns(price, timestamp_ns)
+                    window.record(clock() - begin)
+                    count += 1
+                    if count == next_sample:
+                        samples.append(_sample(count, started, window, trace))
+                        window.reset()
+                        next_sample += sample_every
+                        if trace and baseline is None:
+                            baseline = _snapshot()
+            if window.count:
+                samples.append(_sample(count, started, window, trace))
+            top_sites = _top_sites(baseline, top) if baseline is not None else []
+        finally:
+            session.close()
+            if trace:
+                tracemalloc.stop()
+    summary = session.ledger.summary(session.last_price or 0.0)
+    return build_report(samples, top_sites, summary)
+
+
+def build_report(
+    samples: List[SoakSample], top_sites: List[dict], summary: dict
+) -> Dict[str, Any]:
+    steady = samples[1:] if len(samples) > 2 else samples
+    mticks = [sample.ticks / 1e6 for sample in steady]
+    hours = [sample.elapsed_sec / 3600 for sample in steady]
+    rss = [float(sample.rss_bytes) for sample in steady]
+    traced = [float(sample.traced_bytes) for sample in steady]
+    first = steady[0] if steady else None
+    last = steady[-1] if steady else None
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "ticks": samples[-1].ticks if samples else 0,
+        "elapsed_sec": samples[-1].elapsed_sec if samples else 0.0,
+        "rss_growth_bytes_per_mtick": slope(mticks, rss),
+        "rss_growth_bytes_per_hour": slope(hours, rss),
+        "traced_growth_bytes_per_mtick": slope(mticks, traced),
+        "latency_drift_us_per_mtick": {
+            "mean": slope(mticks, [sample.mean_us for sample in steady]),
+            "p50": slope(mticks, [sample.p50_us for sample in steady]),
+            "p99": slope(mticks, [sample.p99_us for sample in steady]),
+        },
+        "latency_ratio_last_first": (
+            last.mean_us / first.mean_us if first and last and first.mean_us else None
+        ),
+        "top_allocations": top_sites,
+        "samples": [asdict(sample) for sample in samples],
+        "net_pnl": summary["net_pnl"],
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    drift = report["latency_drift_us_per_mtick"]
+    ratio = report["latency_ratio_last_first"]
+    per_mtick = report["rss_growth_bytes_per_mtick"] / 1024
+    per_hour = report["rss_growth_bytes_per_hour"] / 1024**2
+    traced = report["traced_growth_bytes_per_mtick"] / 1024
+    lines = [
+        f"ticks={report['ticks']} | elapsed={report['elapsed_sec']:.1f}s "
+        f"| rss_growth={per_mtick:.1f}KiB/Mtick ({per_hour:.1f}MiB/h) "
+        f"| traced_growth={traced:.1f}KiB/Mtick",
+        f"latency_drift | mean={drift['mean']:+.4f}us/Mtick "
+        f"| p50={drift['p50']:+.4f}us/Mtick | p99={drift['p99']:+.4f}us/Mtick "
+        f"| last/first={'-' if ratio is None else f'{ratio:.2f}'}",
+    ]
+    for sample in report["samples"]:
+        rss = sample["rss_bytes"] / 1024**2
+        traced = sample["traced_bytes"] / 1024**2
+        lines.append(
+            f"sample | ticks={sample['ticks']} | rss={rss:.1f}MiB "
+            f"| traced={traced:.1f}MiB | mean={sample['mean_us']:.2f}us "
+            f"| p99={sample['p99_us']:.2f}us"
+        )
+    for site in report["top_allocations"]:
+        lines.append(
+            f"alloc | {site['site']} | +{site['size_diff'] / 1024:.1f}KiB "
+            f"| +{site['count_diff']} blocks"
+        )
+    return "\n".join(lines)
+
+
+def save_report(report: Dict[str, Any], path: str | Path) -> None:
+    output = Path(path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    temp_path.replace(output)
+
+
+def _sample(
+    ticks: int, started: float, window: LogHistogram, trace: bool
+) -> SoakSample:
+    summary = window.summary()
+    return SoakSample(
+        ticks=ticks,
+        elapsed_sec=time.perf_counter() - started,
+        rss_bytes=rss_bytes(),
+        traced_bytes=tracemalloc.get_traced_memory()[0] if trace else 0,
+        mean_us=summary["mean_us"],
+        p50_us=summary["p50_us"],
+        p99_us=summary["p99_us"],
+        max_us=summary["max_us"],
+    )
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        )
+    )
+
+
+def _top_sites(baseline: tracemalloc.Snapshot, top: int) -> List[dict]:
+    stats = _snapshot().compare_to(baseline, "lineno")
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+        }
+        for stat in stats[:top]
+    ]
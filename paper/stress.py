@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+import json
+from pathlib import Path
+import time
+from typing import Any, Dict, Sequence
+
+from core.config import load_config
+
+PERCENTILES = (5, 25, 50, 75, 95)
+METRICS = ("net_pnl", "max_drawdown", "trades")
+
+IDLE = 0
+IN_POSITION = 1
+COOLDOWN = 2
+
+
+@dataclass
+class PathSpec:
+    paths: int = 1000
+    ticks: int = 720
+    regimes: Sequence[float] = (0.003,)
+    switch_prob: float = 0.0
+    jump_prob: float = 0.0
+    jump_scale: float = 0.02
+    trend: float = 0.0
+    seed: int = 42
+
+
+def generate_paths(start_price: float, spec: PathSpec) -> Any:
+    import numpy as np
+
+    if spec.ticks < 1:
+        raise ValueError("Stress paths need at least one tick.")
+    rng = np.random.default_rng(spec.seed)
+    shape = (spec.paths, spec.ticks - 1)
+    vols = np.asarray(spec.regimes, dtype=np.float64)
+    if len(vols) > 1 and spec.switch_prob > 0:
+        picks = rng.integers(0, len(vols), size=shape)
+        switches = rng.random(shape) < spec.switch_prob
+        switches[:, 0] = True
+        since = np.where(switches, np.arange(shape[1]), 0)
+        np.maximum.accumulate(since, axis=1, out=since)
+        scale = vols[np.take_along_axis(picks, since, axis=1)]
+    else:
+        scale = vols[0]
+    shocks = rng.uniform(-1.0, 1.0, size=shape) * scale + spec.trend
+    if spec.jump_prob > 0:
+        jumps = rng.random(shape) < spec.jump_prob
+        shocks += np.where(jumps, rng.normal(0.0, spec.jump_scale, size=shape), 0.0)
+    growth = np.maximum(1.0 + shocks, 1e-6)
+    prices = np.empty((spec.paths, spec.ticks))
+    prices[:, 0] = start_price
+    np.cumprod(growth, axis=1, out=prices[:, 1:])
+    prices[:, 1:] *= start_price
+    np.maximum(prices, 0.01, out=prices)
+    return prices
+
+
+def simulate(config: dict, prices: Any, interval_sec: float) -> Dict[str, Any]:
+    import numpy as np
+
+    paths, ticks = prices.shape
+    gap = float(config["effective_gap"])
+    trailing = float(config["trailing_pct"])
+    arm_pct = gap + trailing
+    cooldown = float(config["cooldown_sec"])
+    fee_rate = float(config["fee_rate"])
+    slippage_rate = float(config["slippage_rate"])
+    trade_cash = float(config["trade_size_cash"])
+    initial_cash = float(config["initial_cash"])
+
+    state = np.full(paths, IDLE, dtype=np.int8)
+    recent_low = np.full(paths, np.nan)
+    entry = np.zeros(paths)
+    peak = np.zeros(paths)
+    armed = np.zeros(paths, dtype=bool)
+    cooldown_until = np.zeros(paths)
+    cash = np.full(paths, initial_cash)
+    qty = np.zeros(paths)
+    avg = np.zeros(paths)
+    trades = np.zeros(paths, dtype=np.int64)
+    equity_peak = np.full(paths, initial_cash)
+    max_drawdown = np.zeros(paths)
+
+    for step in range(ticks):
+        price = prices[:, step]
+        now = step * interval_sec
+
+        released = (state == COOLDOWN) & (now >= cooldown_until)
+        state[released] = IDLE
+        recent_low[released] = price[released]
+
+        idle = state == IDLE
+        lower = idle & ~(price >= recent_low)
+        recent_low[lower] = price[lower]
+        buys = idle & (recent_low != 0) & (price >= recent_low * (1 + gap))
+
+        holding = state == IN_POSITION
+        np.maximum(peak, np.where(holding, price, peak), out=peak)
+        armed |= holding & (entry != 0) & (price >= entry * (1 + arm_pct))
+        sells = holding & armed & (peak != 0) & (price <= peak * (1 - trailing))
+
+        if buys.any():
+            state[buys] = IN_POSITION
+            entry[buys] = price[buys]
+            peak[buys] = price[buys]
+            armed[buys] = False
+            buy_price = price[buys]
+            buy_qty = trade_cash / buy_price
+            exec_price = buy_price * (1 + slippage_rate)
+            cost = exec_price * buy_qty + exec_price * buy_qty * fee_rate
+            filled = cost <= cash[buys]
+            rows = np.flatnonzero(buys)[filled]
+            bought = buy_qty[filled]
+            avg[rows] = (avg[rows] * qty[rows] + exec_price[filled] * bought) / (
+                qty[rows] + bought
+            )
+            qty[rows] += bought
+            cash[rows] -= cost[filled]
+            trades[rows] += 1
+
+        if sells.any():
+            state[sells] = COOLDOWN
+            cooldown_until[sells] = now + cooldown
+            rows = np.flatnonzero(sells & (qty > 0))
+            exec_price = price[rows] * (1 - slippage_rate)
+            sold = qty[rows]
+            cash[rows] += exec_price * sold - exec_price * sold * fee_rate
+            qty[rows] = 0.0
+            avg[rows] = 0.0
+            trades[rows] += 1
+
+        equity = cash + qty * price
+        np.maximum(equity_peak, equity, out=equity_peak)
+        np.maximum(max_drawdown, equity_peak - equity, out=max_drawdown)
+
+    final = cash + qty * prices[:, -1]
+    return {
+        "net_pnl": final - initial_cash,
+        "max_drawdown": max_drawdown,
+        "trades": trades,
+    }
+
+
+def distribution(values: Any) -> Dict[str, float]:
+    import numpy as np
+
+    points = np.percentile(values, PERCENTILES)
+    summary = {f"p{rank}": float(point) for rank, point in zip(PERCENTILES, points)}
+    summary["mean"] = float(values.mean())
+    summary["std"] = float(values.std())
+    return summary
+
+
+def run_stress(config: dict, spec: PathSpec) -> Dict[str, Any]:
+    started = time.perf_counter()
+    prices = generate_paths(float(config["demo_price_start"]), spec)
+    generated = time.perf_counter()
+    results = simulate(config, prices, float(config["demo_interval_sec"]))
+    finished = time.perf_counter()
+    net_pnl = results["net_pnl"]
+    return {
+        "paths": spec.paths,
+        "ticks": spec.ticks,
+        "generate_sec": generated - started,
+        "simulate_sec": finished - generated,
+        "loss_prob": float((net_pnl < 0).mean()),
+        **{metric: distribution(results[metric]) for metric in METRICS},
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"paths={report['paths']} | ticks={report['ticks']} "
+        f"| generate={report['generate_sec']:.3f}s "
+        f"| simulate={report['simulate_sec']:.3f}s "
+        f"| loss_prob={report['loss_prob']:.1%}"
+    ]
+    for metric in METRICS:
+        stats = report[metric]
+        cells = " | ".join(f"{key}={value:.2f}" for key, value in stats.items())
+        lines.append(f"{metric} | {cells}")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monte Carlo strategy stress test.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=None)
+    parser.add_argument("--regimes", default=None)
+    parser.add_argument("--switch-prob", type=float, default=0.0)
+    parser.add_argument("--jump-prob", type=float, default=0.0)
+    parser.add_argument("--jump-scale", type=float, default=0.02)
+    parser.add_argument("--trend", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = load_config(args.config)
+    regimes = (
+        [float(value) for value in args.regimes.split(",") if value.strip()]
+        if args.regimes
+        else [float(config["demo_price_volatility"])]
+    )
+    spec = PathSpec(
+        paths=args.paths,
+        ticks=args.ticks or int(config["demo_ticks"]),
+        regimes=regimes,
+        switch_prob=args.switch_prob,
+        jump_prob=args.jump_prob,
+        jump_scale=args.jump_scale,
+        trend=args.trend,
+        seed=int(config["demo_seed"]) if args.seed is None else args.seed,
+    )
+    report = run_stress(config, spec)
+    print(format_report(report))
+    if args.output:
+        document: Dict[str, object] = {
+            "created_at": datetime.utcnow().isoformat(),
+            "spec": {**spec.__dict__, "regimes": list(spec.regimes)},
+            "report": report,
+        }
+        Path(args.output).write_text(json.dumps(document, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing import shared_memory
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import load_config
+from paper.backtest import as_epoch_ns, run_backtest, stream_to_arrays
+
+SWEEP_PARAMS = ("effective_gap", "trailing_pct", "cooldown_sec")
+RESULT_FIELDS = ("net_pnl", "realized_pnl", "fees_paid", "slippage_paid", "trades")
+
+_worker_series: Optional[Tuple[np.ndarray, np.ndarray]] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_config: Dict = {}
+
+
+def build_grid(
+    effective_gaps: Iterable[float],
+    trailing_pcts: Iterable[float],
+    cooldown_secs: Iterable[int],
+) -> List[dict]:
+    return [
+        {"effective_gap": gap, "trailing_pct": trailing, "cooldown_sec": cooldown}
+        for gap, trailing, cooldown in product(
+            effective_gaps, trailing_pcts, cooldown_secs
+        )
+    ]
+
+
+def run_sweep(
+    prices: Sequence[float] | np.ndarray,
+    timestamps: Sequence | np.ndarray,
+    config: dict,
+    grid: List[dict],
+    processes: Optional[int] = None,
+) -> List[dict]:
+    price_arr = np.ascontiguousarray(prices, dtype=np.float64)
+    ts_arr = np.ascontiguousarray(as_epoch_ns(timestamps), dtype=np.int64)
+    if processes == 1:
+        return [_evaluate(price_arr, ts_arr, config, params) for params in grid]
+
+    price_block = _to_shared(price_arr)
+    ts_block = _to_shared(ts_arr)
+    try:
+        spec = (
+            (price_block.name, len(price_arr)),
+            (ts_block.name, len(ts_arr)),
+        )
+        with ProcessPoolExecutor(
+            max_workers=processes or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(spec, config),
+        ) as pool:
+            return list(pool.map(_evaluate_shared, grid))
+    finally:
+        for block in (price_block, ts_block):
+            block.close()
+            block.unlink()
+
+
+def format_table(rows: List[dict]) -> str:
+    columns = SWEEP_PARAMS + RESULT_FIELDS
+    lines = [" | ".join(f"{name:>14}" for name in columns)]
+    for row in rows:
+        cells = []
+        for name in columns:
+            value = row[name]
+            if isinstance(value, float):
+                cells.append(f"{value:>14.4f}")
+            else:
+                cells.append(f"{value:>14}")
+        lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+def _evaluate(
+    prices: np.ndarray, timestamps_ns: np.ndarray, config: dict, params: dict
+) -> dict:
+    run_config = dict(config)
+    run_config.update(params)
+    result = run_backtest(prices, timestamps_ns, run_config)
+    row = {name: params.get(name, config[name]) for name in SWEEP_PARAMS}
+    row.update(
+        net_pnl=result.summary["net_pnl"],
+        realized_pnl=result.summary["realized_pnl"],
+        fees_paid=result.summary["fees_paid"],
+        slippage_paid=result.summary["slippage_paid"],
+        trades=len(result.trades),
+    )
+    return row
+
+
+def _evaluate_shared(params: dict) -> dict:
+    assert _worker_series is not None
+    prices, timestamps_ns = _worker_series
+    return _evaluate(prices, timestamps_ns, _worker_config, params)
+
+
+def _init_worker(spec: Tuple[Tuple[str, int], Tuple[str, int]], config: dict) -> None:
+    global _worker_series, _worker_config
+    (price_name, price_len), (ts_name, ts_len) = spec
+    price_block = shared_memory.SharedMemory(name=price_name)
+    ts_block = shared_memory.SharedMemory(name=ts_name)
+    _worker_blocks.extend((price_block, ts_block))
+    _worker_series = (
+        np.ndarray((price_len,), dtype=np.float64, buffer=price_block.buf),
+        np.ndarray((ts_len,), dtype=np.int64, buffer=ts_block.buf),
+    )
+    _worker_config = config
+
+
+def _to_shared(values: np.ndarray) -> shared_memory.SharedMemory:
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    view = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+    view[:] = values
+    return block
+
+
+def _parse_list(text: str, cast) -> List:
+    return [cast(item) for item in text.split(",") if item.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Heartbeat parameter sweep.")
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--ticks", type=int, default=None)
+    parser.add_argument("--effective-gap", default=None)
+    parser.add_argument("--trailing-pct", default=None)
+    parser.add_argument("--cooldown-sec", default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    return parser.parse_args()
+
+
+def main() -> None:
+    from run import demo_price_stream
+
+    args = parse_args()
+    config = load_config(args.config)
+    ticks = args.ticks if args.ticks is not None else int(config["demo_ticks"])
+    grid = build_grid(
+        _parse_list(args.effective_gap or str(config["effective_gap"]), float),
+        _parse_list(args.trailing_pct or str(config["trailing_pct"]), float),
+        _parse_list(args.cooldown_sec or str(config["cooldown_sec"]), int),
+    )
+    prices, timestamps_ns = stream_to_arrays(demo_price_stream(config, ticks))
+    rows = run_sweep(prices, timestamps_ns, config, grid, processes=args.processes)
+    print(format_table(rows))
+
+
+if __name__ == "__main__":
+    main()
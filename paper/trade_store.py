@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+import os
+from pathlib import Path
+import struct
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.tick import datetime_to_ns, ns_to_datetime
+
+SIDES = {"BUY": 1, "SELL": -1}
+SIDE_NAMES = {1: "BUY", -1: "SELL"}
+
+_FLOAT_FIELDS = (
+    "price",
+    "qty",
+    "exec_price",
+    "fee",
+    "slippage",
+    "cash",
+    "position_qty",
+    "avg_price",
+    "realized_pnl",
+    "pnl",
+)
+_RECORD = struct.Struct("<bq" + "d" * len(_FLOAT_FIELDS))
+_SPILL_READ_ROWS = 4096
+
+
+class TradeView:
+    __slots__ = ("side_code", "timestamp_ns") + _FLOAT_FIELDS
+
+    def __init__(self, row: tuple) -> None:
+        self.side_code = row[0]
+        self.timestamp_ns = row[1]
+        for name, value in zip(_FLOAT_FIELDS, row[2:]):
+            setattr(self, name, value)
+
+    @property
+    def side(self) -> str:
+        return SIDE_NAMES.get(self.side_code, "")
+
+    @property
+    def timestamp(self) -> str:
+        return ns_to_datetime(self.timestamp_ns).isoformat()
+
+    def __repr__(self) -> str:
+        return (
+            f"TradeView(side={self.side!r}, price={self.price!r}, qty={self.qty!r}, "
+            f"timestamp={self.timestamp!r})"
+        )
+
+
+class TradeStore:
+    def __init__(
+        self, tail_size: int = 1024, spill_path: Optional[str | Path] = None
+    ) -> None:
+        self.tail_size = max(2, int(tail_size))
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.dropped = 0
+        self.spilled = 0
+        if self.spill_path is not None and self.spill_path.exists():
+            size = self.spill_path.stat().st_size
+            self.spilled = size // _RECORD.size
+            if size != self.spilled * _RECORD.size:
+                os.truncate(self.spill_path, self.spilled * _RECORD.size)
+        self._sides = array("b")
+        self._timestamps = array("q")
+        self._floats = {name: array("d") for name in _FLOAT_FIELDS}
+
+    def append(
+        self, event: Any, pnl: float = 0.0, timestamp_ns: Optional[int] = None
+    ) -> None:
+        if timestamp_ns is None:
+            timestamp_ns = _timestamp_ns(event.timestamp)
+        self._sides.append(SIDES.get(event.side, 0))
+        self._timestamps.append(timestamp_ns)
+        floats = self._floats
+        for name in _FLOAT_FIELDS[:-1]:
+            floats[name].append(getattr(event, name))
+        floats["pnl"].append(pnl)
+        if len(self._sides) >= self.tail_size:
+            self._evict(self.tail_size // 2)
+
+    @property
+    def total(self) -> int:
+        return self.dropped + self.spilled + len(self._sides)
+
+    def __len__(self) -> int:
+        return self.spilled + len(self._sides)
+
+    def __getitem__(self, index: int) -> TradeView:
+        retained = len(self)
+        if index < 0:
+            index += retained
+        if index < 0 or index >= retained:
+            raise IndexError("trade index out of range")
+        if index >= self.spilled:
+            return TradeView(self._tail_row(index - self.spilled))
+        assert self.spill_path is not None
+        with self.spill_path.open("rb") as handle:
+            handle.seek(index * _RECORD.size)
+            return TradeView(_RECORD.unpack(handle.read(_RECORD.size)))
+
+    def __iter__(self) -> Iterator[TradeView]:
+        if self.spilled and self.spill_path is not None:
+            remaining = self.spilled
+            with self.spill_path.open("rb") as handle:
+                while remaining > 0:
+                    rows = min(remaining, _SPILL_READ_ROWS)
+                    data = handle.read(rows * _RECORD.size)
+                    for row in _RECORD.iter_unpack(data):
+                        yield TradeView(row)
+                    remaining -= rows
+        for row in range(len(self._sides)):
+            yield TradeView(self._tail_row(row))
+
+    def columns(self, include_spilled: bool = True) -> Dict[str, Any]:
+        import numpy as np
+
+        tail = {
+            "side": np.frombuffer(self._sides, dtype=np.int8),
+            "timestamp_ns": np.frombuffer(self._timestamps, dtype=np.int64),
+        }
+        for name, values in self._floats.items():
+            tail[name] = np.frombuffer(values, dtype=np.float64)
+        if not include_spilled or not self.spilled or self.spill_path is None:
+            return {name: values.copy() for name, values in tail.items()}
+
+        spilled = np.memmap(
+            self.spill_path, dtype=_spill_dtype(), mode="r", shape=(self.spilled,)
+        )
+        return {
+            name: np.concatenate([spilled[name], values]) for name, values in tail.items()
+        }
+
+    def pnl_by_hour(self) -> Dict[str, float]:
+        return self._sum_by_bucket(3_600 * 1_000_000_000)
+
+    def pnl_by_day(self) -> Dict[str, float]:
+        return self._sum_by_bucket(86_400 * 1_000_000_000)
+
+    def fees_by_side(self) -> Dict[str, float]:
+        import numpy as np
+
+        columns = self.columns()
+        sides = columns["side"]
+        fees = columns["fee"]
+        return {
+            name: float(np.sum(fees[sides == code])) for name, code in SIDES.items()
+        }
+
+    def _sum_by_bucket(self, bucket_ns: int) -> Dict[str, float]:
+        import numpy as np
+
+        columns = self.columns()
+        if not len(columns["timestamp_ns"]):
+            return {}
+        buckets = columns["timestamp_ns"] // bucket_ns
+        keys, inverse = np.unique(buckets, return_inverse=True)
+        sums = np.bincount(inverse, weights=columns["pnl"])
+        return {
+            ns_to_datetime(int(key) * bucket_ns).isoformat(): float(total)
+            for key, total in zip(keys, sums)
+        }
+
+    def _tail_row(self, row: int) -> tuple:
+        return (self._sides[row], self._timestamps[row]) + tuple(
+            self._floats[name][row] for name in _FLOAT_FIELDS
+        )
+
+    def _evict(self, count: int) -> None:
+        if self.spill_path is not None:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.spill_path.open("ab") as handle:
+                handle.write(
+                    b"".join(_RECORD.pack(*self._tail_row(row)) for row in range(count))
+                )
+            self.spilled += count
+        else:
+            self.dropped += count
+        del self._sides[:count]
+        del self._timestamps[:count]
+        for values in self._floats.values():
+            del values[:count]
+
+
+def _spill_dtype() -> Any:
+    import numpy as np
+
+    fields: List[tuple] = [("side", "<i1"), ("timestamp_ns", "<i8")]
+    fields.extend((name, "<f8") for name in _FLOAT_FIELDS)
+    return np.dtype(fields)
+
+
+def _timestamp_ns(timestamp: str) -> int:
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return datetime_to_ns(parsed)
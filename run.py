@@ -1,21 +1,23 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 from datetime import datetime, timedelta
+from pathlib import Path
 import random
+import tempfile
+import time
+from typing import Optional
 
 from core.config import load_config
-from core.heartbeat import HeartbeatStrategy
-from core.state import StateStore
-from paper.ledger import Ledger
-from paper.report import write_hourly_report, write_trade
+from paper.session import PaperSession, scratch_config
 
 
-def demo_price_stream(config: dict, ticks: int):
+def demo_price_stream(config: dict, ticks: int, start: Optional[datetime] = None):
     rng = random.Random(config["demo_seed"])
     price = float(config["demo_price_start"])
     interval = int(config["demo_interval_sec"])
-    now = datetime.utcnow()
+    now = start or datetime.utcnow()
     for _ in range(ticks):
         yield now, price
         shock = rng.uniform(-config["demo_price_volatility"], config["demo_price_volatility"])
@@ -24,82 +26,168 @@ def demo_price_stream(config: dict, ticks: int):
 
 
 def run_demo(config: dict, ticks: int) -> None:
-    ledger = Ledger(config["initial_cash"])
-    strategy = HeartbeatStrategy(
-        effective_gap=config["effective_gap"],
-        trailing_pct=config["trailing_pct"],
-        cooldown_sec=config["cooldown_sec"],
-    )
-
-    state_store = StateStore(config["state_path"])
-    saved_state = state_store.load()
-    if saved_state.get("ledger"):
-        ledger.restore(saved_state["ledger"])
-    if saved_state.get("strategy"):
-        strategy.restore(saved_state["strategy"])
-
-    last_report_at = None
-    if saved_state.get("last_report_at"):
-        last_report_at = datetime.fromisoformat(saved_state["last_report_at"])
-
-    for timestamp, price in demo_price_stream(config, ticks):
-        action = strategy.on_tick(price, timestamp)
-        if action == "BUY":
-            qty = config["trade_size_cash"] / price
-            try:
-                event = ledger.buy(
-                    price=price,
-                    qty=qty,
-                    fee_rate=config["fee_rate"],
-                    slippage_rate=config["slippage_rate"],
-                    timestamp=timestamp.isoformat(),
-                )
-                write_trade(event, config["trades_log_path"])
-            except ValueError:
-                pass
-        elif action == "SELL" and ledger.position_qty > 0:
-            try:
-                event = ledger.sell(
-                    price=price,
-                    qty=ledger.position_qty,
-                    fee_rate=config["fee_rate"],
-                    slippage_rate=config["slippage_rate"],
-                    timestamp=timestamp.isoformat(),
+    session = PaperSession(config)
+    session.restore()
+    try:
+        for timestamp, price in demo_price_stream(config, ticks):
+            session.on_tick(price, timestamp)
+    finally:
+        session.close()
+
+
+def run_live(config: dict) -> None:
+    from exchanges.coinone.ws import CoinoneWebSocket
+    from services.runtime import run_runtime
+    from services.tick_archive import TickArchive, TickRecorder
+
+    session = PaperSession(config)
+    session.restore()
+    if config["warm_start"]:
+        started = time.perf_counter()
+        warmed = session.warm_start(
+            TickArchive(config["tick_archive_path"], config["symbol"])
+        )
+        print(f"warm_start={warmed} | ready={time.perf_counter() - started:.3f}s")
+    try:
+        if config["feed_process"]:
+            from services.shm_ring import run_split
+
+            stats = run_split(session, config)
+        else:
+            recorder = None
+            if config["record_ticks"]:
+                recorder = TickRecorder(config["tick_archive_path"], config["symbol"])
+            feed = CoinoneWebSocket(
+                config["symbol"],
+                url=config["ws_url"],
+                channels=session.feed_channels(),
+                reconnect=bool(config["ws_reconnect"]),
+                latency=session.latency,
+                book=session.book,
+            )
+            stats = asyncio.run(
+                run_runtime(
+                    session,
+                    feed,
+                    queue_size=int(config["feed_queue_size"]),
+                    max_lag_ms=float(config["feed_max_lag_ms"]),
+                    recorder=recorder,
                 )
-                write_trade(event, config["trades_log_path"])
-            except ValueError:
-                pass
-
-        if last_report_at is None or (
-            timestamp - last_report_at
-        ).total_seconds() >= config["report_interval_sec"]:
-            write_hourly_report(
-                ledger, price, config["hourly_report_path"], timestamp.isoformat()
             )
-            last_report_at = timestamp
-
-        state_store.save(
-            {
-                "ledger": ledger.snapshot(),
-                "strategy": strategy.snapshot(),
-                "last_report_at": last_report_at.isoformat()
-                if last_report_at
-                else None,
-            }
-        )
+    finally:
+        session.close()
+    print(" | ".join(f"{key}={value}" for key, value in stats.summary().items()))
+
+
+def run_replay(
+    config: dict,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    output_dir: Optional[str] = None,
+) -> None:
+    from core.tick import datetime_to_ns
+    from services.tick_archive import TickArchive
+
+    archive = TickArchive(config["tick_archive_path"], config["symbol"])
+    start_ns = datetime_to_ns(datetime.fromisoformat(start)) if start else None
+    end_ns = datetime_to_ns(datetime.fromisoformat(end)) if end else None
+
+    with tempfile.TemporaryDirectory(prefix="replay-") as scratch:
+        if output_dir:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        session = PaperSession(scratch_config(config, output_dir or scratch))
+        if config["warm_start"] and start_ns is not None:
+            session.warm_start(archive, start_ns)
+        ticks = 0
+        started = time.perf_counter()
+        try:
+            for columns in archive.iter_range(start_ns, end_ns):
+                session.on_tick_arrays(columns.price, columns.timestamp_ns)
+                ticks += len(columns.price)
+        finally:
+            session.close()
+    elapsed = time.perf_counter() - started
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    summary = session.ledger.summary(session.last_price or 0.0)
+    print(
+        f"replayed={ticks} | elapsed={elapsed:.3f}s | ticks_per_sec={rate:.0f} "
+        f"| net={summary['net_pnl']:.2f} | realized={summary['realized_pnl']:.2f} "
+        f"| fees={summary['fees_paid']:.2f} | filtered={session.ticks_filtered}"
+    )
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Heart Beat Coin Scalper (demo).")
     parser.add_argument("--config", default="config.yaml")
     parser.add_argument("--ticks", type=int, default=None)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--multi", action="store_true")
+    parser.add_argument("--shadow", action="store_true")
+    parser.add_argument("--ws-url", default=None)
+    parser.add_argument("--no-reconnect", action="store_true")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--latency", action="store_true")
+    parser.add_argument("--replay", action="store_true")
+    parser.add_argument("--soak", action="store_true")
+    parser.add_argument("--from", dest="replay_from", default=None)
+    parser.add_argument("--to", dest="replay_to", default=None)
+    parser.add_argument("--out", dest="replay_out", default=None)
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
     config = load_config(args.config)
+    if args.ws_url:
+        config["ws_url"] = args.ws_url
+    if args.no_reconnect:
+        config["ws_reconnect"] = False
+    if args.record:
+        config["record_ticks"] = True
+    if args.latency:
+        config["latency_enabled"] = True
     ticks = args.ticks if args.ticks is not None else int(config["demo_ticks"])
+    if args.soak:
+        from paper.soak import format_report, run_soak, save_report
+
+        report = run_soak(
+            config,
+            args.ticks if args.ticks is not None else int(config["soak_ticks"]),
+            sample_every=int(config["soak_sample_every"]),
+            replay=args.replay,
+            start=args.replay_from,
+            end=args.replay_to,
+            trace=bool(config["soak_tracemalloc"]),
+            top=int(config["soak_top_allocations"]),
+        )
+        print(format_report(report))
+        if config["soak_report_path"]:
+            save_report(report, config["soak_report_path"])
+        return
+    if args.shadow:
+        from paper.shadow import format_variants, run_shadow
+
+        summaries = run_shadow(
+            config,
+            ticks,
+            live=args.live,
+            replay=args.replay,
+            start=args.replay_from,
+            end=args.replay_to,
+        )
+        print(format_variants(summaries))
+        return
+    if args.replay:
+        run_replay(config, args.replay_from, args.replay_to, args.replay_out)
+        return
+    if args.multi:
+        from paper.multi import format_summaries, run_multi
+
+        print(format_summaries(run_multi(config, ticks, live=args.live)))
+        return
+    if args.live:
+        run_live(config)
+        return
     run_demo(config, ticks)
 
 
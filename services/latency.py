@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import threading
+from typing import Dict, Optional
+
+STAGE_DECODE = "decode"
+STAGE_QUEUE = "queue"
+STAGE_FILTERS = "filters"
+STAGE_STRATEGY = "strategy"
+STAGE_LEDGER = "ledger"
+STAGE_IO = "io"
+
+SUB_BITS = 3
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = (64 - SUB_BITS) * SUB_BUCKETS + SUB_BUCKETS
+
+
+def bucket_index(value_ns: int) -> int:
+    if value_ns < 2 * SUB_BUCKETS:
+        return max(0, value_ns)
+    shift = value_ns.bit_length() - SUB_BITS - 1
+    return min(BUCKETS - 1, shift * SUB_BUCKETS + (value_ns >> shift))
+
+
+def bucket_upper(index: int) -> int:
+    if index < 2 * SUB_BUCKETS:
+        return index
+    shift, mantissa = divmod(index, SUB_BUCKETS)
+    shift -= 1
+    return ((mantissa + SUB_BUCKETS + 1) << shift) - 1
+
+
+class LogHistogram:
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.counts = array("q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int) -> None:
+        self.counts[bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def percentile(self, pct: float) -> int:
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * pct / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_upper(index), self.max_ns)
+        return self.max_ns
+
+    def merge(self, other: "LogHistogram") -> None:
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+
+    def reset(self) -> None:
+        self.counts = array("q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "p50_us": self.percentile(50) / 1000,
+            "p99_us": self.percentile(99) / 1000,
+            "max_us": self.max_ns / 1000,
+            "mean_us": self.total_ns / self.count / 1000 if self.count else 0.0,
+        }
+
+
+class StageLatency:
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._histograms: Dict[str, LogHistogram] = {}
+
+    def record(self, stage: str, elapsed_ns: int) -> None:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            histogram = self._histograms[stage] = LogHistogram()
+        histogram.record(elapsed_ns)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+    def take(self) -> Dict[str, LogHistogram]:
+        histograms = self._histograms
+        self._histograms = {}
+        return histograms
+
+    def merge(self, histograms: Dict[str, LogHistogram]) -> None:
+        for stage, other in histograms.items():
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                self._histograms[stage] = other
+            else:
+                histogram.merge(other)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: histogram.summary()
+            for stage, histogram in list(self._histograms.items())
+            if histogram.count
+        }
+
+    def format_line(self) -> str:
+        return " ".join(
+            f"{stage}={summary['p50_us']:.1f}/{summary['p99_us']:.1f}"
+            f"/{summary['max_us']:.1f}us"
+            for stage, summary in self.snapshot().items()
+        )
+
+    def dump(self, path: str | Path) -> None:
+        file_path = Path(path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = file_path.with_suffix(".tmp")
+        document = {"enabled": self.enabled, "stages": self.snapshot()}
+        temp_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        temp_path.replace(file_path)
+
+
+class LatencyServer:
+    def __init__(
+        self, latency: StageLatency, host: str = "127.0.0.1", port: int = 0
+    ) -> None:
+        self.latency = latency
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/latency"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="latency-http", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _handler_class(self) -> type:
+        latency = self.latency
+        actions = {
+            "/latency/enable": latency.enable,
+            "/latency/disable": latency.disable,
+            "/latency/reset": latency.reset,
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/latency":
+                    self._reply(404, {"error": "not found"})
+                    return
+                self._reply(
+                    200, {"enabled": latency.enabled, "stages": latency.snapshot()}
+                )
+
+            def do_POST(self) -> None:
+                action = actions.get(self.path)
+                if action is None:
+                    self._reply(404, {"error": "not found"})
+                    return
+                action()
+                self._reply(200, {"enabled": latency.enabled})
+
+            def log_message(self, *_: object) -> None:
+                return
+
+            def _reply(self, status: int, data: dict) -> None:
+                encoded = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+        return Handler
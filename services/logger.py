@@ -1,8 +1,88 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+import queue
+import threading
+from typing import Dict, List, Optional
+
+_LISTENERS: Dict[str, "DropReportingListener"] = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, separators=(",", ":"))
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, records: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(records)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class DropReportingListener(QueueListener):
+    def __init__(
+        self,
+        records: "queue.Queue[logging.LogRecord]",
+        source: DroppingQueueHandler,
+        *handlers: logging.Handler,
+    ) -> None:
+        super().__init__(records, *handlers, respect_handler_level=True)
+        self.source = source
+        self.reported = 0
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        self.report_drops(record.name)
+
+    def stop(self) -> None:
+        super().stop()
+        self.report_drops()
+
+    def report_drops(self, name: str = __name__) -> None:
+        dropped = self.source.dropped
+        if dropped <= self.reported:
+            return
+        warning = logging.LogRecord(
+            name,
+            logging.WARNING,
+            __file__,
+            0,
+            f"log queue overloaded | dropped={dropped - self.reported}",
+            None,
+            None,
+        )
+        self.reported = dropped
+        super().handle(warning)
 
 
 def build_logger(
@@ -11,6 +91,9 @@ def build_logger(
     level: int = logging.INFO,
     max_bytes: int = 1_000_000,
     backup_count: int = 3,
+    queued: bool = False,
+    queue_size: int = 10_000,
+    json_path: Optional[str | Path] = None,
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     if logger.handlers:
@@ -19,13 +102,63 @@ def build_logger(
     logger.setLevel(level)
     logger.propagate = False
 
+    handlers: List[logging.Handler] = [
+        _file_handler(
+            log_path,
+            logging.Formatter("%(asctime)s | %(levelname)s | %(message)s"),
+            max_bytes,
+            backup_count,
+        )
+    ]
+    if json_path:
+        handlers.append(
+            _file_handler(json_path, JsonLinesFormatter(), max_bytes, backup_count)
+        )
+
+    if not queued:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(max(1, int(queue_size)))
+    queue_handler = DroppingQueueHandler(records)
+    listener = DropReportingListener(records, queue_handler, *handlers)
+    listener.start()
+    _LISTENERS[name] = listener
+    logger.addHandler(queue_handler)
+    return logger
+
+
+def dropped_records(logger: logging.Logger) -> int:
+    return sum(
+        handler.dropped
+        for handler in logger.handlers
+        if isinstance(handler, DroppingQueueHandler)
+    )
+
+
+def stop_logger(name: str) -> None:
+    logger = logging.getLogger(name)
+    listener = _LISTENERS.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def _file_handler(
+    log_path: str | Path,
+    formatter: logging.Formatter,
+    max_bytes: int,
+    backup_count: int,
+) -> RotatingFileHandler:
     path = Path(log_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-
     handler = RotatingFileHandler(
         path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
     )
-    formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
     handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    return logger
+    return handler
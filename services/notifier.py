@@ -1,15 +1,285 @@
 from __future__ import annotations
 
-from typing import Optional
-
+import json
 import logging
+import queue
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+import urllib.request
+
+from services.ratelimit import TokenBucket
+
+CONSOLE = "console"
+_SIMILAR = re.compile(r"[-+]?\d[\d,.:eE+-]*")
+
+Send = Callable[[str], None]
+
+
+class TelegramChannel:
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        url: str = "https://api.telegram.org",
+        timeout: float = 5.0,
+    ) -> None:
+        self.endpoint = f"{url.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.timeout = timeout
+
+    def __call__(self, message: str) -> None:
+        body = json.dumps({"chat_id": self.chat_id, "text": message}).encode("utf-8")
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class _Digest:
+    __slots__ = ("message", "count", "first_at")
+
+    def __init__(self, message: str, first_at: float) -> None:
+        self.message = message
+        self.count = 1
+        self.first_at = first_at
+
+    def text(self) -> str:
+        if self.count == 1:
+            return self.message
+        return f"{self.message} (+{self.count - 1} similar)"
+
+
+class _Channel:
+    __slots__ = ("send", "bucket", "outbox", "thread")
+
+    def __init__(self, send: Send, bucket: Optional[TokenBucket] = None) -> None:
+        self.send = send
+        self.bucket = bucket
+        self.outbox: "Optional[queue.Queue[Optional[str]]]" = None
+        self.thread: Optional[threading.Thread] = None
 
 
 class Notifier:
-    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        queue_size: int = 256,
+        coalesce_sec: float = 2.0,
+        rate_per_min: float = 20.0,
+        burst: int = 5,
+        max_pending: int = 64,
+        background: bool = True,
+    ) -> None:
         self._logger = logger
+        self.coalesce_sec = float(coalesce_sec)
+        self.rate_per_min = float(rate_per_min)
+        self.burst = int(burst)
+        self.max_pending = max(1, int(max_pending))
+        self.queue_size = max(1, int(queue_size))
+        self.background = background
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._channels: Dict[str, _Channel] = {}
+        self._pending: Dict[Tuple[str, str], _Digest] = {}
+        self._reported_drops = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, str, str]]]" = queue.Queue(
+            self.queue_size
+        )
+        self._open_channel(CONSOLE, _Channel(self._emit))
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._thread = threading.Thread(
+                target=self._run, name="notifier", daemon=True
+            )
+            self._thread.start()
+
+    def add_channel(
+        self,
+        name: str,
+        send: Send,
+        rate_per_min: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> None:
+        rate = self.rate_per_min if rate_per_min is None else float(rate_per_min)
+        capacity = self.burst if burst is None else int(burst)
+        self._open_channel(name, _Channel(send, TokenBucket(rate / 60.0, capacity)))
+
+    def notify(
+        self, message: str, channel: str = CONSOLE, key: Optional[str] = None
+    ) -> None:
+        if key is None:
+            key = _SIMILAR.sub("#", message)
+        if not self.background:
+            self._collect(channel, key, message)
+            self._deliver(force=True)
+            return
+        try:
+            self._queue.put_nowait((channel, key, message))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def broadcast(self, message: str, key: Optional[str] = None) -> None:
+        with self._lock:
+            channels = list(self._channels)
+        for channel in channels:
+            self.notify(message, channel, key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "pending": len(self._pending),
+                "queued": self._queue.qsize(),
+            }
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            channels = list(self._channels.values())
+        for channel in channels:
+            if channel.thread is None:
+                continue
+            try:
+                channel.outbox.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            channel.thread.join(timeout)
+            channel.thread = None
+
+    def _open_channel(self, name: str, channel: _Channel) -> None:
+        if self.background:
+            channel.outbox = queue.Queue(self.queue_size)
+            channel.thread = threading.Thread(
+                target=self._send_loop,
+                args=(channel,),
+                name=f"notifier-{name}",
+                daemon=True,
+            )
+            channel.thread.start()
+        with self._lock:
+            previous = self._channels.get(name)
+            self._channels[name] = channel
+        if previous is not None and previous.thread is not None:
+            previous.outbox.put(None)
+
+    def _send_loop(self, channel: _Channel) -> None:
+        while True:
+            message = channel.outbox.get()
+            if message is None:
+                return
+            self._send(channel, message)
+
+    def _run(self) -> None:
+        wait = self.coalesce_sec if self.coalesce_sec > 0 else 0.5
+        while True:
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = ()
+            while item:
+                self._collect(*item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = ()
+            if item is None:
+                self._drain()
+                self._deliver(force=True)
+                self._discard()
+                return
+            self._deliver()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                self._collect(*item)
+
+    def _discard(self) -> None:
+        with self._lock:
+            dropped = sum(digest.count for digest in self._pending.values())
+            self._pending.clear()
+            self.dropped += dropped
+        if dropped:
+            self._emit(f"notifier closed | dropped={dropped}")
+
+    def _collect(self, channel: str, key: str, message: str) -> None:
+        with self._lock:
+            digest = self._pending.get((channel, key))
+            if digest is not None:
+                digest.count += 1
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                self.dropped += 1
+            else:
+                self._pending[(channel, key)] = _Digest(message, time.monotonic())
+
+    def _deliver(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            ready = [
+                (target, digest)
+                for target, digest in self._pending.items()
+                if force or now - digest.first_at >= self.coalesce_sec
+            ]
+            channels = dict(self._channels)
+            dropped = self.dropped - self._reported_drops
+            self._reported_drops = self.dropped
+        for target, digest in ready:
+            channel = channels.get(target[0])
+            with self._lock:
+                if self._pending.get(target) is not digest:
+                    continue
+                if channel is None:
+                    del self._pending[target]
+                    self.dropped += digest.count
+                    continue
+                if channel.bucket is not None and not channel.bucket.try_acquire():
+                    continue
+                del self._pending[target]
+            if channel.outbox is None:
+                self._send(channel, digest.text())
+                continue
+            try:
+                channel.outbox.put_nowait(digest.text())
+            except queue.Full:
+                with self._lock:
+                    self.dropped += digest.count
+        if dropped:
+            self._emit(f"notifier overloaded | dropped={dropped}")
+
+    def _send(self, channel: _Channel, message: str) -> None:
+        try:
+            channel.send(message)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            return
+        with self._lock:
+            self.sent += 1
 
-    def notify(self, message: str) -> None:
+    def _emit(self, message: str) -> None:
         if self._logger:
             self._logger.info(message)
             return
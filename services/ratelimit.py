@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, reserve: float = 0.0) -> None:
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be positive.")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.reserve = max(0.0, min(float(reserve), self.capacity - 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._high_waiters = 0
+        self._cond = threading.Condition()
+
+    def try_acquire(self, priority: int = PRIORITY_LOW, tokens: float = 1.0) -> bool:
+        with self._cond:
+            return self._take(priority, tokens)
+
+    def acquire(
+        self,
+        priority: int = PRIORITY_LOW,
+        tokens: float = 1.0,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if priority == PRIORITY_HIGH:
+                self._high_waiters += 1
+            try:
+                while not self._take(priority, tokens):
+                    wait = self._wait_time(priority, tokens)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+                return True
+            finally:
+                if priority == PRIORITY_HIGH:
+                    self._high_waiters -= 1
+                    self._cond.notify_all()
+
+    @property
+    def tokens(self) -> float:
+        with self._cond:
+            self._refill()
+            return self._tokens
+
+    def _take(self, priority: int, tokens: float) -> bool:
+        self._refill()
+        if priority == PRIORITY_HIGH:
+            floor = 0.0
+        elif self._high_waiters:
+            return False
+        else:
+            floor = self.reserve
+        if self._tokens - tokens < floor:
+            return False
+        self._tokens -= tokens
+        return True
+
+    def _wait_time(self, priority: int, tokens: float) -> float:
+        floor = 0.0 if priority == PRIORITY_HIGH else self.reserve
+        missing = tokens + floor - self._tokens
+        return max(missing / self.rate, 0.001)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import time
+from typing import Any, Deque, Dict, Optional
+
+from core.tick import Tick
+from services.latency import STAGE_QUEUE, LogHistogram
+
+
+class ConflatingTickQueue:
+    def __init__(self, maxsize: int = 1024, max_lag_ms: float = 50.0) -> None:
+        self.maxsize = max(1, int(maxsize))
+        self.max_lag_ns = int(max_lag_ms * 1_000_000)
+        self.received = 0
+        self.conflated = 0
+        self._ticks: Deque[Tick] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def put_nowait(self, tick: Tick) -> None:
+        if len(self._ticks) >= self.maxsize:
+            self._ticks.popleft()
+            self.conflated += 1
+        self._ticks.append(tick)
+        self.received += 1
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def get(self) -> Optional[Tick]:
+        while not self._ticks:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        ticks = self._ticks
+        if len(ticks) > 1:
+            cutoff = time.time_ns() - self.max_lag_ns
+            while len(ticks) > 1 and ticks[0].received_ns < cutoff:
+                ticks.popleft()
+                self.conflated += 1
+        return ticks.popleft()
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+
+@dataclass
+class RuntimeStats:
+    ticks_received: int = 0
+    ticks_processed: int = 0
+    ticks_conflated: int = 0
+    elapsed_sec: float = 0.0
+    latency: LogHistogram = field(default_factory=LogHistogram)
+
+    def record(self, latency_ns: int) -> None:
+        self.ticks_processed += 1
+        self.latency.record(latency_ns)
+
+    def latency_percentiles(self) -> Dict[str, float]:
+        if not self.latency.count:
+            return {}
+        summary = self.latency.summary()
+        return {key: summary[key] for key in ("p50_us", "p99_us", "max_us")}
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "ticks_received": self.ticks_received,
+            "ticks_processed": self.ticks_processed,
+            "ticks_conflated": self.ticks_conflated,
+            "elapsed_sec": self.elapsed_sec,
+        }
+        summary.update(self.latency_percentiles())
+        return summary
+
+
+async def pump_feed(
+    feed: Any, queue: ConflatingTickQueue, recorder: Any = None
+) -> None:
+    try:
+        async for tick in feed.ticks():
+            if recorder is not None:
+                recorder.append(tick)
+            queue.put_nowait(tick)
+    finally:
+        queue.close()
+        if recorder is not None:
+            recorder.close()
+
+
+async def run_runtime(
+    session: Any,
+    feed: Any,
+    queue_size: int = 1024,
+    max_lag_ms: float = 50.0,
+    recorder: Any = None,
+) -> RuntimeStats:
+    queue = ConflatingTickQueue(queue_size, max_lag_ms)
+    stats = RuntimeStats()
+    stages = getattr(session, "latency", None)
+    started = time.perf_counter()
+    producer = asyncio.create_task(pump_feed(feed, queue, recorder))
+    try:
+        while True:
+            tick = await queue.get()
+            if tick is None:
+                break
+            if stages is not None and stages.enabled:
+                stages.record(STAGE_QUEUE, time.time_ns() - tick.received_ns)
+            session.on_tick_ns(tick.price, tick.timestamp_ns)
+            stats.record(time.time_ns() - tick.received_ns)
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        stats.ticks_received = queue.received
+        stats.ticks_conflated = queue.conflated
+        stats.elapsed_sec = time.perf_counter() - started
+    return stats
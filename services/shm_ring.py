@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from multiprocessing import shared_memory
+import queue
+import struct
+import time
+from typing import Any, List, NamedTuple, Optional
+
+from core.orderbook import BookUpdate
+from core.tick import Tick
+from services.latency import STAGE_QUEUE, StageLatency
+from services.runtime import RuntimeStats
+
+RECORD_FIELDS = (
+    ("seq", "<i8"),
+    ("timestamp_ns", "<i8"),
+    ("price", "<f8"),
+    ("volume", "<f8"),
+    ("received_ns", "<i8"),
+    ("side", "<i8"),
+)
+_RECORD = struct.Struct("<qqddqq")
+_CAPACITY = 0
+_WRITE = 8
+_READ = 16
+_HEADER_BYTES = 192
+_STOP_POLL_SEC = 0.05
+_LATENCY_EVERY_NS = 1_000_000_000
+
+
+class RingBatch(NamedTuple):
+    seq: Any
+    timestamp_ns: Any
+    price: Any
+    volume: Any
+    received_ns: Any
+    side: Any
+
+
+class TickRing:
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536) -> None:
+        import numpy as np
+
+        dtype = np.dtype(list(RECORD_FIELDS))
+        if name is None:
+            capacity = max(2, int(capacity))
+            size = _HEADER_BYTES + capacity * dtype.itemsize
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self._header = self._shm.buf[:_HEADER_BYTES].cast("q")
+        if self.owner:
+            for index in range(len(self._header)):
+                self._header[index] = 0
+            self._header[_CAPACITY] = capacity
+        self.capacity = self._header[_CAPACITY]
+        self._records = np.ndarray(
+            (self.capacity,), dtype, self._shm.buf, offset=_HEADER_BYTES
+        )
+        self._columns = [self._records[name] for name, _ in RECORD_FIELDS]
+        self.produced = 0
+        self.dropped = 0
+        self.overruns = 0
+        self._next_seq = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __len__(self) -> int:
+        return self._header[_WRITE] - self._header[_READ]
+
+    def put(self, tick: Tick) -> bool:
+        header = self._header
+        seq = self.produced
+        self.produced += 1
+        write = header[_WRITE]
+        if write - header[_READ] >= self.capacity:
+            self.dropped += 1
+            return False
+        _RECORD.pack_into(
+            self._shm.buf,
+            _HEADER_BYTES + (write % self.capacity) * _RECORD.size,
+            seq,
+            tick.timestamp_ns,
+            tick.price,
+            tick.volume,
+            tick.received_ns,
+            tick.side,
+        )
+        header[_WRITE] = write + 1
+        return True
+
+    def peek(self, max_items: int = 4096) -> RingBatch:
+        header = self._header
+        read = header[_READ]
+        start = read % self.capacity
+        count = min(header[_WRITE] - read, self.capacity - start, max_items)
+        batch = RingBatch(*(column[start : start + count] for column in self._columns))
+        if count:
+            last = int(batch.seq[-1])
+            self.overruns += last + 1 - self._next_seq - count
+            self._next_seq = last + 1
+        return batch
+
+    def advance(self, count: int) -> None:
+        self._header[_READ] += count
+
+    def close(self) -> None:
+        self._columns = []
+        self._records = None
+        self._header.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+class BookForwarder:
+    def __init__(self, events: Any) -> None:
+        self.events = events
+        self.dropped = 0
+
+    def apply(self, update: BookUpdate) -> None:
+        try:
+            self.events.put_nowait(update)
+        except queue.Full:
+            self.dropped += 1
+
+
+def feed_main(
+    config: dict,
+    ring_name: str,
+    stop: Any,
+    channels: Optional[List[str]] = None,
+    events: Any = None,
+) -> None:
+    from exchanges.coinone.ws import CoinoneWebSocket
+    from services.tick_archive import TickRecorder
+
+    ring = TickRing(ring_name)
+    recorder = None
+    if config["record_ticks"]:
+        recorder = TickRecorder(config["tick_archive_path"], config["symbol"])
+    latency = StageLatency(enabled=bool(config["latency_enabled"]))
+    feed = CoinoneWebSocket(
+        config["symbol"],
+        url=config["ws_url"],
+        channels=channels or str(config["ws_channels"]).split(","),
+        reconnect=bool(config["ws_reconnect"]),
+        latency=latency,
+        book=BookForwarder(events) if events is not None else None,
+    )
+
+    def send_latency() -> None:
+        histograms = latency.take()
+        if events is None or not histograms:
+            return
+        try:
+            events.put_nowait(histograms)
+        except queue.Full:
+            pass
+
+    async def pump() -> None:
+        send_at = 0
+        async for tick in feed.ticks():
+            if recorder is not None:
+                recorder.append(tick)
+            ring.put(tick)
+            if latency.enabled and tick.received_ns >= send_at:
+                send_at = tick.received_ns + _LATENCY_EVERY_NS
+                send_latency()
+
+    async def watch() -> None:
+        while not stop.is_set():
+            await asyncio.sleep(_STOP_POLL_SEC)
+
+    async def run() -> None:
+        tasks = {asyncio.ensure_future(pump()), asyncio.ensure_future(watch())}
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        send_latency()
+        if recorder is not None:
+            recorder.close()
+        ring.close()
+
+
+def drain_events(session: Any, events: Any) -> int:
+    book = getattr(session, "book", None)
+    latency = getattr(session, "latency", None)
+    drained = 0
+    while True:
+        try:
+            item = events.get_nowait()
+        except queue.Empty:
+            return drained
+        drained += 1
+        if isinstance(item, BookUpdate):
+            if book is not None:
+                book.apply(item)
+        elif latency is not None:
+            latency.merge(item)
+
+
+def run_ring_runtime(
+    session: Any,
+    ring: TickRing,
+    stop: Any,
+    batch_size: int = 4096,
+    idle_sleep_us: float = 50.0,
+    events: Any = None,
+) -> RuntimeStats:
+    stats = RuntimeStats()
+    stages = getattr(session, "latency", None)
+    idle_sleep = idle_sleep_us / 1e6
+    started = time.perf_counter()
+    try:
+        while not stop.is_set():
+            if events is not None:
+                drain_events(session, events)
+            batch = ring.peek(batch_size)
+            count = len(batch.seq)
+            if not count:
+                time.sleep(idle_sleep)
+                continue
+            if stages is not None and stages.enabled:
+                stages.record(STAGE_QUEUE, time.time_ns() - int(batch.received_ns[0]))
+            session.on_tick_arrays(batch.price, batch.timestamp_ns)
+            ring.advance(count)
+            stats.ticks_processed += count
+            stats.latency.record(time.time_ns() - int(batch.received_ns[-1]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats.ticks_received = ring.overruns + stats.ticks_processed
+        stats.ticks_conflated = ring.overruns
+        stats.elapsed_sec = time.perf_counter() - started
+    return stats
+
+
+def run_split(session: Any, config: dict) -> RuntimeStats:
+    ring = TickRing(capacity=int(config["feed_ring_capacity"]))
+    stop = multiprocessing.Event()
+    events: Any = multiprocessing.Queue(int(config["feed_queue_size"]))
+    process = multiprocessing.Process(
+        target=feed_main,
+        args=(config, ring.name, stop, session.feed_channels(), events),
+        name="feed-handler",
+    )
+    process.start()
+    try:
+        return run_ring_runtime(session, ring, stop, events=events)
+    finally:
+        stop.set()
+        deadline = time.monotonic() + 5.0
+        while process.is_alive() and time.monotonic() < deadline:
+            drain_events(session, events)
+            process.join(timeout=_STOP_POLL_SEC)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        drain_events(session, events)
+        events.close()
+        ring.close()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from core.tick import Tick
+
+COLUMNS = (
+    ("timestamp_ns", "q", "ts.i8"),
+    ("price", "d", "price.f8"),
+    ("volume", "d", "volume.f8"),
+    ("side", "b", "side.i1"),
+)
+_DTYPES = ("i8", "f8", "f8", "i1")
+INDEX_FILE = "index.json"
+_DAY_NS = 86_400 * 1_000_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+
+class TickColumns(NamedTuple):
+    timestamp_ns: Any
+    price: Any
+    volume: Any
+    side: Any
+
+
+def segment_name(timestamp_ns: int) -> str:
+    day = _EPOCH + timedelta(days=timestamp_ns // _DAY_NS)
+    return day.strftime("%Y%m%d")
+
+
+def segment_start_ns(segment: str) -> int:
+    day = datetime.strptime(segment, "%Y%m%d")
+    return (day - _EPOCH).days * _DAY_NS
+
+
+class TickRecorder:
+    def __init__(self, root: str | Path, symbol: str, flush_every: int = 4096) -> None:
+        self.root = Path(root) / symbol.upper()
+        self.flush_every = max(1, int(flush_every))
+        self.recorded = 0
+        self._segment: Optional[str] = None
+        self._day = -1
+        self._last_ns = 0
+        self._unsorted = False
+        self._buffers = {name: array(code) for name, code, _ in COLUMNS}
+        self._index = _read_index(self.root)
+
+    def append(self, tick: Tick) -> None:
+        day = tick.timestamp_ns // _DAY_NS
+        if day != self._day:
+            self.flush()
+            self._day = day
+            self._segment = segment_name(tick.timestamp_ns)
+            entry = self._index.get(self._segment)
+            self._last_ns = entry["last_ns"] if entry else tick.timestamp_ns
+        if tick.timestamp_ns < self._last_ns:
+            self._unsorted = True
+        else:
+            self._last_ns = tick.timestamp_ns
+        buffers = self._buffers
+        buffers["timestamp_ns"].append(tick.timestamp_ns)
+        buffers["price"].append(tick.price)
+        buffers["volume"].append(tick.volume)
+        buffers["side"].append(tick.side)
+        self.recorded += 1
+        if len(buffers["timestamp_ns"]) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        timestamps = self._buffers["timestamp_ns"]
+        if not timestamps or self._segment is None:
+            return
+        directory = self.root / self._segment
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, _, filename in COLUMNS:
+            with (directory / filename).open("ab") as handle:
+                self._buffers[name].tofile(handle)
+        entry = self._index.get(self._segment)
+        if entry is None:
+            entry = self._index[self._segment] = {
+                "first_ns": timestamps[0],
+                "last_ns": timestamps[-1],
+                "count": 0,
+                "sorted": True,
+            }
+        entry["first_ns"] = min(entry["first_ns"], min(timestamps))
+        entry["last_ns"] = max(entry["last_ns"], self._last_ns)
+        entry["count"] += len(timestamps)
+        if self._unsorted:
+            entry["sorted"] = False
+            self._unsorted = False
+        _write_index(self.root, self._index)
+        for name, code, _ in COLUMNS:
+            self._buffers[name] = array(code)
+
+    def close(self) -> None:
+        self.flush()
+
+
+class TickArchive:
+    def __init__(self, root: str | Path, symbol: str) -> None:
+        self.root = Path(root) / symbol.upper()
+
+    def segments(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def index(self) -> Dict[str, dict]:
+        return _read_index(self.root)
+
+    def open_segment(
+        self, segment: str, entry: Optional[dict] = None
+    ) -> TickColumns:
+        import numpy as np
+
+        directory = self.root / segment
+        sizes = []
+        for _, code, filename in COLUMNS:
+            path = directory / filename
+            item = array(code).itemsize
+            sizes.append(path.stat().st_size // item if path.exists() else 0)
+        count = min(sizes)
+        columns = []
+        for (_, _, filename), dtype in zip(COLUMNS, _DTYPES):
+            if count == 0:
+                columns.append(np.empty(0, dtype=dtype))
+                continue
+            columns.append(
+                np.memmap(directory / filename, dtype=dtype, mode="r", shape=(count,))
+            )
+        timestamps = columns[0]
+        ordered = entry.get("sorted") if entry is not None else None
+        if ordered is None:
+            ordered = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        if not ordered:
+            order = np.argsort(timestamps, kind="stable")
+            columns = [np.asarray(column)[order] for column in columns]
+        return TickColumns(*columns)
+
+    def iter_range(
+        self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+    ) -> Iterator[TickColumns]:
+        import numpy as np
+
+        index = self.index()
+        for segment in self.segments():
+            entry = index.get(segment)
+            if entry is not None:
+                first_ns = int(entry["first_ns"])
+                last_ns = int(entry["last_ns"])
+            else:
+                first_ns = segment_start_ns(segment)
+                last_ns = first_ns + _DAY_NS - 1
+            if start_ns is not None and last_ns < start_ns:
+                continue
+            if end_ns is not None and first_ns >= end_ns:
+                continue
+            columns = self.open_segment(segment, entry)
+            timestamps = columns.timestamp_ns
+            lo = 0
+            hi = len(timestamps)
+            if start_ns is not None and start_ns > first_ns:
+                lo = int(np.searchsorted(timestamps, start_ns, "left"))
+            if end_ns is not None and end_ns <= last_ns:
+                hi = int(np.searchsorted(timestamps, end_ns, "left"))
+            if hi > lo:
+                yield TickColumns(*(column[lo:hi] for column in columns))
+
+    def load(
+        self, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+    ) -> TickColumns:
+        import numpy as np
+
+        parts = list(self.iter_range(start_ns, end_ns))
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return TickColumns(*(np.empty(0, dtype=dtype) for dtype in _DTYPES))
+        return TickColumns(
+            *(np.concatenate([part[index] for part in parts]) for index in range(4))
+        )
+
+
+def _read_index(root: Path) -> Dict[str, dict]:
+    path = root / INDEX_FILE
+    if not path.exists():
+        return {}
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _write_index(root: Path, index: Dict[str, dict]) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    temp_path = root / (INDEX_FILE + ".tmp")
+    temp_path.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+    temp_path.replace(root / INDEX_FILE)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from core.heartbeat import HeartbeatStrategy
+from core.state import StateStore
+from paper.backtest import BUY, SELL, run_backtest, stream_to_arrays
+from run import demo_price_stream, run_demo
+
+START = datetime(2024, 1, 1)
+
+
+def make_config(tmp_path, **overrides) -> dict:
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        trade_spill_path=str(tmp_path / "trades.bin"),
+        report_store_path=str(tmp_path / "reports.json"),
+        report_background_writer=False,
+    )
+    config.update(overrides)
+    return config
+
+
+def make_strategy(config: dict) -> HeartbeatStrategy:
+    return HeartbeatStrategy(
+        effective_gap=config["effective_gap"],
+        trailing_pct=config["trailing_pct"],
+        cooldown_sec=config["cooldown_sec"],
+    )
+
+
+@pytest.mark.parametrize(
+    "seed, volatility, cooldown_sec",
+    [(42, 0.003, 300), (7, 0.01, 60), (3, 0.0005, 3600)],
+)
+def test_signals_match_incremental_strategy(tmp_path, seed, volatility, cooldown_sec):
+    config = make_config(
+        tmp_path,
+        demo_seed=seed,
+        demo_price_volatility=volatility,
+        cooldown_sec=cooldown_sec,
+    )
+    prices, timestamps = stream_to_arrays(
+        demo_price_stream(config, 20_000, start=START)
+    )
+    incremental = make_strategy(config)
+    expected = np.zeros(len(prices), dtype=np.int8)
+    for index, (price, timestamp_ns) in enumerate(
+        zip(prices.tolist(), timestamps.tolist())
+    ):
+        action = incremental.on_tick_ns(price, timestamp_ns)
+        if action == "BUY":
+            expected[index] = BUY
+        elif action == "SELL":
+            expected[index] = SELL
+
+    vectorized = make_strategy(config)
+    result = run_backtest(prices, timestamps, config, strategy=vectorized)
+
+    assert np.count_nonzero(expected) > 0
+    np.testing.assert_array_equal(result.signals, expected)
+    assert vectorized.snapshot() == incremental.snapshot()
+
+
+def test_split_backtest_matches_single_pass(tmp_path):
+    config = make_config(tmp_path)
+    prices, timestamps = stream_to_arrays(
+        demo_price_stream(config, 10_000, start=START)
+    )
+    whole = run_backtest(prices, timestamps, config)
+
+    strategy = make_strategy(config)
+    first = run_backtest(prices[:3_333], timestamps[:3_333], config, strategy)
+    second = run_backtest(
+        prices[3_333:], timestamps[3_333:], config, strategy, first.ledger
+    )
+
+    np.testing.assert_array_equal(
+        np.concatenate([first.signals, second.signals]), whole.signals
+    )
+    assert second.ledger.snapshot() == whole.ledger.snapshot()
+
+
+def test_backtest_matches_run_demo(tmp_path):
+    config = make_config(tmp_path)
+    ticks = 20_000
+    run_demo(config, ticks)
+    state = StateStore(config["state_path"]).load()
+    with open(config["trades_log_path"], encoding="utf-8") as handle:
+        logged = [line for line in handle if line.strip()]
+
+    prices, timestamps = stream_to_arrays(demo_price_stream(config, ticks, start=START))
+    result = run_backtest(prices, timestamps, config)
+
+    assert len(result.trades) == len(logged) > 0
+    assert result.ledger.snapshot() == pytest.approx(state["ledger"], rel=1e-12)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from core.orderbook import BookUpdate
+from paper.backtest import BUY, run_backtest, stream_to_arrays
+from paper.session import PaperSession
+from run import demo_price_stream
+
+SECOND = 1_000_000_000
+
+
+@pytest.fixture
+def session(tmp_path):
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path="",
+        report_background_writer=False,
+        book_execution=True,
+        effective_gap=0.01,
+        trailing_pct=0.01,
+        trade_size_cash=100_000.0,
+    )
+    session = PaperSession(config)
+    yield session
+    session.close()
+
+
+def tick(session: PaperSession, price: float, second: int, bids=(), asks=()):
+    timestamp_ns = second * SECOND
+    session.book.apply(BookUpdate(timestamp_ns, list(bids), list(asks)))
+    return session.on_tick_ns(price, timestamp_ns)
+
+
+def enter(session: PaperSession, asks) -> None:
+    tick(session, 100.0, 1, bids=[(99.9, 10_000.0)], asks=[(100.1, 10_000.0)])
+    assert tick(session, 101.0, 2, bids=[(100.9, 10_000.0)], asks=asks) == "BUY"
+
+
+def test_rejected_buy_rolls_back_to_idle(session):
+    enter(session, asks=[])
+
+    assert session.executor.rejected == 1
+    assert session.ledger.position_qty == 0
+    assert session.strategy.state == "IDLE"
+    assert session.strategy.entry_price is None
+
+    assert tick(session, 101.0, 3, asks=[(101.0, 10_000.0)]) == "BUY"
+    assert session.strategy.state == "IN_POSITION"
+    assert session.ledger.position_qty == pytest.approx(100_000.0 / 101.0)
+
+
+def test_partial_buy_keeps_filled_position(session):
+    enter(session, asks=[(101.0, 400.0)])
+
+    assert session.executor.partial_fills == 1
+    assert session.strategy.state == "IN_POSITION"
+    assert session.ledger.position_qty == 400.0
+
+
+def test_partial_sell_retries_remainder(session):
+    enter(session, asks=[(101.0, 10_000.0)])
+    held = session.ledger.position_qty
+    tick(session, 104.0, 3, bids=[(104.0, 10_000.0)], asks=[(104.1, 10_000.0)])
+    assert session.strategy.armed
+
+    assert tick(session, 102.9, 4, bids=[(102.9, 300.0)]) == "SELL"
+    assert session.ledger.position_qty == pytest.approx(held - 300.0)
+    assert session.strategy.state == "IN_POSITION"
+    assert session.strategy.cooldown_until_ns is None
+
+    assert tick(session, 102.8, 5, bids=[]) == "SELL"
+    assert session.executor.rejected == 1
+    assert session.strategy.state == "IN_POSITION"
+
+    assert tick(session, 102.8, 6, bids=[(102.8, 10_000.0)]) == "SELL"
+    assert session.ledger.position_qty == 0
+    assert session.strategy.state == "COOLDOWN"
+
+
+def test_cash_short_buy_keeps_backtest_semantics(tmp_path):
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path="",
+        report_background_writer=False,
+        initial_cash=100_000.0,
+        demo_seed=42,
+    )
+    prices, timestamps = stream_to_arrays(
+        demo_price_stream(config, 20_000, start=datetime(2024, 1, 1))
+    )
+    session = PaperSession(config)
+    actions = [
+        session.on_tick_ns(price, timestamp_ns)
+        for price, timestamp_ns in zip(prices.tolist(), timestamps.tolist())
+    ]
+    session.close()
+    result = run_backtest(prices, timestamps, config)
+
+    buys = [index for index, action in enumerate(actions) if action == "BUY"]
+    assert session.ledger.trades.total == len(result.trades) == 0
+    assert buys == np.flatnonzero(result.signals == BUY).tolist()
+    assert len(buys) < 20
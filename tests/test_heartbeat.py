@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from core.heartbeat import HeartbeatStrategy
+from core.tick import datetime_to_ns
+
+
+def test_aware_timestamps_match_naive_utc():
+    aware = datetime.now(timezone.utc)
+    naive = aware.replace(tzinfo=None)
+    assert datetime_to_ns(aware) == datetime_to_ns(naive)
+    shifted = aware.astimezone(timezone(timedelta(hours=9)))
+    assert datetime_to_ns(shifted) == datetime_to_ns(naive)
+
+
+def test_on_tick_accepts_aware_datetime():
+    strategy = HeartbeatStrategy(effective_gap=0.01, trailing_pct=0.01, cooldown_sec=60)
+    now = datetime.now(timezone.utc)
+    assert strategy.on_tick(100.0, now) is None
+    assert strategy.on_tick(101.0, now + timedelta(seconds=1)) == "BUY"
+    assert strategy.state == "IN_POSITION"
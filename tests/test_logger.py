@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from datetime import datetime
+import json
+import logging
+import queue
+
+from core.config import DEFAULT_CONFIG
+from paper.session import PaperSession
+from run import demo_price_stream
+from services.logger import (
+    DroppingQueueHandler,
+    DropReportingListener,
+    build_logger,
+    dropped_records,
+    stop_logger,
+)
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def test_full_queue_counts_and_reports_drops():
+    records: "queue.Queue[logging.LogRecord]" = queue.Queue(2)
+    source = DroppingQueueHandler(records)
+    sink = CollectingHandler()
+    listener = DropReportingListener(records, source, sink)
+    logger = logging.getLogger("test.logger.drops")
+    logger.propagate = False
+    logger.addHandler(source)
+    try:
+        for index in range(10):
+            logger.warning("tick %d", index)
+        assert source.dropped == 8
+        assert dropped_records(logger) == 8
+
+        listener.start()
+        listener.stop()
+    finally:
+        logger.removeHandler(source)
+
+    messages = [record.getMessage() for record in sink.records]
+    assert messages == ["tick 0", "log queue overloaded | dropped=8", "tick 1"]
+    assert sink.records[1].levelno == logging.WARNING
+    assert listener.reported == 8
+
+
+def test_queued_logger_writes_text_and_json_lines(tmp_path):
+    log_path = tmp_path / "session.log"
+    json_path = tmp_path / "session.jsonl"
+    logger = build_logger(
+        "test.logger.json", log_path, queued=True, json_path=json_path
+    )
+    try:
+        logger.info("BUY | price=%.1f", 101.5)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("order failed")
+    finally:
+        stop_logger("test.logger.json")
+
+    text = log_path.read_text(encoding="utf-8").splitlines()
+    assert text[0].endswith("| INFO | BUY | price=101.5")
+    lines = [json.loads(line) for line in json_path.read_text("utf-8").splitlines()]
+    assert [line["message"] for line in lines] == ["BUY | price=101.5", "order failed"]
+    assert lines[0]["level"] == "INFO"
+    assert lines[0]["logger"] == "test.logger.json"
+    assert datetime.fromisoformat(lines[0]["ts"]).utcoffset().total_seconds() == 0
+    assert "exc" not in lines[0]
+    assert "RuntimeError: boom" in lines[1]["exc"]
+
+
+def test_session_logs_trades_through_configured_logger(tmp_path):
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path="",
+        trade_spill_path="",
+        latency_dump_path="",
+        report_background_writer=False,
+        log_path=str(tmp_path / "session.log"),
+        log_json_path=str(tmp_path / "session.jsonl"),
+    )
+    session = PaperSession(config)
+    try:
+        for timestamp, price in demo_price_stream(config, 5_000):
+            session.on_tick(price, timestamp)
+    finally:
+        session.close()
+
+    trades = session.ledger.trades.total
+    assert trades > 0
+    assert not session.logger.handlers
+    lines = (tmp_path / "session.jsonl").read_text("utf-8").splitlines()
+    assert len(lines) == trades
+    assert len((tmp_path / "session.log").read_text("utf-8").splitlines()) == trades
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from services.notifier import Notifier, TelegramChannel
+
+
+@pytest.fixture
+def telegram_stub():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+            body = json.loads(self.rfile.read(length))
+            time.sleep(0.2)
+            received.append((self.path, body["chat_id"], body["text"]))
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(b'{"ok": true}')
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.received = received
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_telegram_delivery_and_slow_channel_isolation(telegram_stub):
+    fast = []
+    notifier = Notifier(coalesce_sec=0.05, rate_per_min=600, burst=5)
+    notifier.add_channel(
+        "telegram", TelegramChannel("TOKEN", "42", url=telegram_stub.url)
+    )
+    notifier.add_channel("fast", fast.append)
+    started = time.monotonic()
+    for step in range(20):
+        notifier.broadcast(f"price spike {50_000 + step}")
+    notifier.notify("other alert", "telegram")
+    while not fast and time.monotonic() - started < 5.0:
+        time.sleep(0.01)
+    fast_after = time.monotonic() - started
+    notifier.close()
+
+    assert fast == ["price spike 50000 (+19 similar)"]
+    assert fast_after < 0.2
+    assert sorted(text for _, _, text in telegram_stub.received) == [
+        "other alert",
+        "price spike 50000 (+19 similar)",
+    ]
+    assert {path for path, _, _ in telegram_stub.received} == {
+        "/botTOKEN/sendMessage"
+    }
+    assert {chat for _, chat, _ in telegram_stub.received} == {"42"}
+    assert notifier.stats()["failed"] == 0
+
+
+def test_concurrent_synchronous_delivery():
+    notifier = Notifier(background=False, rate_per_min=60_000, burst=10_000)
+    sent = []
+    notifier.add_channel("alerts", sent.append)
+    errors = []
+
+    def worker(name: int) -> None:
+        try:
+            for step in range(200):
+                notifier.notify(f"worker {name} step {step}", "alerts", key=str(step))
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in range(8)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    stats = notifier.stats()
+    assert errors == []
+    assert stats["pending"] == 0
+    assert stats["sent"] == len(sent)
+    assert stats["sent"] + stats["coalesced"] + stats["dropped"] == 8 * 200
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+
+from core.config import DEFAULT_CONFIG
+from core.oracle import BLOCK, ENTER, Oracle
+from core.tick import datetime_to_ns
+from paper.session import PaperSession
+from run import demo_price_stream
+
+
+def trending_ticks(count: int = 60_000):
+    rng = np.random.default_rng(2)
+    drift = np.repeat(rng.normal(0, 0.0003, count // 2000), 2000)
+    prices = 50_000 * np.exp(np.cumsum(drift + rng.normal(0, 0.0008, count)))
+    timestamps = 1.7e9 + np.cumsum(rng.exponential(0.5, count))
+    return timestamps, prices
+
+
+def test_signal_reads_precomputed_verdict():
+    timestamps, prices = trending_ticks()
+    oracle = Oracle(background=False, min_samples=50)
+    oracle.warm(timestamps, prices)
+    verdict = oracle.signal()
+    assert verdict in (ENTER, BLOCK) and oracle.confidence is not None
+
+    def no_inference():
+        raise AssertionError("signal() must not compute features")
+
+    oracle.features = no_inference
+    assert oracle.signal() == verdict
+
+
+def test_scoring_is_skipped_over_budget():
+    timestamps, prices = trending_ticks()
+    oracle = Oracle(background=False, min_samples=50, budget_us=0.0)
+    for price, timestamp in zip(prices.tolist(), timestamps.tolist()):
+        oracle.update(price, timestamp)
+    assert oracle.skipped > 0
+    assert oracle.signal() in (ENTER, BLOCK)
+
+
+def test_skipped_model_swap_is_rescored():
+    timestamps, prices = trending_ticks()
+    oracle = Oracle(background=False, min_samples=50)
+    oracle.warm(timestamps, prices)
+    oracle._published = oracle.model.snapshot()
+    oracle._cost_ns = oracle.budget_ns * 4
+    oracle.confidence = None
+
+    timestamp = float(timestamps[-1])
+    for step in range(1, 4):
+        oracle.update(float(prices[-1]), timestamp + step * 1e-3)
+    assert oracle.skipped == 2
+    assert oracle.confidence is not None
+
+
+def make_config(tmp_path, name: str) -> dict:
+    directory = tmp_path / name
+    directory.mkdir()
+    return dict(
+        DEFAULT_CONFIG,
+        state_path=str(directory / "state.json"),
+        trades_log_path=str(directory / "trades.log"),
+        hourly_report_path=str(directory / "hourly_report.log"),
+        report_store_path="",
+        report_background_writer=False,
+        oracle_enabled=True,
+        oracle_min_samples=10**9,
+        vol_filter_enabled=True,
+        guard_enabled=True,
+    )
+
+
+def test_filtered_arrays_match_per_tick(tmp_path):
+    stream = list(
+        demo_price_stream(DEFAULT_CONFIG, 30_000, start=datetime(2024, 1, 1))
+    )
+    prices = np.array([price for _, price in stream])
+    timestamps_ns = np.array([datetime_to_ns(timestamp) for timestamp, _ in stream])
+
+    per_tick = PaperSession(make_config(tmp_path, "ticks"))
+    for timestamp_ns, price in zip(timestamps_ns.tolist(), prices.tolist()):
+        per_tick.on_tick_ns(price, timestamp_ns)
+    batched = PaperSession(make_config(tmp_path, "arrays"))
+    for start in range(0, len(prices), 4096):
+        batched.on_tick_arrays(
+            prices[start : start + 4096], timestamps_ns[start : start + 4096]
+        )
+    per_tick.close()
+    batched.close()
+
+    assert batched.ticks_filtered == per_tick.ticks_filtered > 0
+    assert batched.ledger.trades.total == per_tick.ledger.trades.total > 0
+    assert batched.ledger.snapshot() == per_tick.ledger.snapshot()
+    assert batched.strategy.snapshot() == per_tick.strategy.snapshot()
+    assert batched.oracle.features() == per_tick.oracle.features() is not None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime
+import json
+
+from core.config import DEFAULT_CONFIG
+from core.tick import Tick, datetime_to_ns
+from run import demo_price_stream, run_replay
+from services.tick_archive import TickRecorder
+
+
+def make_config(tmp_path) -> dict:
+    live = tmp_path / "live"
+    live.mkdir()
+    return dict(
+        DEFAULT_CONFIG,
+        state_path=str(live / "state.json"),
+        trades_log_path=str(live / "trades.log"),
+        hourly_report_path=str(live / "hourly_report.log"),
+        report_store_path=str(live / "reports.json"),
+        tick_archive_path=str(tmp_path / "ticks"),
+        report_background_writer=False,
+        notify_enabled=True,
+        telegram_token="do-not-send",
+    )
+
+
+def record_demo(config: dict, ticks: int) -> None:
+    recorder = TickRecorder(config["tick_archive_path"], config["symbol"])
+    for timestamp, price in demo_price_stream(
+        config, ticks, start=datetime(2024, 1, 1)
+    ):
+        recorder.append(Tick(datetime_to_ns(timestamp), price))
+    recorder.close()
+
+
+def results(output: str) -> str:
+    return output.split(" | ", 3)[3]
+
+
+def test_replay_leaves_live_state_alone(tmp_path, capsys):
+    config = make_config(tmp_path)
+    record_demo(config, 5_000)
+
+    run_replay(config)
+    fresh = capsys.readouterr().out
+    live_state = {
+        "ledger": {"cash": 1.0, "position_qty": 5.0, "avg_price": 40_000.0},
+        "strategy": {"state": "IN_POSITION", "entry_price": 40_000.0},
+    }
+    state_path = tmp_path / "live" / "state.json"
+    state_path.write_text(json.dumps(live_state), encoding="utf-8")
+    run_replay(config)
+    replayed = capsys.readouterr().out
+
+    assert json.loads(state_path.read_text(encoding="utf-8")) == live_state
+    assert sorted(path.name for path in (tmp_path / "live").iterdir()) == [
+        "state.json"
+    ]
+    assert results(replayed) == results(fresh)
+
+
+def test_replay_writes_to_output_dir(tmp_path, capsys):
+    config = make_config(tmp_path)
+    record_demo(config, 5_000)
+
+    run_replay(config, output_dir=str(tmp_path / "out"))
+
+    written = sorted(path.name for path in (tmp_path / "out").iterdir())
+    assert {"state.json", "hourly_report.log", "reports.json"} <= set(written)
+    assert not any((tmp_path / "live").iterdir())
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+
+import pytest
+
+from paper.ledger import Ledger
+from paper.report import ReportSink, write_trade
+
+
+def test_aliased_paths_share_one_handle(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sink = ReportSink(max_lines=1000, flush_interval_sec=60.0)
+    sink.write_line("trades.log", "first")
+    sink.write_line(tmp_path / "trades.log", "second")
+    sink.write_line(Path("sub/../trades.log"), "third")
+    sink.close()
+
+    lines = (tmp_path / "trades.log").read_text(encoding="utf-8").splitlines()
+    assert lines == ["first", "second", "third"]
+
+
+def test_trade_lines_are_written_immediately(tmp_path):
+    ledger = Ledger(1_000_000.0)
+    event = ledger.buy(50_000.0, 0.1, 0.0005, 0.0002, "2024-01-01T00:00:00")
+    path = tmp_path / "trades.log"
+    sink = ReportSink(max_lines=1000, flush_interval_sec=60.0, background=True)
+    try:
+        write_trade(event, path, sink)
+        assert path.read_text(encoding="utf-8").count(" | BUY | ") == 1
+    finally:
+        sink.close()
+
+
+def test_background_failure_is_raised_and_lines_kept(tmp_path):
+    blocker = tmp_path / "reports"
+    blocker.write_text("not a directory", encoding="utf-8")
+    path = blocker / "hourly.log"
+    sink = ReportSink(max_lines=1, flush_interval_sec=0.01, background=True)
+    sink.write_line(path, "first")
+    deadline = time.monotonic() + 5.0
+    while sink.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with pytest.raises(OSError):
+        sink.write_line(path, "second")
+    os.remove(blocker)
+    sink.close()
+
+    assert path.read_text(encoding="utf-8").splitlines() == ["first", "second"]
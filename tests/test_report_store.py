@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from paper.report_store import ReportStore, backfill
+from paper.session import PaperSession
+from run import demo_price_stream
+
+
+def make_config(tmp_path) -> dict:
+    return dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path=str(tmp_path / "reports.json"),
+        report_background_writer=False,
+        notify_enabled=False,
+        latency_http_port=0,
+    )
+
+
+def run_ticks(session: PaperSession, config: dict, ticks: int) -> None:
+    for timestamp, price in demo_price_stream(
+        config, ticks, start=datetime(2024, 1, 1)
+    ):
+        session.on_tick(price, timestamp)
+
+
+def test_restore_recovers_trades_missed_by_a_crash(tmp_path):
+    config = dict(make_config(tmp_path), report_interval_sec=86_400 * 365)
+    crashed = PaperSession(config)
+    crashed.restore()
+    run_ticks(crashed, config, 20_000)
+    expected = crashed.reports.summary("all")
+    crashed.sink.flush()
+
+    restored = PaperSession(config)
+    restored.restore()
+    recovered = restored.reports.summary("all")
+    restored.close()
+
+    assert expected["trades"] > 0
+    assert recovered["trades"] == expected["trades"]
+    assert recovered["realized_pnl"] == pytest.approx(expected["realized_pnl"], abs=0.01)
+
+
+def test_restore_does_not_count_saved_trades_twice(tmp_path):
+    config = make_config(tmp_path)
+    session = PaperSession(config)
+    session.restore()
+    run_ticks(session, config, 20_000)
+    expected = session.reports.summary("all")
+    session.close()
+
+    restored = PaperSession(config)
+    restored.restore()
+    assert restored.reports.summary("all") == expected
+    restored.close()
+
+
+def test_backfill_resumes_from_saved_offsets(tmp_path):
+    config = make_config(tmp_path)
+    session = PaperSession(config)
+    session.restore()
+    run_ticks(session, config, 20_000)
+    session.close()
+    trades_log = tmp_path / "trades.log"
+    saved = ReportStore(config["report_store_path"])
+    saved.load()
+    assert saved.offsets == {
+        "trades": trades_log.stat().st_size,
+        "hourly": (tmp_path / "hourly_report.log").stat().st_size,
+    }
+
+    lines = trades_log.read_text(encoding="utf-8").splitlines(keepends=True)
+    store = ReportStore(tmp_path / "fresh.json")
+    counts = backfill(
+        store, trades_log, offsets={"trades": len("".join(lines[:-2]).encode())}
+    )
+    assert counts == {"trades": 2, "reports": 0}
+    rotated = backfill(
+        ReportStore(tmp_path / "other.json"), trades_log, offsets={"trades": 10**12}
+    )
+    assert rotated["trades"] == len(lines)
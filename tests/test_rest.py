@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import http.client
+import threading
+import time
+
+import pytest
+
+from exchanges.coinone.rest import CoinoneRestClient
+from exchanges.coinone.stub_server import CoinoneStubServer
+
+SECRET = "stub-secret"
+
+
+@pytest.fixture
+def stale_stub():
+    stub = CoinoneStubServer(api_secret=SECRET, drop_idle=True)
+    stub.start()
+    yield stub
+    stub.stop()
+
+
+def make_client(stub: CoinoneStubServer, **overrides) -> CoinoneRestClient:
+    options = dict(
+        api_key="stub-key",
+        api_secret=SECRET,
+        base_url=stub.url,
+        pool_size=1,
+        rate_per_sec=1000.0,
+        burst=1000.0,
+        ticker_ttl_sec=0.0,
+    )
+    options.update(overrides)
+    return CoinoneRestClient(**options)
+
+
+def test_get_retries_on_stale_connection(stale_stub):
+    client = make_client(stale_stub)
+    try:
+        client.get_ticker("XRP")
+        assert client.get_ticker("XRP")["target_currency"] == "xrp"
+    finally:
+        client.close()
+    assert stale_stub.requests == 2
+    assert client.pool.opened == 2
+
+
+def test_order_reconnects_after_idle_drop(stale_stub):
+    client = make_client(stale_stub)
+    try:
+        client.get_ticker("XRP")
+        time.sleep(0.05)
+        assert client.place_order("XRP", "BUY", 1.0, 500.0)["result"] == "success"
+    finally:
+        client.close()
+    assert stale_stub.requests == 2
+    assert client.pool.stale == 1
+
+
+def test_order_is_not_resent_once_sent():
+    stub = CoinoneStubServer(api_secret=SECRET, drop_orders=True)
+    stub.start()
+    client = make_client(stub)
+    try:
+        with pytest.raises((http.client.HTTPException, OSError)):
+            client.place_order("XRP", "BUY", 1.0, 500.0)
+    finally:
+        client.close()
+        stub.stop()
+    assert stub.requests == 1
+
+
+def test_ticker_polling_leaves_a_slot_for_orders():
+    stub = CoinoneStubServer(api_secret=SECRET, delay_sec=0.3)
+    stub.start()
+    client = make_client(stub, pool_size=2)
+    pollers = [
+        threading.Thread(target=client.get_ticker, args=(symbol,))
+        for symbol in ("XRP", "ETH", "BTC")
+    ]
+    try:
+        for poller in pollers:
+            poller.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        client.place_order("XRP", "BUY", 1.0, 500.0)
+        elapsed = time.monotonic() - started
+        for poller in pollers:
+            poller.join()
+    finally:
+        client.close()
+        stub.stop()
+    assert elapsed < 0.5
+
+
+def test_cached_ticker_is_copied():
+    stub = CoinoneStubServer(api_secret=SECRET)
+    stub.start()
+    client = make_client(stub, ticker_ttl_sec=60.0)
+    try:
+        first = client.get_ticker("XRP")
+        first["last"] = "0"
+        second = client.get_ticker("XRP")
+    finally:
+        client.close()
+        stub.stop()
+    assert second["last"] != "0"
+    assert stub.requests == 1
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from core.tick import Tick
+from exchanges.coinone.replay_server import ReplayServer, demo_messages
+from exchanges.coinone.ws import CoinoneWebSocket, decode_message
+from paper.session import PaperSession
+from services.runtime import ConflatingTickQueue, run_runtime
+
+
+def drain(queue: ConflatingTickQueue) -> list:
+    async def collect() -> list:
+        queue.close()
+        ticks = []
+        while True:
+            tick = await queue.get()
+            if tick is None:
+                return ticks
+            ticks.append(tick)
+
+    return asyncio.run(collect())
+
+
+def test_full_queue_drops_oldest_ticks():
+    queue = ConflatingTickQueue(maxsize=4, max_lag_ms=1e9)
+    now = time.time_ns()
+    for index in range(10):
+        queue.put_nowait(Tick(index, float(index), received_ns=now))
+
+    assert queue.received == 10
+    assert queue.conflated == 6
+    assert len(queue) == 4
+    assert [tick.timestamp_ns for tick in drain(queue)] == [6, 7, 8, 9]
+
+
+def test_stale_ticks_conflate_to_latest():
+    queue = ConflatingTickQueue(maxsize=16, max_lag_ms=50.0)
+    stale = time.time_ns() - 1_000_000_000
+    for index in range(5):
+        queue.put_nowait(Tick(index, float(index), received_ns=stale))
+    queue.put_nowait(Tick(5, 5.0, received_ns=time.time_ns()))
+
+    assert [tick.timestamp_ns for tick in drain(queue)] == [5]
+    assert queue.received == 6
+    assert queue.conflated == 5
+
+
+def test_fresh_ticks_are_not_conflated():
+    queue = ConflatingTickQueue(maxsize=16, max_lag_ms=1e9)
+    now = time.time_ns()
+    for index in range(5):
+        queue.put_nowait(Tick(index, float(index), received_ns=now))
+
+    assert [tick.timestamp_ns for tick in drain(queue)] == [0, 1, 2, 3, 4]
+    assert queue.conflated == 0
+
+
+@pytest.fixture
+def config(tmp_path):
+    return dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path="",
+        trade_spill_path="",
+        latency_dump_path="",
+        report_background_writer=False,
+    )
+
+
+def test_replay_server_feeds_runtime_end_to_end(config, tmp_path):
+    pytest.importorskip("websockets")
+    messages = demo_messages(config, 2_000)
+
+    async def replay():
+        server = ReplayServer(messages, port=0)
+        await server.start()
+        try:
+            feed = CoinoneWebSocket(config["symbol"], url=server.url, reconnect=False)
+            stats = await run_runtime(
+                session, feed, queue_size=len(messages), max_lag_ms=1e9
+            )
+        finally:
+            await server.stop()
+        return server, feed, stats
+
+    session = PaperSession(config)
+    try:
+        server, feed, stats = asyncio.run(replay())
+    finally:
+        session.close()
+
+    assert server.sent == feed.messages == len(messages)
+    assert feed.decode_errors == 0
+    assert stats.ticks_received == len(messages)
+    assert stats.ticks_conflated == 0
+    assert stats.ticks_processed == len(messages)
+
+    reference = PaperSession(
+        dict(
+            config,
+            state_path=str(tmp_path / "reference.json"),
+            trades_log_path=str(tmp_path / "reference_trades.log"),
+            hourly_report_path=str(tmp_path / "reference_hourly.log"),
+        )
+    )
+    try:
+        for message in messages:
+            tick = decode_message(message)
+            reference.on_tick_ns(tick.price, tick.timestamp_ns)
+    finally:
+        reference.close()
+    assert session.ledger.trades.total > 0
+    assert session.ledger.snapshot() == reference.ledger.snapshot()
+    assert session.strategy.snapshot() == reference.strategy.snapshot()
+
+
+def test_replay_server_counts_conflated_ticks(config):
+    pytest.importorskip("websockets")
+    messages = demo_messages(config, 2_000)
+
+    async def replay():
+        server = ReplayServer(messages, port=0)
+        await server.start()
+        try:
+            feed = CoinoneWebSocket(config["symbol"], url=server.url, reconnect=False)
+            return await run_runtime(session, feed, queue_size=8, max_lag_ms=0.0)
+        finally:
+            await server.stop()
+
+    session = PaperSession(config)
+    try:
+        stats = asyncio.run(replay())
+    finally:
+        session.close()
+
+    assert stats.ticks_received == len(messages)
+    assert stats.ticks_conflated > 0
+    assert stats.ticks_processed + stats.ticks_conflated == stats.ticks_received
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from paper.backtest import stream_to_arrays
+from paper.session import PaperSession
+from paper.shadow import ShadowRunner, parse_variants
+from run import demo_price_stream
+
+
+def make_config(tmp_path) -> dict:
+    return dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        shadow_summary_path=str(tmp_path / "shadow.json"),
+        shadow_trades_log_path=str(tmp_path / "shadow_trades.log"),
+        report_store_path="",
+        trade_spill_path="",
+        latency_dump_path="",
+        report_background_writer=False,
+    )
+
+
+def base_spec(config: dict) -> str:
+    return "base={}/{}/{}".format(
+        config["effective_gap"], config["trailing_pct"], config["cooldown_sec"]
+    )
+
+
+@pytest.mark.parametrize("arrays", [False, True])
+def test_base_variant_matches_paper_session(tmp_path, arrays):
+    config = make_config(tmp_path)
+    ticks = list(demo_price_stream(config, 5_000))
+    runner = ShadowRunner(config, parse_variants(base_spec(config), config))
+    session = PaperSession(config)
+    try:
+        if arrays:
+            prices, timestamps_ns = stream_to_arrays(ticks)
+            runner.on_tick_arrays(prices, timestamps_ns)
+            session.on_tick_arrays(prices, timestamps_ns)
+        else:
+            for timestamp, price in ticks:
+                runner.on_tick(price, timestamp)
+                session.on_tick(price, timestamp)
+    finally:
+        runner.close()
+        session.close()
+
+    variant = runner.variants[0]
+    assert session.ledger.trades.total > 0
+    assert variant.ledger.trades.total == session.ledger.trades.total
+    assert variant.ledger.snapshot() == session.ledger.snapshot()
+    assert variant.strategy.snapshot() == session.strategy.snapshot()
+    assert runner.ticks == len(ticks)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+
+import exchanges.coinone.ws
+from core.config import DEFAULT_CONFIG
+from core.orderbook import BookUpdate
+from core.tick import Tick
+from paper.session import PaperSession
+from services.latency import STAGE_DECODE
+from services.shm_ring import TickRing, drain_events, feed_main
+from services.tick_archive import TickArchive
+
+NOW_NS = 1_704_067_200 * 1_000_000_000
+
+
+class QuietFeed:
+    instances: list = []
+
+    def __init__(self, symbol, url, channels, reconnect, latency=None, book=None):
+        self.channels = list(channels)
+        self.latency = latency
+        self.book = book
+        self.closed = False
+        QuietFeed.instances.append(self)
+
+    async def ticks(self):
+        try:
+            self.book.apply(BookUpdate(NOW_NS, [(99.0, 1.0)], [(101.0, 2.0)]))
+            self.latency.record(STAGE_DECODE, 1_500)
+            yield Tick(NOW_NS, 100.0, 0.5, received_ns=time.time_ns())
+            await asyncio.sleep(3_600)
+        finally:
+            self.closed = True
+
+
+def test_feed_stops_on_quiet_market_and_forwards_book(tmp_path, monkeypatch):
+    monkeypatch.setattr(exchanges.coinone.ws, "CoinoneWebSocket", QuietFeed)
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        report_store_path="",
+        tick_archive_path=str(tmp_path / "ticks"),
+        record_ticks=True,
+        latency_enabled=True,
+        latency_dump_path="",
+        book_execution=True,
+    )
+    session = PaperSession(config)
+    ring = TickRing(capacity=64)
+    events: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    feeder = threading.Thread(
+        target=feed_main,
+        args=(config, ring.name, stop, session.feed_channels(), events),
+    )
+    try:
+        feeder.start()
+        deadline = time.monotonic() + 5.0
+        while not len(ring) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        feeder.join(timeout=2.0)
+        assert not feeder.is_alive()
+
+        assert drain_events(session, events) == 2
+        batch = ring.peek()
+        assert batch.price.tolist() == [100.0]
+    finally:
+        stop.set()
+        feeder.join()
+        ring.close()
+        session.close()
+
+    feed = QuietFeed.instances[-1]
+    assert feed.channels == ["TRADE", "ORDERBOOK"]
+    assert feed.closed
+    assert session.book.best_bid() == 99.0
+    assert session.book.best_ask() == 101.0
+    assert session.latency.snapshot()[STAGE_DECODE]["count"] == 1
+    archive = TickArchive(config["tick_archive_path"], config["symbol"])
+    assert archive.load().price.tolist() == [100.0]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import services.notifier
+from core.config import DEFAULT_CONFIG
+from paper.soak import run_soak
+
+
+def test_soak_never_notifies_or_touches_live_files(tmp_path, monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        services.notifier.TelegramChannel,
+        "__call__",
+        lambda self, text: sent.append(text),
+    )
+    live = tmp_path / "live"
+    live.mkdir()
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(live / "state.json"),
+        trades_log_path=str(live / "trades.log"),
+        hourly_report_path=str(live / "hourly_report.log"),
+        report_store_path=str(live / "reports.json"),
+        notify_enabled=True,
+        telegram_token="do-not-send",
+        telegram_chat_id="1",
+    )
+
+    report = run_soak(config, 20_000, sample_every=10_000, trace=False)
+
+    assert report
+    assert sent == []
+    assert not any(live.iterdir())
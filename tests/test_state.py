@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from core.config import DEFAULT_CONFIG
+from core.state import StateStore
+from paper.session import PaperSession
+from run import demo_price_stream
+
+
+def make_config(tmp_path, **overrides) -> dict:
+    config = dict(
+        DEFAULT_CONFIG,
+        state_path=str(tmp_path / "state.json"),
+        trades_log_path=str(tmp_path / "trades.log"),
+        hourly_report_path=str(tmp_path / "hourly_report.log"),
+        trade_spill_path=str(tmp_path / "trades.bin"),
+        report_store_path=str(tmp_path / "reports.json"),
+        report_background_writer=False,
+    )
+    config.update(overrides)
+    return config
+
+
+def test_journal_replays_changes(tmp_path):
+    store = StateStore(tmp_path / "state.json", journal=True, compact_every=100)
+    store.update({"ledger": {"cash": 1.0}, "strategy": {"state": "IDLE"}})
+    store.update({"ledger": {"cash": 2.0}, "strategy": {"state": "IDLE"}})
+
+    assert store.journal_path.exists()
+    assert StateStore(tmp_path / "state.json").load() == {
+        "ledger": {"cash": 2.0},
+        "strategy": {"state": "IDLE"},
+    }
+    store.close()
+    assert not store.journal_path.exists()
+
+
+def test_torn_journal_line_does_not_swallow_next_update(tmp_path):
+    journal = tmp_path / "state.journal"
+    journal.write_text('{"ledger":{"cash":1.0}}\n{"ledger":{"cash":2', encoding="utf-8")
+
+    recovered = StateStore(tmp_path / "state.json", journal=True, compact_every=100)
+    assert recovered.load() == {"ledger": {"cash": 1.0}}
+    recovered.update({"ledger": {"cash": 3.0}})
+
+    assert StateStore(tmp_path / "state.json").load() == {"ledger": {"cash": 3.0}}
+    recovered.close()
+
+
+def test_session_persists_on_transitions_only(tmp_path):
+    config = make_config(tmp_path, state_compact_every=1_000_000)
+    session = PaperSession(config)
+    session.restore()
+    for timestamp, price in demo_price_stream(
+        config, 20_000, start=datetime(2024, 1, 1)
+    ):
+        session.on_tick(price, timestamp)
+    writes = session.state_store._journal_entries
+    trades = session.ledger.trades.total
+    session.close()
+
+    reports = 20_000 * config["demo_interval_sec"] // config["report_interval_sec"]
+    assert 0 < trades
+    assert writes <= reports + 1 + 2 * trades
+
+    restored = PaperSession(config)
+    restored.restore()
+    assert restored.ledger.snapshot() == session.ledger.snapshot()
+    assert restored.strategy.state == session.strategy.state
+    restored.close()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.config import DEFAULT_CONFIG
+from paper.backtest import run_backtest
+from paper.stress import PathSpec, generate_paths, simulate
+
+SECOND = 1_000_000_000
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        PathSpec(paths=8, ticks=2_000, regimes=(0.003,), seed=7),
+        PathSpec(paths=8, ticks=2_000, regimes=(0.001, 0.01), switch_prob=0.01),
+        PathSpec(paths=8, ticks=2_000, jump_prob=0.01, trend=0.0002, seed=3),
+    ],
+)
+def test_simulate_matches_run_backtest(spec):
+    config = dict(DEFAULT_CONFIG, effective_gap=0.004, trailing_pct=0.003)
+    interval_sec = float(config["demo_interval_sec"])
+    prices = generate_paths(float(config["demo_price_start"]), spec)
+    results = simulate(config, prices, interval_sec)
+    timestamps_ns = 1_700_000_000 * SECOND + np.arange(
+        spec.ticks, dtype=np.int64
+    ) * round(interval_sec * SECOND)
+
+    assert results["trades"].sum() > 0
+    for row in range(spec.paths):
+        backtest = run_backtest(prices[row], timestamps_ns, config)
+        assert results["trades"][row] == len(backtest.trades)
+        assert results["net_pnl"][row] == pytest.approx(
+            backtest.summary["net_pnl"], abs=1e-6
+        )
+
+
+def test_generate_paths_rejects_empty_paths():
+    with pytest.raises(ValueError, match="at least one tick"):
+        generate_paths(100.0, PathSpec(paths=2, ticks=0))
+    assert generate_paths(100.0, PathSpec(paths=2, ticks=1)).tolist() == [
+        [100.0],
+        [100.0],
+    ]
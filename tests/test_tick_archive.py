@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+
+from core.tick import Tick, datetime_to_ns
+from services.tick_archive import INDEX_FILE, TickArchive, TickRecorder
+
+DAY_START = datetime_to_ns(datetime(2024, 1, 1))
+SECOND = 1_000_000_000
+
+
+def record(tmp_path, timestamps, flush_every: int = 4) -> TickArchive:
+    recorder = TickRecorder(tmp_path, "BTC", flush_every=flush_every)
+    for offset, timestamp_ns in enumerate(timestamps):
+        recorder.append(Tick(timestamp_ns, 100.0 + offset))
+    recorder.close()
+    return TickArchive(tmp_path, "BTC")
+
+
+def test_out_of_order_ticks_are_replayed_sorted(tmp_path):
+    timestamps = [DAY_START + step * SECOND for step in (0, 1, 5, 3, 4, 2, 6, 7, 8)]
+    archive = record(tmp_path, timestamps)
+
+    columns = archive.load()
+    assert archive.index()["20240101"]["sorted"] is False
+    np.testing.assert_array_equal(columns.timestamp_ns, sorted(timestamps))
+    by_time = {ts: 100.0 + offset for offset, ts in enumerate(timestamps)}
+    assert columns.price.tolist() == [by_time[ts] for ts in sorted(timestamps)]
+
+    window = archive.load(DAY_START + 2 * SECOND, DAY_START + 5 * SECOND)
+    assert window.timestamp_ns.tolist() == [DAY_START + s * SECOND for s in (2, 3, 4)]
+
+
+def test_late_tick_from_previous_day(tmp_path):
+    next_day = DAY_START + 86_400 * SECOND
+    timestamps = [
+        next_day - 2 * SECOND,
+        next_day,
+        next_day + SECOND,
+        next_day - SECOND,
+        next_day + 2 * SECOND,
+    ]
+    archive = record(tmp_path, timestamps, flush_every=100)
+
+    assert archive.segments() == ["20240101", "20240102"]
+    np.testing.assert_array_equal(archive.load().timestamp_ns, sorted(timestamps))
+
+
+def test_index_bounds_seek_and_missing_index(tmp_path):
+    timestamps = [DAY_START + step * SECOND for step in range(20)]
+    archive = record(tmp_path, timestamps)
+    entry = archive.index()["20240101"]
+    assert entry["first_ns"] == timestamps[0]
+    assert entry["last_ns"] == timestamps[-1]
+    assert entry["count"] == 20 and entry["sorted"] is True
+
+    assert len(archive.load(timestamps[-1] + 1).price) == 0
+
+    (tmp_path / "BTC" / INDEX_FILE).unlink()
+    window = archive.load(timestamps[5], timestamps[8])
+    assert window.timestamp_ns.tolist() == timestamps[5:8]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pytest
+
+from paper.ledger import Ledger
+from paper.trade_store import TradeStore
+
+
+def fill_ledger(ledger: Ledger, round_trips: int) -> None:
+    for index in range(round_trips):
+        timestamp_ns = (1_700_000_000 + index * 60) * 1_000_000_000
+        ledger.buy(100.0, 1.0, 0.0005, 0.0002, timestamp_ns=timestamp_ns)
+        ledger.sell(101.0, 1.0, 0.0005, 0.0002, timestamp_ns=timestamp_ns + 1)
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_len_matches_iteration(tmp_path, spill):
+    spill_path = tmp_path / "trades.bin" if spill else None
+    ledger = Ledger(1_000_000.0, trade_tail=16, trade_spill_path=spill_path)
+    fill_ledger(ledger, 50)
+    trades = ledger.trades
+
+    rows = list(trades)
+    assert len(rows) == len(trades)
+    assert trades.total == 100
+    if spill:
+        assert len(trades) == 100 and trades.dropped == 0
+    else:
+        assert len(trades) < 100 and trades.dropped > 0
+    assert [row.timestamp_ns for row in rows] == [
+        trades[index].timestamp_ns for index in range(len(trades))
+    ]
+    assert rows[-1].side == "SELL"
+    assert trades[-1].timestamp_ns == rows[-1].timestamp_ns
+
+
+def test_timestamp_ns_matches_iso_timestamp():
+    ledger = Ledger(1_000_000.0)
+    event = ledger.buy(100.0, 1.0, 0.0, 0.0, timestamp="2024-01-01T00:00:01.500000")
+    parsed = ledger.trades[-1].timestamp_ns
+
+    ledger.sell(100.0, 1.0, 0.0, 0.0, event.timestamp, timestamp_ns=parsed)
+    assert ledger.trades[-1].timestamp == event.timestamp
+
+
+def test_torn_spill_record_is_truncated(tmp_path):
+    spill_path = tmp_path / "trades.bin"
+    ledger = Ledger(1_000_000.0, trade_tail=16, trade_spill_path=spill_path)
+    fill_ledger(ledger, 20)
+    spilled = list(ledger.trades)[: ledger.trades.spilled]
+    with spill_path.open("ab") as handle:
+        handle.write(b"\x01torn")
+
+    reopened = TradeStore(tail_size=16, spill_path=spill_path)
+    assert len(reopened) == len(spilled)
+    for round_trip in range(20):
+        reopened.append(ledger.trades[-1], timestamp_ns=round_trip)
+
+    rows = list(reopened)
+    assert [row.timestamp_ns for row in rows[: len(spilled)]] == [
+        row.timestamp_ns for row in spilled
+    ]
+    assert reopened.columns()["timestamp_ns"].tolist()[len(spilled) :] == list(
+        range(20)
+    )
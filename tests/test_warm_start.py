@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.oracle import Oracle
+from core.timeframe_guard import CandleSeries, MultiTimeframeGuard
+from core.volatility import RollingStats, VolatilityFilter
+
+
+@pytest.fixture(scope="module")
+def ticks():
+    rng = np.random.default_rng(5)
+    count = 60_000
+    prices = 50_000 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    gaps = rng.exponential(0.5, count)
+    gaps[rng.random(count) < 0.001] *= 2000
+    timestamps = 1.7e9 + np.cumsum(gaps)
+    volumes = rng.random(count)
+    return timestamps, prices, volumes
+
+
+def test_rolling_stats_load_matches_update(ticks):
+    timestamps, prices, _ = ticks
+    windows = (10.0, 60.0, 600.0)
+    incremental = RollingStats(windows)
+    for price, timestamp in zip(prices.tolist(), timestamps.tolist()):
+        incremental.update(price, timestamp)
+    loaded = RollingStats(windows)
+    loaded.load(timestamps, prices)
+
+    tail = timestamps[-1] + np.cumsum(np.full(2_000, 0.5))
+    for step in range(2):
+        for window in windows:
+            expected = incremental.stats(window)
+            actual = loaded.stats(window)
+            assert actual.count == expected.count
+            assert actual.ret == expected.ret
+            assert actual.range == expected.range
+            assert actual.stdev == pytest.approx(expected.stdev, abs=1e-12)
+            assert actual.realized_vol == pytest.approx(
+                expected.realized_vol, abs=1e-12
+            )
+        if step == 0:
+            for price, timestamp in zip(prices[:2_000].tolist(), tail.tolist()):
+                incremental.update(price, timestamp)
+                loaded.update(price, timestamp)
+
+
+def test_volatility_filter_load_matches_update(ticks):
+    timestamps, prices, _ = ticks
+    incremental = VolatilityFilter(window=300, vol_ok=0.002)
+    for price, timestamp in zip(prices.tolist(), timestamps.tolist()):
+        incremental.update(price, timestamp)
+    loaded = VolatilityFilter(window=300, vol_ok=0.002)
+    loaded.load(timestamps, prices)
+
+    assert loaded.allowed() == incremental.allowed()
+    assert loaded.spiking() == incremental.spiking()
+
+
+def test_candle_series_load_matches_update(ticks):
+    timestamps, prices, volumes = ticks
+    incremental = CandleSeries(60)
+    for price, timestamp, volume in zip(
+        prices.tolist(), timestamps.tolist(), volumes.tolist()
+    ):
+        incremental.update(price, timestamp, volume)
+    loaded = CandleSeries(60)
+    loaded.load(timestamps, prices, volumes)
+
+    assert loaded.closed == incremental.closed
+    assert loaded.ema == incremental.ema
+    assert loaded.slope == incremental.slope
+    for name in ("starts", "opens", "highs", "lows", "closes"):
+        assert list(getattr(loaded, name)) == list(getattr(incremental, name))
+    np.testing.assert_allclose(list(loaded.volumes), list(incremental.volumes))
+
+
+def test_guard_load_matches_update(ticks):
+    timestamps, prices, volumes = ticks
+    incremental = MultiTimeframeGuard()
+    for price, timestamp, volume in zip(
+        prices.tolist(), timestamps.tolist(), volumes.tolist()
+    ):
+        incremental.update(price, timestamp, volume)
+    loaded = MultiTimeframeGuard()
+    loaded.load(timestamps, prices, volumes)
+
+    for minutes, series in incremental.series.items():
+        assert loaded.series[minutes].closed == series.closed
+        assert loaded.series[minutes].slope == series.slope
+    assert loaded.allow_entry() == incremental.allow_entry()
+
+
+def test_oracle_warm_matches_update():
+    rng = np.random.default_rng(2)
+    count = 60_000
+    drift = np.repeat(rng.normal(0, 0.0003, count // 2000), 2000)
+    prices = 50_000 * np.exp(np.cumsum(drift + rng.normal(0, 0.0008, count)))
+    timestamps = 1.7e9 + np.cumsum(rng.exponential(0.5, count))
+    incremental = Oracle(background=False, min_samples=50)
+    for price, timestamp in zip(prices.tolist(), timestamps.tolist()):
+        incremental.update(price, timestamp)
+    warmed = Oracle(background=False, min_samples=50)
+    warmed.warm(timestamps, prices)
+
+    assert warmed.model.samples == incremental.model.samples > 0
+    assert len(warmed._pending) == len(incremental._pending)
+    assert len(warmed._batch) == len(incremental._batch)
+    np.testing.assert_allclose(warmed.features(), incremental.features(), atol=1e-12)
+    np.testing.assert_allclose(
+        warmed.model.snapshot()[0], incremental.model.snapshot()[0], atol=1e-9
+    )
+    assert warmed.signal() == incremental.signal()